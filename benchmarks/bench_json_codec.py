@@ -0,0 +1,63 @@
+"""
+
+Benchmark of the JSON backends on a getUpdates response of 100 updates and on a typical reply_markup.
+
+Usage: python benchmarks/bench_json_codec.py [iterations]
+
+Author: Eric Damian
+
+"""
+
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from python_telegram_api import json_codec
+
+def getUpdatesPayload(count=100) -> bytes:
+    """ Build a getUpdates response body with a mix of messages and callback queries """
+
+    updates = []
+
+    for i in range(count):
+
+        chat = {'id': -1001000000000 - i % 7, 'title': 'Benchmark group', 'type': 'supergroup'}
+        user = {'id': 100000 + i, 'is_bot': False, 'first_name': 'Ünïcödé', 'username': f'user{i}', 'language_code': 'en'}
+        message = {'message_id': i, 'from': user, 'chat': chat, 'date': 1700000000 + i, 'text': f'/start payload {i} ✓', 'entities': [{'offset': 0, 'length': 6, 'type': 'bot_command'}]}
+
+        if i % 4 == 3:
+            updates.append({'update_id': 500000 + i, 'callback_query': {'id': str(9000 + i), 'from': user, 'message': message, 'chat_instance': '-123456789', 'data': f'page:{i}'}})
+        else:
+            updates.append({'update_id': 500000 + i, 'message': message})
+
+    return json.dumps({'ok': True, 'result': updates}).encode('utf-8')
+
+def main():
+
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    payload = getUpdatesPayload()
+    markup = {'inline_keyboard': [[{'text': f'Button {row}-{col}', 'callback_data': f'btn:{row}:{col}'} for col in range(3)] for row in range(4)]}
+
+    print(f'getUpdates payload: {len(payload)} bytes, {iterations} iterations')
+    print(f'{"backend":<10}{"decode µs":>12}{"encode µs":>12}{"markup µs":>12}')
+
+    for backend in json_codec.BACKENDS:
+
+        if not json_codec.setCodec(backend):
+            print(f'{backend:<10}{"not installed":>36}')
+            continue
+
+        decoded = json_codec.loads(payload)
+
+        decode = timeit.timeit(lambda: json_codec.loads(payload), number=iterations) / iterations * 1e6
+        encode = timeit.timeit(lambda: json_codec.dumps(decoded), number=iterations) / iterations * 1e6
+        encodeMarkup = timeit.timeit(lambda: json_codec.dumps(markup), number=iterations * 10) / (iterations * 10) * 1e6
+
+        print(f'{backend:<10}{decode:>12.1f}{encode:>12.1f}{encodeMarkup:>12.2f}')
+
+if __name__ == '__main__':
+    main()
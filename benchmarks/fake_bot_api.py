@@ -0,0 +1,209 @@
+"""
+
+Local fake Bot API server used by the benchmarks, it answers like Telegram without any network.
+
+Author: Eric Damian
+
+"""
+
+import http.server
+import itertools
+import json
+import multiprocessing
+import random
+import threading
+import time
+
+class _FakeHttpServer(http.server.ThreadingHTTPServer):
+
+    daemon_threads = True
+    request_queue_size = 1024 # Concurrent clients open their connections at once, a short backlog makes them wait for SYN retransmits
+
+class FakeBotApiServer():
+    """ HTTP server answering the Bot API methods used by the benchmarks.
+
+    getUpdates returns generated Update objects, send methods return a Message with the fields Telegram would fill in,
+    and every other method returns True. Each response can be delayed, and a share of the send methods can be refused
+    with error 429 to exercise flood control. The request counters are only kept up to date when serving from a thread.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, jitter=0.0, flood_rate=0.0, retry_after=0, updates_per_poll=100, seed=0):
+        """ Constructor of FakeBotApiServer class
+
+        Args:
+            host (str, optional): Address to listen on. Defaults to '127.0.0.1'.
+            port (int, optional): Port to listen on, 0 picks a free port. Defaults to 0.
+            latency (float, optional): Seconds every response is delayed. Defaults to 0.0.
+            jitter (float, optional): Random extra delay, up to this many seconds. Defaults to 0.0.
+            flood_rate (float, optional): Share of send requests refused with error 429, from 0 to 1. Defaults to 0.0.
+            retry_after (int, optional): retry_after returned with error 429. Defaults to 0.
+            updates_per_poll (int, optional): Updates returned by every getUpdates. Defaults to 100.
+            seed (int, optional): Seed of the random latency and 429 injection. Defaults to 0.
+        """
+
+        self.latency = latency
+        self.jitter = jitter
+        self.floodRate = flood_rate
+        self.retryAfter = retry_after
+        self.updatesPerPoll = updates_per_poll
+
+        self.random = random.Random(seed)
+        self.messageIds = itertools.count(1)
+        self.requests = 0
+        self.floods = 0
+        self.lock = threading.Lock()
+        self.thread = None
+        self.process = None
+
+        self.server = _FakeHttpServer((host, port), self._makeRequestHandler())
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def getUrl(self) -> str:
+        """ Use this method to get the api_url to give to the bot """
+
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self, process=True):
+        """ Use this method to serve in the background.
+
+        Args:
+            process (bool, optional): Serve from a child process, so the server does not compete with the measured client for the GIL. Defaults to True.
+        """
+
+        if process:
+            self.process = multiprocessing.get_context('fork').Process(target=self.server.serve_forever, daemon=True)
+            self.process.start()
+            self.server.socket.close() # The child owns the listening socket now
+        else:
+            self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        """ Use this method to stop serving """
+
+        if self.process is not None:
+            self.process.terminate()
+            self.process.join()
+            self.process = None
+        else:
+            self.server.shutdown()
+            self.server.server_close()
+
+    def answer(self, method: str, params: dict) -> dict:
+        """ Build the response of a method """
+
+        with self.lock:
+            self.requests += 1
+            flooded = method.startswith(('send', 'edit', 'copy', 'forward')) and self.random.random() < self.floodRate
+            self.floods += flooded
+            delay = self.latency + self.random.random() * self.jitter
+
+        if delay > 0:
+            time.sleep(delay)
+
+        if flooded:
+            return {'ok': False, 'error_code': 429, 'description': f'Too Many Requests: retry after {self.retryAfter}', 'parameters': {'retry_after': self.retryAfter}}
+
+        if method == 'getUpdates':
+            return {'ok': True, 'result': self._updates(int(params.get('offset') or 1), int(params.get('limit') or 100))}
+
+        if method == 'getMe':
+            return {'ok': True, 'result': {'id': 1, 'is_bot': True, 'first_name': 'Benchmark', 'username': 'benchmark_bot'}}
+
+        if method == 'getChatMember':
+            return {'ok': True, 'result': {'status': 'member', 'user': {'id': int(params.get('user_id') or 0), 'is_bot': False, 'first_name': 'User'}}}
+
+        if method == 'sendMediaGroup':
+            media = params.get('media') or []
+            media = json.loads(media) if isinstance(media, str) else media
+            return {'ok': True, 'result': [self._message(params, item.get('type', 'photo')) for item in media]}
+
+        if method.startswith(('send', 'edit', 'copy', 'forward', 'stop')) and method != 'sendChatAction':
+            return {'ok': True, 'result': self._message(params, method[4:].lower() if method.startswith('send') else '')}
+
+        return {'ok': True, 'result': True}
+
+    def _message(self, params: dict, kind: str) -> dict:
+
+        message = {'message_id': next(self.messageIds), 'date': int(time.time()), 'chat': {'id': params.get('chat_id'), 'type': 'private'}}
+
+        if kind in ('photo',):
+            message['photo'] = [{'file_id': f'photo-{message["message_id"]}', 'file_unique_id': 'u', 'width': 90, 'height': 90}]
+        elif kind in ('audio', 'document', 'video', 'animation', 'voice'):
+            message[kind] = {'file_id': f'{kind}-{message["message_id"]}', 'file_unique_id': 'u'}
+        elif 'text' in params:
+            message['text'] = params['text']
+
+        return message
+
+    def _updates(self, offset: int, limit: int) -> list:
+
+        updates = []
+
+        for updateId in range(offset, offset + min(limit, self.updatesPerPoll)):
+            chat = {'id': 1000 + updateId % 50, 'type': 'private', 'first_name': 'User'}
+            updates.append({'update_id': updateId, 'message': {'message_id': updateId, 'from': {'id': chat['id'], 'is_bot': False, 'first_name': 'User'}, 'chat': chat, 'date': 1700000000, 'text': f'/start {updateId}'}})
+
+        return updates
+
+    def _makeRequestHandler(self):
+        """ Build the request handler class bound to this server """
+
+        fake = self
+
+        class _FakeRequestHandler(http.server.BaseHTTPRequestHandler):
+
+            protocol_version = 'HTTP/1.1' # Keep the connections of the client pool alive
+            disable_nagle_algorithm = True # Headers and body are written separately, do not wait for delayed ACKs between them
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+
+                body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                method = self.path.split('?', 1)[0].rsplit('/', 1)[-1]
+
+                params = {}
+
+                if self.headers.get('Content-Type', '').startswith('application/json') and body:
+                    params = json.loads(body)
+                elif self.headers.get('Content-Type', '').startswith('multipart/form-data'):
+                    params = self._formFields(body)
+
+                payload = json.dumps(fake.answer(method, params)).encode('utf-8')
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST
+
+            def _formFields(self, body: bytes) -> dict:
+                """ Read the text fields of a multipart body, files are skipped """
+
+                boundary = self.headers['Content-Type'].split('boundary=', 1)[1].encode('ascii')
+                fields = {}
+
+                for part in body.split(b'--' + boundary):
+
+                    head, _, value = part.partition(b'\r\n\r\n')
+
+                    if b'name="' not in head or b'filename="' in head:
+                        continue
+
+                    name = head.split(b'name="', 1)[1].split(b'"', 1)[0].decode('utf-8')
+                    fields[name] = value[:-2].decode('utf-8', 'replace')
+
+                return fields
+
+        return _FakeRequestHandler
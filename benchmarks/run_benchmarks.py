@@ -0,0 +1,192 @@
+"""
+
+Offline benchmark suite: runs polling, messaging and upload workloads against the local fake Bot API server.
+
+Usage: python benchmarks/run_benchmarks.py [--requests 2000] [--latency 0.0] [--flood-rate 0.0] [--only messaging] [--no-memory] [--json results.json]
+
+Author: Eric Damian
+
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from fake_bot_api import FakeBotApiServer
+from python_telegram_api.async_telegram_bot_api import AsyncTelegramBotApi
+from python_telegram_api.metrics import Metrics
+from python_telegram_api.rate_limiter import RateLimiter
+from python_telegram_api.telegram_bot_api import TelegramBotApi
+
+def percentile(values: list, share: float) -> float:
+
+    if len(values) == 0:
+        return 0.0
+
+    values = sorted(values)
+    return values[min(len(values) - 1, int(share * len(values)))]
+
+def makeLimiter(options):
+    """ Retry on error 429 without pacing, the fake server does not enforce the real flood limits """
+
+    if options.flood_rate == 0:
+        return None
+
+    return RateLimiter(global_rate=1e9, private_rate=1e9, group_rate=1e9, global_burst=1e9, private_burst=1e9, group_burst=1e9)
+
+def makeBot(server: FakeBotApiServer, options, metrics: Metrics) -> TelegramBotApi:
+
+    return TelegramBotApi('0:benchmark', pool_maxsize=options.workers, rate_limiter=makeLimiter(options), metrics=metrics, api_url=server.getUrl())
+
+def polling(server, options, metrics) -> int:
+    """ getUpdates in a loop through pollUpdates, counts updates instead of requests """
+
+    with makeBot(server, options, metrics) as bot:
+
+        received = 0
+
+        for update in bot.pollUpdates(timeout=0, prefetch=True):
+
+            received += 1
+
+            if received >= options.requests * 10:
+                break
+
+        return received
+
+def messaging(server, options, metrics) -> int:
+    """ sendMessage to many chats, batched over the connection pool """
+
+    with makeBot(server, options, metrics) as bot:
+
+        with bot.batch(workers=options.workers) as batch:
+            for i in range(options.requests):
+                batch.sendMessage(1000 + i % 500, f'Message {i}')
+
+        return options.requests
+
+def uploads(server, options, metrics) -> int:
+    """ sendPhoto of a local file, the bytes are uploaded every time """
+
+    with tempfile.NamedTemporaryFile(suffix='.jpg') as photo, makeBot(server, options, metrics) as bot:
+
+        photo.write(os.urandom(options.upload_size))
+        photo.flush()
+
+        count = max(1, options.requests // 10)
+
+        with bot.batch(workers=options.workers) as batch:
+            for i in range(count):
+                batch.sendPhoto(1000 + i, local_photo=photo.name, caption=f'Photo {i}')
+
+        return count
+
+def mediaGroups(server, options, metrics) -> int:
+    """ sendMediaGroup of three local files """
+
+    with tempfile.TemporaryDirectory() as directory, makeBot(server, options, metrics) as bot:
+
+        paths = []
+
+        for i in range(3):
+            paths.append(os.path.join(directory, f'{i}.jpg'))
+            with open(paths[-1], 'wb') as photo:
+                photo.write(os.urandom(options.upload_size // 3))
+
+        count = max(1, options.requests // 20)
+
+        with bot.batch(workers=options.workers) as batch:
+            for i in range(count):
+                batch.sendMediaGroup(1000 + i, local_media=[{'type': 'photo', 'media': path} for path in paths])
+
+        return count
+
+def asyncMessaging(server, options, metrics) -> int:
+    """ sendMessage to many chats with the asyncio client """
+
+    async def run():
+
+        async with AsyncTelegramBotApi('0:benchmark', max_concurrency=options.workers, rate_limiter=makeLimiter(options), metrics=metrics, api_url=server.getUrl()) as bot:
+            await asyncio.gather(*(bot.sendMessage(1000 + i % 500, f'Message {i}') for i in range(options.requests)))
+
+    asyncio.run(run())
+    return options.requests
+
+WORKLOADS = {
+    'polling': polling,
+    'messaging': messaging,
+    'uploads': uploads,
+    'media_groups': mediaGroups,
+    'async_messaging': asyncMessaging,
+}
+
+def runWorkload(name: str, options) -> dict:
+
+    metrics = Metrics()
+    latencies = []
+    metrics.addHook(lambda event: latencies.append(event['duration']))
+
+    with FakeBotApiServer(latency=options.latency, jitter=options.jitter, flood_rate=options.flood_rate) as server:
+
+        if options.memory:
+            tracemalloc.start()
+
+        started = time.perf_counter()
+
+        units = WORKLOADS[name](server, options, metrics)
+
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] if options.memory else 0
+        tracemalloc.stop()
+
+    snapshot = metrics.getSnapshot()
+    requests = sum(entry['requests'] for entry in snapshot.values())
+    floods = sum(entry['flood_waits'] for entry in snapshot.values())
+
+    return {
+        'workload': name,
+        'units': units,
+        'requests': requests,
+        'seconds': elapsed,
+        'units_per_second': units / elapsed,
+        'requests_per_second': requests / elapsed,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'peak_memory_mb': peak / 1024 / 1024,
+        'flood_waits': floods,
+    }
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000, help='Messages sent by the messaging workloads, the others scale from it')
+    parser.add_argument('--workers', type=int, default=16, help='Concurrent requests')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds the fake server waits before answering')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Random extra latency, in seconds')
+    parser.add_argument('--flood-rate', type=float, default=0.0, help='Share of send requests refused with error 429')
+    parser.add_argument('--upload-size', type=int, default=256 * 1024, help='Bytes of every uploaded photo')
+    parser.add_argument('--only', choices=sorted(WORKLOADS), action='append', help='Run only this workload, can be repeated')
+    parser.add_argument('--no-memory', dest='memory', action='store_false', help='Do not trace memory, tracing slows every workload down')
+    parser.add_argument('--json', default='', help='Also write the results to this file, to compare runs')
+    options = parser.parse_args()
+
+    results = [runWorkload(name, options) for name in (options.only or WORKLOADS)]
+
+    print(f'{"workload":<16}{"units":>8}{"requests":>10}{"req/s":>10}{"units/s":>10}{"p50 ms":>9}{"p99 ms":>9}{"peak MB":>9}{"429s":>6}')
+
+    for result in results:
+        print(f'{result["workload"]:<16}{result["units"]:>8}{result["requests"]:>10}{result["requests_per_second"]:>10.0f}{result["units_per_second"]:>10.0f}{result["p50_ms"]:>9.2f}{result["p99_ms"]:>9.2f}{result["peak_memory_mb"]:>9.2f}{result["flood_waits"]:>6}')
+
+    if options.json:
+        with open(options.json, 'w', encoding='utf-8') as output:
+            json.dump(results, output, indent=2)
+
+if __name__ == '__main__':
+    main()
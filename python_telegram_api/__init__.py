@@ -1 +1 @@
-__all__ = ["telegram_bot_api", "bot_utils"]
+__all__ = ["telegram_bot_api", "async_telegram_bot_api", "bot_utils", "webhook_server", "rate_limiter", "broadcast", "dispatcher", "file_cache", "multipart", "json_codec", "batch", "metrics", "transport", "retry", "chat_member_cache", "sharded_processing", "multi_bot", "outbound_queue", "offset_store", "live_location"]
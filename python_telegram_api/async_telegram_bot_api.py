@@ -0,0 +1,367 @@
+"""
+
+This module contains the asyncio implementation of the Python Telegram APIs Bot.
+
+Author: Eric Damian
+
+"""
+
+import asyncio
+import itertools
+import os
+from typing import List, Dict, AsyncIterator
+
+from .batch import AsyncBatch
+from .telegram_bot_api import TelegramBotApi
+from .transport import NETWORK_ERRORS, AiohttpTransport
+
+class AsyncTelegramBotApi(TelegramBotApi):
+    """ The asyncio implementation of the Python Telegram APIs Bot.
+
+    Every Bot API method has the same name and signature as in TelegramBotApi but must be awaited.
+    The markup helpers of bot_utils can be used exactly as with the blocking client.
+    """
+
+    def __init__(self, token: str, max_concurrency=100, limit=100, limit_per_host=0, keepalive_timeout=15, rate_limiter=None, file_cache=None, fetch_me=False, me_ttl=3600, metrics=None, api_url='https://api.telegram.org', transport=None, retry_policy=None, timeout=60, chat_member_cache=None, offset_store=None):
+        """ Constructor of AsyncTelegramBotApi class
+
+        Args:
+            token (str): Bot token from BotFather.
+            max_concurrency (int, optional): Maximum number of requests in flight at the same time, the others wait for a free slot. Defaults to 100.
+            limit (int, optional): Maximum number of simultaneous connections. Defaults to 100.
+            limit_per_host (int, optional): Maximum number of simultaneous connections to the same host, 0 means no limit. Defaults to 0.
+            keepalive_timeout (int, optional): Seconds an idle connection is kept alive in the pool. Defaults to 15.
+            rate_limiter (RateLimiter, optional): Scheduler pacing every method that sends or edits messages and retrying on error 429. Defaults to None.
+            file_cache (FileIdCache, optional): Cache reusing the file_id of local files already uploaded. Defaults to None.
+            fetch_me (bool, optional): If True the User object of the bot is fetched and cached when entering the async with block. Defaults to False.
+            me_ttl (int, optional): Seconds the cached User object of the bot is trusted, None keeps it until refreshed. Defaults to 3600.
+            metrics (Metrics, optional): Collector of per-method latency, bytes and errors. Defaults to None.
+            api_url (str, optional): Base url of the Bot API server, e.g. a self-hosted one. Defaults to 'https://api.telegram.org'.
+            transport (AsyncTransport, optional): Carrier of the requests, e.g. AsyncHttpxTransport or AsyncInMemoryTransport. Defaults to an AiohttpTransport built from the connection arguments.
+            retry_policy (RetryPolicy, optional): Retries and hedging of requests failing because of the network or the server. Defaults to None.
+            timeout (float, optional): Seconds to wait for the connection and for every read, long polls wait their timeout on top of it. None waits forever. Defaults to 60.
+            chat_member_cache (ChatMemberCache, optional): Cache answering getChatMember, kept in sync with the received updates. Defaults to None.
+            offset_store (OffsetStore, optional): Persistent store lastUpdateId is loaded from and saved to, so restarts resume where they stopped. Defaults to None.
+        """
+
+        transport = transport or AiohttpTransport(limit, limit_per_host, keepalive_timeout) # Its session is created on first use, inside the event loop
+
+        # getMe is awaited when entering the async with block, never from the blocking constructor
+        super().__init__(token, pool_maxsize=limit, rate_limiter=rate_limiter, file_cache=file_cache, fetch_me=False, me_ttl=me_ttl, metrics=metrics, api_url=api_url, transport=transport, retry_policy=retry_policy, timeout=timeout, chat_member_cache=chat_member_cache, offset_store=offset_store)
+
+        self.fetchMe = fetch_me
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+
+    def __enter__(self):
+        raise TypeError('AsyncTelegramBotApi must be used with async with, its close has to be awaited')
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        raise TypeError('AsyncTelegramBotApi must be used with async with, its close has to be awaited')
+
+    async def __aenter__(self):
+
+        if self.fetchMe:
+            await self.getMe()
+
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self) -> bool:
+        """ Use this method to close every pooled connection of the bot.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/close
+
+        Returns:
+            bool: True if the connection pool has been closed correctly.
+        """
+
+        if self.offsetStore is not None: # The commit fsyncs, keep it off the event loop
+            await asyncio.to_thread(self.offsetStore.flush)
+
+        return await self.transport.close()
+
+    def getSession(self):
+        """ Use this method to get the HTTP session shared by all methods.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/getSession
+
+        Returns:
+            aiohttp.ClientSession: The pooled keep-alive session, or the client of another transport, None for AsyncInMemoryTransport.
+        """
+
+        return self.transport.getSession()
+
+    def setLastUpdateId(self, lastUpdateId: int) -> bool:
+        """ Use this method to set lastUpdateId attribute.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/setLastUpdateId
+
+            The offset store only records it, its commits run on the background thread of the store instead of the event loop.
+
+        Args:
+            lastUpdateId (int): New lastUpdateId
+
+        Returns:
+            [bool]: True if lastUpdateId has been set correctly
+        """
+
+        try:
+            self.lastUpdateId = lastUpdateId
+
+            if self.offsetStore is not None:
+                self.offsetStore.save(self.botToken, lastUpdateId, commit=False)
+
+            return True
+        except:
+            return False
+
+    def batch(self) -> AsyncBatch:
+        """ Use this method to run many independent calls concurrently.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/batch
+
+        Returns:
+            AsyncBatch: Context whose method calls return futures and run together when it exits or is flushed.
+        """
+
+        return AsyncBatch(self)
+
+    async def _request(self, method: str, params=(), files=None, callback=None):
+        """ Call a Bot API method through the shared session and unwrap its response.
+
+        Args:
+            method (str): Name of the Bot API method.
+            params (tuple, optional): Parameters of the request. Defaults to ().
+            files (dict, optional): Field names mapped to the paths of local files to upload. Defaults to None.
+            callback (callable, optional): Called with the result of a successful response, its return value is returned instead. Defaults to None.
+
+        Returns:
+            The result of the method on success, otherwise an error Dict.
+        """
+
+        url = f"{self.apiUrl}/bot{self.botToken}/{method}"
+
+        if files and not await asyncio.to_thread(lambda: all(os.path.isfile(path) for path in files.values())):
+            return self._error(method, 'Bad file path')
+
+        params = self._buildParams(params)
+
+        if files and self.fileCache is not None: # Hashing a large file would stall every other request on the loop
+            cachedParams, cachedFiles, uploads, reused = await asyncio.to_thread(self._useCachedFiles, method, params, files)
+        else:
+            cachedParams, cachedFiles, uploads, reused = params, files, {}, {}
+
+        chatId = self._pacedChatId(method, params)
+
+        for attempt in itertools.count():
+
+            if chatId is not None: # Wait for a free slot within the flood limits
+                await asyncio.sleep(self.rateLimiter.reserve(chatId, self.botToken))
+
+            try:
+                async with self.semaphore:
+                    response = await self._attempt(method, url, cachedParams, cachedFiles)
+            except NETWORK_ERRORS:
+                backoff = self.retryPolicy.getDelay(method, attempt) if self.retryPolicy is not None else None
+                if backoff is None:
+                    raise
+                await asyncio.sleep(backoff)
+                continue
+
+            retryAfter = self._retryAfter(response, chatId, attempt)
+
+            if retryAfter is None and self.retryPolicy is not None: # A 5xx response
+                retryAfter = self.retryPolicy.getDelay(method, attempt, response)
+
+            if retryAfter is None:
+                break
+
+            await asyncio.sleep(retryAfter)
+
+        if reused and await asyncio.to_thread(self._forgetFileIds, reused, response): # A cached file_id was refused, upload the files again
+            return await self._request(method, params, files, callback)
+
+        if uploads:
+            await asyncio.to_thread(self._rememberFileIds, method, uploads, response)
+
+        return self._handleResponse(method, response, callback)
+
+    async def _attempt(self, method: str, url: str, params=(), files=None) -> Dict:
+        """ Send a request once, or twice in parallel if it is hedged """
+
+        if self.retryPolicy is not None and not files and self.retryPolicy.canHedge(method):
+            return await self.retryPolicy.hedgeAsync(lambda: self._send(method, url, params, files))
+
+        return await self._send(method, url, params, files)
+
+    async def _send(self, method: str, url: str, params=(), files=None) -> Dict:
+        """ Perform one request through the transport and decode its JSON response """
+
+        metrics = self.metrics
+        started = metrics.start(method) if metrics is not None else 0
+        response, sent, content = None, 0, b''
+
+        try:
+
+            content, sent = await self.transport.send(url, params, files, self._timeoutFor(method, params))
+            response = self._decode(content)
+            return response
+
+        finally:
+            if metrics is not None:
+                metrics.observe(method, started, response, sent, len(content))
+
+    async def pollUpdates(self, timeout=30, limit=100, allowed_updates=None, prefetch=False, retry_delay=1) -> AsyncIterator[Dict]:
+        """ Use this method to iterate over incoming updates using long polling.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/pollUpdates
+
+            The offset advances by itself: lastUpdateId is set once the loop body is done with an update, so without prefetch an update is delivered again if the loop stops while handling it.
+            With prefetch the next batch is requested while the current one is handled. That request confirms the whole current batch to Telegram, so if the loop stops mid-batch the rest of the batch is lost (at-most-once).
+
+        Args:
+            timeout (int, optional): Timeout in seconds for long polling. Defaults to 30.
+            limit (int, optional): Limits the number of updates retrieved by each request. Defaults to 100.
+            allowed_updates (list, optional): List of the update types you want your bot to receive. Defaults to None.
+            prefetch (bool, optional): If True the next batch is fetched in background while the current one is handled, trading redelivery after a crash for lower latency. Defaults to False.
+            retry_delay (int, optional): Seconds to wait before polling again after a failed request. Defaults to 1.
+
+        Yields:
+            Dict: Every Update object, in order.
+        """
+
+        nextBatch = None
+        offset = self.lastUpdateId + 1
+
+        try:
+
+            while True:
+
+                try:
+                    updates = await (nextBatch or self._pollBatch(offset, limit, timeout, allowed_updates))
+                except NETWORK_ERRORS:
+                    updates = None
+
+                nextBatch = None
+
+                if not isinstance(updates, list): # If the request failed
+                    await asyncio.sleep(retry_delay)
+                    continue
+
+                if len(updates) == 0:
+                    continue
+
+                offset = updates[-1]['update_id'] + 1
+
+                if prefetch:
+                    nextBatch = asyncio.ensure_future(self._pollBatch(offset, limit, timeout, allowed_updates))
+
+                for update in updates:
+                    yield update
+                    self.setLastUpdateId(update['update_id'])
+
+        finally:
+
+            if nextBatch:
+                nextBatch.cancel()
+
+    async def getChatMember(self, chat_id: str, user_id: str) -> Dict:
+        """ Use this method to get information about a member of a chat.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/getChatMember
+
+        Args:
+            chat_id (str): Unique identifier for the target chat or username of the target supergroup.
+            user_id (str): Unique identifier of the target user.
+
+        Returns:
+            Dict: Returns a ChatMember object on success.
+        """
+
+        member = self.chatMemberCache.get(chat_id, user_id) if self.chatMemberCache is not None else None
+
+        if member is not None:
+            return member
+
+        params = (
+            ('user_id', user_id),
+            ('chat_id', chat_id)
+        )
+
+        return await self._request('getChatMember', params, callback=self._storeChatMember(chat_id, user_id))
+
+    async def getChatMembers(self, chat_id: str, user_ids: List[str]) -> Dict:
+        """ Use this method to get information about many members of a chat at once.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/getChatMembers
+
+            Cached members are answered right away, the others are requested concurrently.
+
+        Args:
+            chat_id (str): Unique identifier for the target chat or username of the target supergroup.
+            user_ids (List[str]): Unique identifiers of the target users.
+
+        Returns:
+            Dict: Every user_id mapped to its ChatMember object, or to an error Dict if its request failed.
+        """
+
+        userIds = list(dict.fromkeys(user_ids))
+        members = await asyncio.gather(*(self.getChatMember(chat_id, userId) for userId in userIds))
+
+        return dict(zip(userIds, members))
+
+    async def getBotUser(self, refresh=False) -> Dict:
+        """ Use this method to get the User object of the bot, fetched with getMe only when the cached one is missing or expired.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/getBotUser
+
+        Args:
+            refresh (bool, optional): If True the cached User object is fetched again. Defaults to False.
+
+        Returns:
+            Dict: The User object of the bot.
+        """
+
+        user = None if refresh else self._cachedBotUser()
+
+        return user if user is not None else await self.getMe()
+
+    async def getBotUsername(self) -> str:
+        """ Use this method to get your actual bot username.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/getBotUsername
+
+        Returns:
+            str: Bot username.
+        """
+
+        try:
+            return (await self.getBotUser())['username']
+        except:
+            return ''
+
+    async def getBotFirstName(self) -> str:
+        """ Use this method to get your actual bot first name.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/getBotFirstName
+
+        Returns:
+            str: Bot first name.
+        """
+
+        try:
+            return (await self.getBotUser())['first_name']
+        except:
+            return ''
@@ -0,0 +1,195 @@
+"""
+
+This module contains the batch contexts running queued Bot API calls concurrently.
+
+Author: Eric Damian
+
+"""
+
+import asyncio
+import concurrent.futures
+from typing import List
+
+class Batch():
+    """ Queues Bot API calls and runs them concurrently over the connection pool of the bot.
+
+    Every method of the bot can be called on the batch with its usual arguments: the call is queued and a
+    concurrent.futures.Future is returned. Queued calls run when flush is called or the with block exits,
+    then every future holds the value the method returned (an error Dict on failure) or the exception it raised.
+    """
+
+    def __init__(self, bot, workers=None):
+        """ Constructor of Batch class
+
+        Args:
+            bot (TelegramBotApi): Bot running the calls.
+            workers (int, optional): Number of calls running at the same time. Defaults to the pool_maxsize of the bot.
+        """
+
+        self.bot = bot
+        self.workers = workers or getattr(bot, 'poolMaxsize', 10)
+        self.queue = [] # (future, method, args, kwargs) in call order
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+
+        if exc_type is None:
+            self.flush()
+        else:
+            self.cancel()
+
+    def __getattr__(self, name: str):
+
+        method = getattr(self.bot, name)
+
+        if name.startswith('_') or not callable(method):
+            raise AttributeError(name)
+
+        def queue(*args, **kwargs) -> concurrent.futures.Future:
+            future = concurrent.futures.Future()
+            self.queue.append((future, method, args, kwargs))
+            return future
+
+        return queue
+
+    def __len__(self) -> int:
+        return len(self.queue)
+
+    def flush(self) -> List:
+        """ Use this method to run every queued call and wait for them.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/Batch
+
+        Returns:
+            List: The futures of the calls, in call order.
+        """
+
+        queued, self.queue = self.queue, []
+
+        if len(queued) == 0:
+            return []
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(self.workers, len(queued))) as executor:
+            for entry in queued:
+                executor.submit(self._run, *entry)
+
+        return [entry[0] for entry in queued]
+
+    def cancel(self) -> int:
+        """ Use this method to drop every queued call without running it.
+
+        Returns:
+            int: Number of calls cancelled.
+        """
+
+        queued, self.queue = self.queue, []
+
+        for future, method, args, kwargs in queued:
+            future.cancel()
+
+        return len(queued)
+
+    @staticmethod
+    def _run(future: concurrent.futures.Future, method, args, kwargs):
+        """ Run one call and settle its future """
+
+        if not future.set_running_or_notify_cancel():
+            return
+
+        try:
+            future.set_result(method(*args, **kwargs))
+        except BaseException as error:
+            future.set_exception(error)
+
+class AsyncBatch():
+    """ Queues Bot API calls of an AsyncTelegramBotApi and runs them concurrently.
+
+    Calls return asyncio futures and run when flush is awaited or the async with block exits,
+    the max_concurrency of the bot still bounds the requests in flight.
+    """
+
+    def __init__(self, bot):
+        """ Constructor of AsyncBatch class
+
+        Args:
+            bot (AsyncTelegramBotApi): Bot running the calls.
+        """
+
+        self.bot = bot
+        self.queue = [] # (future, method, args, kwargs) in call order
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+
+        if exc_type is None:
+            await self.flush()
+        else:
+            self.cancel()
+
+    def __getattr__(self, name: str):
+
+        method = getattr(self.bot, name)
+
+        if name.startswith('_') or not callable(method):
+            raise AttributeError(name)
+
+        def queue(*args, **kwargs) -> asyncio.Future:
+            future = asyncio.get_running_loop().create_future() # Calls are queued from coroutines, never outside the loop
+            self.queue.append((future, method, args, kwargs))
+            return future
+
+        return queue
+
+    def __len__(self) -> int:
+        return len(self.queue)
+
+    async def flush(self) -> List:
+        """ Use this method to run every queued call and wait for them.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/Batch
+
+        Returns:
+            List: The futures of the calls, in call order.
+        """
+
+        queued, self.queue = self.queue, []
+
+        await asyncio.gather(*(self._run(*entry) for entry in queued))
+
+        return [entry[0] for entry in queued]
+
+    def cancel(self) -> int:
+        """ Use this method to drop every queued call without running it.
+
+        Returns:
+            int: Number of calls cancelled.
+        """
+
+        queued, self.queue = self.queue, []
+
+        for future, method, args, kwargs in queued:
+            future.cancel()
+
+        return len(queued)
+
+    @staticmethod
+    async def _run(future: asyncio.Future, method, args, kwargs):
+        """ Run one call and settle its future """
+
+        if future.cancelled():
+            return
+
+        try:
+            result = method(*args, **kwargs)
+            future.set_result(await result if asyncio.iscoroutine(result) else result)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as error:
+            future.set_exception(error)
@@ -6,9 +6,102 @@ Author: Eric Damian (xSklero)
 """
 
 from typing import List, Dict
-import json
+import collections
+import threading
 
-def getInlineKeyboard(rows: List) -> Dict:
+from . import json_codec
+
+MAX_INTERNED = 1024 # Frozen markups kept for reuse by identical builds
+
+_interned = collections.OrderedDict() # JSON -> FrozenMarkup, least recently built first
+_internLock = threading.Lock()
+
+class FrozenMarkup(dict, json_codec.Preserialized):
+    """ Immutable reply_markup object serialized once.
+
+    It reads like the dict it was built from, but cannot be modified, and every send method uses its cached
+    JSON instead of encoding it again. Nested rows become tuples and nested buttons frozen dicts.
+    """
+
+    __slots__ = ('json', 'jsonBytes')
+
+    def __init__(self, markup: Dict, encoded=None):
+        super().__init__((key, _freeze(value)) for key, value in markup.items())
+        self.json = encoded
+        self.jsonBytes = None # Spliced into request bodies as is
+
+    def toJson(self) -> str:
+        """ Use this method to get the cached JSON encoding of the markup """
+
+        if self.json is None:
+            self.json = json_codec.dumps(dict(self))
+
+        return self.json
+
+    def toJsonBytes(self) -> bytes:
+        """ Use this method to get the cached UTF-8 JSON encoding of the markup """
+
+        if self.jsonBytes is None:
+            self.jsonBytes = self.toJson().encode('utf-8')
+
+        return self.jsonBytes
+
+    def __hash__(self) -> int:
+        return hash(self.toJson())
+
+    def __reduce__(self):
+        return (FrozenMarkup, (dict(self), self.json))
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError('FrozenMarkup objects are immutable')
+
+    __setitem__ = __delitem__ = __ior__ = clear = pop = popitem = setdefault = update = _immutable
+
+def _freeze(value):
+    """ Turn nested dicts and lists into their immutable counterparts """
+
+    if isinstance(value, dict):
+        return value if isinstance(value, FrozenMarkup) else FrozenMarkup(value)
+
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+
+    return value
+
+def freezeMarkup(markup: Dict) -> FrozenMarkup:
+    """ Use this function to get the frozen, pre-serialized version of a reply_markup object
+
+    Notes:
+        For more info -> https://github.com/xSklero/python-telegram-api/wiki/FrozenMarkup
+
+    Args:
+        markup (Dict): InlineKeyboard, ReplyKeyboard, ReplyKeyboardRemove or ForceReply object.
+
+    Returns:
+        FrozenMarkup: The shared instance, the same one is returned for every identical markup.
+    """
+
+    if isinstance(markup, FrozenMarkup):
+        return markup
+
+    encoded = json_codec.dumps(markup)
+
+    with _internLock:
+
+        frozen = _interned.get(encoded)
+
+        if frozen is not None:
+            _interned.move_to_end(encoded)
+            return frozen
+
+        frozen = _interned[encoded] = FrozenMarkup(markup, encoded)
+
+        if len(_interned) > MAX_INTERNED:
+            _interned.popitem(last=False)
+
+        return frozen
+
+def getInlineKeyboard(rows: List, frozen=False) -> Dict:
     """ Use this function to get an InlineKeyboard
 
     Notes:
@@ -16,12 +109,15 @@ def getInlineKeyboard(rows: List) -> Dict:
 
     Args:
         rows (Array of Array of InlineKeyboardButton): Array of button rows, each represented by an Array of InlineKeyboardButton objects
+        frozen (bool, optional): Return the shared FrozenMarkup of this keyboard, serialized once. Defaults to False.
 
     Returns:
         Dict: InlineKeyboard object.
     """
 
-    return {'inline_keyboard': rows}
+    markup = {'inline_keyboard': rows}
+
+    return freezeMarkup(markup) if frozen else markup
 
 def getInlineKeyboardButtonWithUrl(text: str, url: str) -> Dict:
     """ Use this function to get an InlineKeyboardButton object with an url
@@ -92,7 +188,7 @@ def getInlineKeyboardButtonWithSwichInlineCurrentChat(text: str, switch_inline_q
     return {'text': text, 'switch_inline_query_current_chat': switch_inline_query_current_chat}
 
 
-def getReplyKeyboard(rows: List, resize_keyboard=False, one_time_keyboard=False, selective=False) -> Dict:
+def getReplyKeyboard(rows: List, resize_keyboard=False, one_time_keyboard=False, selective=False, frozen=False) -> Dict:
     """ Use this function to get an ReplyKeyboard
 
     Notes:
@@ -103,12 +199,15 @@ def getReplyKeyboard(rows: List, resize_keyboard=False, one_time_keyboard=False,
         resize_keyboard (bool, optional): Requests clients to resize the keyboard vertically for optimal fit. Defaults to False.
         one_time_keyboard (bool, optional): Requests clients to hide the keyboard as soon as it's been used. Defaults to False.
         selective (bool, optional): Use this parameter if you want to show the keyboard to specific users only. Defaults to False.
+        frozen (bool, optional): Return the shared FrozenMarkup of this keyboard, serialized once. Defaults to False.
 
     Returns:
         Dict: ReplyKeyboard object.
     """
 
-    return {'keyboard': rows, 'resize_keyboard': resize_keyboard, 'one_time_keyboard': one_time_keyboard, 'selective': selective}
+    markup = {'keyboard': rows, 'resize_keyboard': resize_keyboard, 'one_time_keyboard': one_time_keyboard, 'selective': selective}
+
+    return freezeMarkup(markup) if frozen else markup
 
 
 def getKeyboardButton(text: str, request_contact=False, request_location=False) -> Dict:
@@ -160,7 +259,7 @@ def getKeyboardButtonPoll(text: str, request_poll={}) -> Dict:
     return {'text': text, 'request_poll': request_poll}
 
 
-def getReplyKeyboardRemove(selective=False) -> Dict:
+def getReplyKeyboardRemove(selective=False, frozen=False) -> Dict:
     """ This object will remove the current custom keyboard and display the default letter-keyboard.
 
     Notes:
@@ -168,15 +267,18 @@ def getReplyKeyboardRemove(selective=False) -> Dict:
 
     Args:
         selective (bool, optional): Use this parameter if you want to remove the keyboard for specific users only. Defaults to False.
+        frozen (bool, optional): Return the shared FrozenMarkup of this keyboard, serialized once. Defaults to False.
 
     Returns:
         Dict: ReplyKeyboardRemove object.
     """
 
-    return {'remove_keyboard': True, 'selective': selective}
+    markup = {'remove_keyboard': True, 'selective': selective}
 
+    return freezeMarkup(markup) if frozen else markup
 
-def getForceReply(selective=False) -> Dict:
+
+def getForceReply(selective=False, frozen=False) -> Dict:
     """ Upon receiving a message with this object, Telegram clients will display a reply interface to the user
 
     Notes:
@@ -184,12 +286,15 @@ def getForceReply(selective=False) -> Dict:
 
     Args:
         selective (bool, optional): Use this parameter if you want to force reply from specific users only. Defaults to False.
+        frozen (bool, optional): Return the shared FrozenMarkup of this keyboard, serialized once. Defaults to False.
 
     Returns:
         Dict: ForceReply object.
     """
 
-    return {'force_reply': True, 'selective': selective}
+    markup = {'force_reply': True, 'selective': selective}
+
+    return freezeMarkup(markup) if frozen else markup
 
 
 def getInputMediaPhoto(media: str, caption="", parse_mode='MarkdownV2') -> Dict:
@@ -0,0 +1,206 @@
+"""
+
+This module contains the broadcast engine sending one message to a large number of chats.
+
+Author: Eric Damian
+
+"""
+
+import collections
+import concurrent.futures
+import os
+import threading
+from typing import Dict, Iterable
+
+from .rate_limiter import RateLimiter
+
+class Broadcast():
+    """ Sends one message to many chats at the maximum rate allowed by the flood limits.
+
+    Every outcome is appended to the result file as a "chat_id<TAB>status[<TAB>detail]" line.
+    The result file is also the checkpoint: running again with the same file skips every chat already handled.
+    Results are flushed to disk in batches, so a crash resends at most the last unflushed batch.
+
+    Status is one of sent, blocked, kicked, deleted, not_found, migrated, failed or error.
+    Chats ending with error (network failures, server errors and flood waits left after the retries) are retried on the next run.
+    """
+
+    FINAL_STATUSES = ('sent', 'blocked', 'kicked', 'deleted', 'not_found', 'migrated', 'failed')
+
+    def __init__(self, bot, chat_ids: Iterable, method='sendMessage', kwargs={}, result_file='broadcast_results.tsv', workers=16, flush_every=100):
+        """ Constructor of Broadcast class
+
+        Notes:
+            If the bot has no RateLimiter a default one paces the broadcast while run() lasts. Give the bot a pool_maxsize of at least workers.
+
+        Args:
+            bot (TelegramBotApi): Bot used to send the messages.
+            chat_ids (Iterable): Unique identifiers of the target chats, it can be a generator.
+            method (str, optional): Bot method called for every chat with chat_id as first argument, e.g. sendMessage or copyMessage. Defaults to 'sendMessage'.
+            kwargs (dict, optional): Other arguments of the method, e.g. {'text': 'Hello'}. Defaults to {}.
+            result_file (str, optional): Path of the result file, used to resume an interrupted broadcast. Defaults to 'broadcast_results.tsv'.
+            workers (int, optional): Number of threads sending in parallel. Defaults to 16.
+            flush_every (int, optional): Number of results written before the file is synced to disk. Defaults to 100.
+        """
+
+        self.bot = bot
+        self.chatIds = chat_ids
+        self.method = method
+        self.kwargs = dict(kwargs)
+        self.resultFile = result_file
+        self.workers = workers
+        self.flushEvery = flush_every
+
+        self.counts = collections.Counter()
+        self.lock = threading.Lock()
+        self.unflushed = 0
+
+    def getProgress(self) -> Dict:
+        """ Use this method to get how many chats ended with every status so far.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/Broadcast
+
+        Returns:
+            Dict: Status mapped to its number of chats, skipped counts the chats done by a previous run.
+        """
+
+        with self.lock:
+            return dict(self.counts)
+
+    def run(self) -> Dict:
+        """ Use this method to send the message to every chat not handled yet.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/Broadcast
+
+        Returns:
+            Dict: Status mapped to its number of chats.
+        """
+
+        done = self._loadDone()
+        previous = self.bot.getRateLimiter()
+
+        if previous is None: # Paces this broadcast only, the bot gets its previous setting back
+            self.bot.setRateLimiter(RateLimiter())
+
+        slots = threading.BoundedSemaphore(self.workers * 4) # Keeps the queue short even with millions of chats
+
+        try:
+
+            with open(self.resultFile, 'a', encoding='utf-8') as output, concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as executor:
+
+                for chat_id in self.chatIds:
+
+                    if str(chat_id) in done:
+
+                        with self.lock:
+                            self.counts['skipped'] += 1
+
+                        continue
+
+                    slots.acquire()
+                    future = executor.submit(self._sendOne, chat_id)
+                    future.add_done_callback(lambda future, chat_id=chat_id: self._record(output, chat_id, future, slots))
+
+                executor.shutdown(wait=True)
+
+                output.flush()
+                os.fsync(output.fileno())
+
+        finally:
+
+            if previous is None:
+                self.bot.setRateLimiter(None)
+
+        return self.getProgress()
+
+    def _loadDone(self) -> set:
+        """ Read the chats already handled from the result file """
+
+        done = set()
+
+        if not os.path.isfile(self.resultFile):
+            return done
+
+        with open(self.resultFile, encoding='utf-8') as results:
+
+            for line in results:
+
+                fields = line.rstrip('\n').split('\t')
+
+                if len(fields) >= 2 and fields[1] in self.FINAL_STATUSES:
+                    done.add(fields[0])
+
+        return done
+
+    def _sendOne(self, chat_id):
+        """ Send the message to one chat and classify the outcome """
+
+        response = getattr(self.bot, self.method)(chat_id, **self.kwargs)
+
+        if not (isinstance(response, dict) and 'error' in response):
+            return 'sent', ''
+
+        migrateTo = response.get('parameters', {}).get('migrate_to_chat_id')
+
+        if migrateTo is not None: # The group became a supergroup, deliver there
+
+            status, detail = self._sendOne(migrateTo)
+            return ('migrated', str(migrateTo)) if status == 'sent' else (status, detail)
+
+        return self.classifyError(response.get('description', ''), response.get('error_code')), response.get('description', '').replace('\t', ' ').replace('\n', ' ')
+
+    @staticmethod
+    def classifyError(description: str, error_code=None) -> str:
+        """ Use this method to map a failed send to a broadcast status.
+
+        Args:
+            description (str): Description of the error returned by Telegram.
+            error_code (int, optional): Error code returned by Telegram. Defaults to None.
+
+        Returns:
+            str: Broadcast status.
+        """
+
+        if error_code == 429 or (error_code or 0) >= 500: # Flood waits and server errors, including bodies that are not JSON, go away by themselves
+            return 'error'
+
+        description = description.lower()
+
+        if description.startswith('too many requests') or description.startswith('bad gateway') or 'internal server error' in description:
+            return 'error'
+
+        if 'blocked by the user' in description:
+            return 'blocked'
+        if 'kicked' in description or 'not a member' in description:
+            return 'kicked'
+        if 'deactivated' in description:
+            return 'deleted'
+        if 'chat not found' in description:
+            return 'not_found'
+
+        return 'failed'
+
+    def _record(self, output, chat_id, future, slots):
+        """ Append the outcome of one chat to the result file """
+
+        try:
+            status, detail = future.result()
+        except Exception as error:
+            status, detail = 'error', str(error).replace('\t', ' ').replace('\n', ' ')
+
+        line = f"{chat_id}\t{status}\t{detail}\n" if detail else f"{chat_id}\t{status}\n"
+
+        with self.lock:
+
+            output.write(line)
+            self.counts[status] += 1
+            self.unflushed += 1
+
+            if self.unflushed >= self.flushEvery: # Group the fsyncs, a crash resends at most this batch
+                output.flush()
+                os.fsync(output.fileno())
+                self.unflushed = 0
+
+        slots.release()
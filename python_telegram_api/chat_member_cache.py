@@ -0,0 +1,153 @@
+"""
+
+This module contains the in-memory cache of the ChatMember objects returned by getChatMember.
+
+Author: Eric Damian
+
+"""
+
+import collections
+import threading
+import time
+from typing import Dict, Iterable
+
+class ChatMemberCache():
+    """ LRU cache of ChatMember objects keyed by (chat_id, user_id), every entry expires after ttl seconds.
+
+    The bot keeps it in sync with the chat_member and my_chat_member updates received through getUpdates and pollUpdates:
+    the new ChatMember object of the update replaces the cached one, and users joining or leaving in a message are forgotten.
+    chat_member updates are only sent to administrators that list them in allowed_updates, otherwise the ttl bounds staleness.
+    """
+
+    def __init__(self, ttl=300, max_entries=100000):
+        """ Constructor of ChatMemberCache class
+
+        Args:
+            ttl (float, optional): Seconds an entry is trusted. Defaults to 300.
+            max_entries (int, optional): Number of entries kept, the least recently used are evicted first. Defaults to 100000.
+        """
+
+        self.ttl = ttl
+        self.maxEntries = max_entries
+        self.entries = collections.OrderedDict() # (chat_id, user_id) -> (expires at, ChatMember)
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, chat_id: str, user_id: str):
+        """ Use this method to get a cached ChatMember object.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/ChatMemberCache
+
+        Args:
+            chat_id (str): Unique identifier of the chat.
+            user_id (str): Unique identifier of the user.
+
+        Returns:
+            Dict: The ChatMember object, None if it is not cached or its entry expired.
+        """
+
+        key = (str(chat_id), str(user_id))
+
+        with self.lock:
+
+            entry = self.entries.get(key)
+
+            if entry is None or entry[0] < time.monotonic():
+
+                if entry is not None:
+                    del self.entries[key]
+
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, chat_id: str, user_id: str, member: Dict) -> bool:
+        """ Use this method to cache a ChatMember object.
+
+        Args:
+            chat_id (str): Unique identifier of the chat.
+            user_id (str): Unique identifier of the user.
+            member (Dict): ChatMember object returned by Telegram.
+
+        Returns:
+            bool: True if the object has been cached correctly.
+        """
+
+        try:
+            with self.lock:
+
+                key = (str(chat_id), str(user_id))
+                self.entries[key] = (time.monotonic() + self.ttl, member)
+                self.entries.move_to_end(key)
+
+                while len(self.entries) > self.maxEntries:
+                    self.entries.popitem(last=False)
+
+            return True
+        except:
+            return False
+
+    def delete(self, chat_id: str, user_id: str) -> bool:
+        """ Use this method to forget a ChatMember object, e.g. after banning or promoting the user.
+
+        Args:
+            chat_id (str): Unique identifier of the chat.
+            user_id (str): Unique identifier of the user.
+
+        Returns:
+            bool: True if an entry has been deleted.
+        """
+
+        with self.lock:
+            return self.entries.pop((str(chat_id), str(user_id)), None) is not None
+
+    def clear(self):
+        """ Use this method to forget every ChatMember object """
+
+        with self.lock:
+            self.entries.clear()
+
+    def observeUpdates(self, updates: Iterable[Dict]):
+        """ Use this method to keep the cache in sync with incoming updates, e.g. the ones received by a webhook.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/ChatMemberCache
+
+        Args:
+            updates (Iterable[Dict]): Update objects as returned by getUpdates.
+        """
+
+        for update in updates:
+
+            changed = update.get('chat_member') or update.get('my_chat_member')
+
+            if changed is not None:
+                self.set(changed['chat']['id'], changed['new_chat_member']['user']['id'], changed['new_chat_member'])
+                continue
+
+            message = update.get('message')
+
+            if message is None:
+                continue
+
+            for user in message.get('new_chat_members') or ():
+                self.delete(message['chat']['id'], user['id'])
+
+            if 'left_chat_member' in message:
+                self.delete(message['chat']['id'], message['left_chat_member']['id'])
+
+    def getStats(self) -> Dict:
+        """ Use this method to get the number of entries, hits and misses of the cache.
+
+        Returns:
+            Dict: entries, hits and misses.
+        """
+
+        with self.lock:
+            return {'entries': len(self.entries), 'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,223 @@
+"""
+
+This module contains the dispatcher routing Update objects to their handlers.
+
+Author: Eric Damian
+
+"""
+
+from typing import Dict, List
+
+MESSAGE_TYPES = ('message', 'edited_message', 'channel_post', 'edited_channel_post')
+
+class Dispatcher():
+    """ Routes Update objects to handlers registered by update type, /command, callback_data prefix and chat type.
+
+    Handlers are compiled into lookup tables: commands are found with one hash lookup and callback_data
+    prefixes by walking a trie over the data, so dispatching costs the same with five or five hundred handlers.
+    Command and callback handlers win over plain update type handlers, the longest callback_data prefix wins,
+    and among handlers matching equally the one registered first wins.
+    """
+
+    def __init__(self, bot_username=''):
+        """ Constructor of Dispatcher class
+
+        Args:
+            bot_username (str, optional): Username of the bot, commands addressed to another bot (/cmd@otherbot) are then ignored. Defaults to ''.
+        """
+
+        self.botUsername = bot_username.lower()
+        self.handlers = [] # Registration order, used to pick the winner among matching handlers
+        self.compiled = False
+
+    def addHandler(self, handler, update_type=None, command=None, callback_prefix=None, chat_type=None) -> bool:
+        """ Use this method to register a handler.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/Dispatcher
+
+        Args:
+            handler (callable): Function taking the Update object as only argument.
+            update_type (str, optional): Only updates of this type, e.g. 'message' or 'callback_query'. Defaults to None.
+            command (str, optional): Only messages starting with this /command, without the slash. Defaults to None.
+            callback_prefix (str, optional): Only callback queries whose callback_data starts with this prefix. Defaults to None.
+            chat_type (str, optional): Only updates from chats of this type, e.g. 'private' or 'supergroup'. Defaults to None.
+
+        Returns:
+            bool: True if the handler has been registered correctly.
+        """
+
+        if not callable(handler) or (command is not None and callback_prefix is not None):
+            return False
+
+        if callback_prefix is not None:
+            update_type = 'callback_query'
+
+        self.handlers.append((handler, update_type, command.lower() if command is not None else None, callback_prefix, chat_type))
+        self.compiled = False
+        return True
+
+    def onCommand(self, command: str, chat_type=None):
+        """ Use this decorator to register a handler for a /command """
+
+        def register(handler):
+            self.addHandler(handler, command=command, chat_type=chat_type)
+            return handler
+
+        return register
+
+    def onCallback(self, callback_prefix: str, chat_type=None):
+        """ Use this decorator to register a handler for callback queries whose callback_data starts with a prefix """
+
+        def register(handler):
+            self.addHandler(handler, callback_prefix=callback_prefix, chat_type=chat_type)
+            return handler
+
+        return register
+
+    def onUpdate(self, update_type=None, chat_type=None):
+        """ Use this decorator to register a handler for every update of a type """
+
+        def register(handler):
+            self.addHandler(handler, update_type=update_type, chat_type=chat_type)
+            return handler
+
+        return register
+
+    def compile(self):
+        """ Build the lookup tables, done automatically by the first dispatch after a registration """
+
+        self.typeTable = {} # (update_type, chat_type) -> [(order, handler)]
+        self.commandTable = {} # (command, chat_type) -> [(order, handler)]
+        self.callbackTrie = {} # char -> node, node[None] maps chat_type -> [(order, handler)]
+
+        for order, (handler, update_type, command, callback_prefix, chat_type) in enumerate(self.handlers):
+
+            if command is not None:
+                self.commandTable.setdefault((command, chat_type), []).append((order, handler))
+
+            elif callback_prefix is not None:
+
+                node = self.callbackTrie
+
+                for char in callback_prefix:
+                    node = node.setdefault(char, {})
+
+                node.setdefault(None, {}).setdefault(chat_type, []).append((order, handler))
+
+            else:
+                self.typeTable.setdefault((update_type, chat_type), []).append((order, handler))
+
+        self.compiled = True
+
+    def dispatch(self, update: Dict):
+        """ Use this method to run the handler matching an Update object.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/Dispatcher
+
+        Args:
+            update (Dict): Update object, as returned by getUpdates.
+
+        Returns:
+            The value returned by the handler, None if no handler matches.
+        """
+
+        if not self.compiled:
+            self.compile()
+
+        updateType = self.getUpdateType(update)
+        body = update.get(updateType) or {}
+        chatType = self.getChatType(body)
+
+        specific = [] # Command and callback_data matches win over plain update type handlers
+
+        if updateType in MESSAGE_TYPES:
+
+            command = self.getCommand(body.get('text') or body.get('caption') or '')
+
+            if command is not None:
+                specific = [self.commandTable.get((command, chatType)), self.commandTable.get((command, None))]
+
+        elif updateType == 'callback_query':
+
+            node = self.callbackTrie
+            data = body.get('data') or ''
+
+            for depth in range(len(data) + 1): # The longest matching prefix wins
+
+                if None in node and (chatType in node[None] or None in node[None]):
+                    specific = [node[None].get(chatType), node[None].get(None)]
+
+                if depth == len(data) or data[depth] not in node:
+                    break
+
+                node = node[data[depth]]
+
+        candidates = specific if any(specific) else [
+            self.typeTable.get((updateType, chatType)),
+            self.typeTable.get((updateType, None)),
+            self.typeTable.get((None, chatType)),
+            self.typeTable.get((None, None)),
+        ]
+
+        heads = [entries[0] for entries in candidates if entries] # Lists are sorted by registration order
+
+        if len(heads) == 0:
+            return None
+
+        order, handler = min(heads, key=lambda head: head[0])
+        return handler(update)
+
+    def dispatchAll(self, updates: List) -> List:
+        """ Use this method to run the matching handler of every Update object of a list.
+
+        Args:
+            updates (List): Update objects, as returned by getUpdates.
+
+        Returns:
+            List: The value returned for every update.
+        """
+
+        return [self.dispatch(update) for update in updates]
+
+    @staticmethod
+    def getUpdateType(update: Dict) -> str:
+        """ Use this method to get the type of an Update object, e.g. 'message' """
+
+        for key in update:
+            if key != 'update_id':
+                return key
+
+        return ''
+
+    @staticmethod
+    def getChatType(body: Dict):
+        """ Use this method to get the chat type of the body of an Update object, None if it has no chat """
+
+        chat = body.get('chat') or (body.get('message') or {}).get('chat')
+
+        if chat is not None:
+            return chat.get('type')
+
+        return body.get('chat_type') # Inline queries only carry the type
+
+    def getCommand(self, text: str):
+        """ Use this method to get the command of a message text, without slash and bot username.
+
+        Args:
+            text (str): Text of the message.
+
+        Returns:
+            str: The lower-cased command, None if the text is not a command for this bot.
+        """
+
+        if not text.startswith('/') or len(text) == 1 or text[1].isspace():
+            return None
+
+        command, _, username = text[1:].split(None, 1)[0].partition('@')
+
+        if command == '' or (username != '' and self.botUsername != '' and username.lower() != self.botUsername):
+            return None
+
+        return command.lower()
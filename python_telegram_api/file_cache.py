@@ -0,0 +1,174 @@
+"""
+
+This module contains the persistent cache mapping the content of local files to the file_id Telegram gave them.
+
+Author: Eric Damian
+
+"""
+
+import collections
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+class FileIdCache():
+    """ SQLite cache mapping the content hash of a local file to its Telegram file_id.
+
+    Once a file has been uploaded, later sends of the same content reuse its file_id instead of uploading the bytes again.
+    Entries are keyed by content and kind (photo, document, ...) because a file_id can only be resent as the kind it was uploaded as.
+    """
+
+    def __init__(self, path='file_id_cache.sqlite', max_entries=10000, max_age=30 * 24 * 3600, max_bytes=None):
+        """ Constructor of FileIdCache class
+
+        Args:
+            path (str, optional): Path of the SQLite database. Defaults to 'file_id_cache.sqlite'.
+            max_entries (int, optional): Number of entries kept, the least recently used are evicted first. Defaults to 10000.
+            max_age (int, optional): Seconds after which an entry is evicted. Defaults to 30 days.
+            max_bytes (int, optional): Total size of the cached contents, the least recently used are evicted beyond it. None means no limit. Defaults to None.
+        """
+
+        self.maxEntries = max_entries
+        self.maxAge = max_age
+        self.maxBytes = max_bytes
+        self.digests = collections.OrderedDict() # (path, size, mtime) -> digest, so an unchanged file is hashed only once, least recently used first
+        self.digestLock = threading.Lock()
+        self.lock = threading.Lock()
+
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('CREATE TABLE IF NOT EXISTS file_ids (digest TEXT, kind TEXT, file_id TEXT, size INTEGER, created REAL, last_used REAL, PRIMARY KEY (digest, kind))')
+
+    def close(self) -> bool:
+        """ Use this method to close the database.
+
+        Returns:
+            bool: True if the database has been closed correctly.
+        """
+
+        try:
+            with self.lock:
+                self.connection.close()
+            return True
+        except:
+            return False
+
+    def hashFile(self, path: str) -> str:
+        """ Use this method to get the content hash of a local file.
+
+        Args:
+            path (str): Path of the file.
+
+        Returns:
+            str: SHA-256 hex digest of the content.
+        """
+
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+
+        with self.digestLock:
+
+            digest = self.digests.get(key)
+
+            if digest is not None:
+                self.digests.move_to_end(key)
+                return digest
+
+        sha = hashlib.sha256()
+
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b''):
+                sha.update(chunk)
+
+        digest = sha.hexdigest()
+
+        with self.digestLock: # Bounded like the database, the paths seen by a long running bot would grow forever
+
+            self.digests[key] = digest
+
+            while len(self.digests) > self.maxEntries:
+                self.digests.popitem(last=False)
+
+        return digest
+
+    def get(self, digest: str, kind: str):
+        """ Use this method to get the file_id of a content already uploaded.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/FileIdCache
+
+        Args:
+            digest (str): Content hash, see hashFile.
+            kind (str): Kind of the upload, e.g. 'photo' or 'document'.
+
+        Returns:
+            str: The file_id, None if the content is not cached or its entry expired.
+        """
+
+        now = time.time()
+
+        with self.lock:
+
+            row = self.connection.execute('SELECT file_id, created FROM file_ids WHERE digest = ? AND kind = ?', (digest, kind)).fetchone()
+
+            if row is None:
+                return None
+
+            if now - row[1] > self.maxAge:
+                self.connection.execute('DELETE FROM file_ids WHERE digest = ? AND kind = ?', (digest, kind))
+                return None
+
+            self.connection.execute('UPDATE file_ids SET last_used = ? WHERE digest = ? AND kind = ?', (now, digest, kind))
+            return row[0]
+
+    def set(self, digest: str, kind: str, file_id: str, size=0) -> bool:
+        """ Use this method to remember the file_id Telegram gave to an uploaded content.
+
+        Args:
+            digest (str): Content hash, see hashFile.
+            kind (str): Kind of the upload, e.g. 'photo' or 'document'.
+            file_id (str): Identifier returned by Telegram.
+            size (int, optional): Size of the content in bytes. Defaults to 0.
+
+        Returns:
+            bool: True if the file_id has been stored correctly.
+        """
+
+        now = time.time()
+
+        try:
+            with self.lock:
+                self.connection.execute('INSERT OR REPLACE INTO file_ids VALUES (?, ?, ?, ?, ?, ?)', (digest, kind, file_id, size, now, now))
+                self._evict(now)
+            return True
+        except sqlite3.Error:
+            return False
+
+    def delete(self, digest: str, kind: str) -> bool:
+        """ Use this method to forget a file_id, e.g. one Telegram does not accept anymore.
+
+        Args:
+            digest (str): Content hash, see hashFile.
+            kind (str): Kind of the upload, e.g. 'photo' or 'document'.
+
+        Returns:
+            bool: True if the entry has been deleted correctly.
+        """
+
+        try:
+            with self.lock:
+                self.connection.execute('DELETE FROM file_ids WHERE digest = ? AND kind = ?', (digest, kind))
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _evict(self, now: float):
+        """ Drop expired entries, then the least recently used ones beyond max_entries and max_bytes """
+
+        self.connection.execute('DELETE FROM file_ids WHERE created < ?', (now - self.maxAge,))
+        self.connection.execute('DELETE FROM file_ids WHERE rowid IN (SELECT rowid FROM file_ids ORDER BY last_used DESC LIMIT -1 OFFSET ?)', (self.maxEntries,))
+
+        if self.maxBytes is not None: # Keep the most recently used entries whose sizes add up to max_bytes
+            self.connection.execute('DELETE FROM file_ids WHERE rowid IN (SELECT rowid FROM (SELECT rowid, SUM(size) OVER (ORDER BY last_used DESC, rowid DESC) AS total FROM file_ids) WHERE total > ?)', (self.maxBytes,))
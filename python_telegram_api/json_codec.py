@@ -0,0 +1,143 @@
+"""
+
+This module contains the JSON codec used to encode requests and decode responses.
+
+The fastest installed backend is picked: orjson, then msgspec, then ujson, then the standard json module.
+
+Author: Eric Damian
+
+"""
+
+import json
+
+BACKENDS = ('orjson', 'msgspec', 'ujson', 'json')
+
+_name = 'json'
+_dumps = lambda obj: json.dumps(obj)
+_dumpsBytes = lambda obj: json.dumps(obj).encode('utf-8')
+_loads = json.loads
+
+class Preserialized():
+    """ Base of the immutable objects carrying their own cached JSON encoding, dumps returns it as is """
+
+    __slots__ = ()
+
+    def toJson(self) -> str:
+        raise NotImplementedError
+
+    def toJsonBytes(self) -> bytes:
+        return self.toJson().encode('utf-8')
+
+def dumps(obj) -> str:
+    """ Use this function to serialize an object to a JSON string.
+
+    Args:
+        obj: Object made of dicts, lists, strings, numbers, booleans and None.
+
+    Returns:
+        str: JSON document.
+    """
+
+    if isinstance(obj, Preserialized):
+        return obj.toJson()
+
+    return _dumps(obj)
+
+def dumpsBytes(obj) -> bytes:
+    """ Use this function to serialize an object to UTF-8 JSON, e.g. a request body, without going through a str.
+
+    Args:
+        obj: Object made of dicts, lists, strings, numbers, booleans and None.
+
+    Returns:
+        bytes: JSON document.
+    """
+
+    if isinstance(obj, Preserialized):
+        return obj.toJsonBytes()
+
+    return _dumpsBytes(obj)
+
+def loads(data):
+    """ Use this function to parse a JSON document.
+
+    Args:
+        data (bytes or str): JSON document.
+
+    Returns:
+        The decoded object.
+
+    Raises:
+        ValueError: If the document is not valid JSON, whatever the backend.
+    """
+
+    return _loads(data)
+
+def getCodecName() -> str:
+    """ Use this function to get the name of the backend in use.
+
+    Notes:
+        For more info -> https://github.com/xSklero/python-telegram-api/wiki/json_codec
+
+    Returns:
+        str: One of orjson, msgspec, ujson or json.
+    """
+
+    return _name
+
+def setCodec(name: str) -> bool:
+    """ Use this function to choose the JSON backend.
+
+    Notes:
+        For more info -> https://github.com/xSklero/python-telegram-api/wiki/json_codec
+
+    Args:
+        name (str): One of orjson, msgspec, ujson or json.
+
+    Returns:
+        bool: True if the backend is installed and has been set correctly.
+    """
+
+    global _name, _dumps, _dumpsBytes, _loads
+
+    try:
+
+        if name == 'orjson':
+            import orjson
+            dumpsBackend, loadsBackend = lambda obj: orjson.dumps(obj).decode('utf-8'), orjson.loads
+            dumpsBytesBackend = orjson.dumps # Already UTF-8 bytes
+
+        elif name == 'msgspec':
+            import msgspec
+            encoder, decoder = msgspec.json.Encoder(), msgspec.json.Decoder()
+
+            def loadsBackend(data):
+                try:
+                    return decoder.decode(data)
+                except msgspec.DecodeError as error: # Raise ValueError like every other backend
+                    raise ValueError(str(error)) from error
+
+            dumpsBackend = lambda obj: encoder.encode(obj).decode('utf-8')
+            dumpsBytesBackend = encoder.encode
+
+        elif name == 'ujson':
+            import ujson
+            dumpsBackend, loadsBackend = lambda obj: ujson.dumps(obj, ensure_ascii=False), ujson.loads
+            dumpsBytesBackend = lambda obj: ujson.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+        elif name == 'json':
+            dumpsBackend, loadsBackend = lambda obj: json.dumps(obj), json.loads
+            dumpsBytesBackend = lambda obj: json.dumps(obj).encode('utf-8')
+
+        else:
+            return False
+
+    except ImportError:
+        return False
+
+    _name, _dumps, _dumpsBytes, _loads = name, dumpsBackend, dumpsBytesBackend, loadsBackend
+    return True
+
+for _backend in BACKENDS: # Pick the fastest backend installed
+    if setCodec(_backend):
+        break
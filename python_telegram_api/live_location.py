@@ -0,0 +1,380 @@
+"""
+
+This module contains the manager of live location messages, coalescing positions into edits paced within flood limits.
+
+Author: Eric Damian
+
+"""
+
+import concurrent.futures
+import heapq
+import itertools
+import threading
+import time
+import traceback
+from typing import Dict
+
+from .rate_limiter import RateLimiter
+from .transport import NETWORK_ERRORS
+
+class _LiveLocation():
+    """ State of one tracked live location message """
+
+    __slots__ = ('key', 'target', 'chatId', 'position', 'sent', 'dirty', 'inFlight', 'nextEdit', 'expiresAt')
+
+    def __init__(self, key, target: Dict, chatId, position: Dict, expiresAt: float):
+
+        self.key = key
+        self.target = target # chat_id and message_id, or inline_message_id
+        self.chatId = chatId
+        self.position = position # Latest position received
+        self.sent = position # Latest position Telegram accepted
+        self.dirty = False
+        self.inFlight = False
+        self.nextEdit = 0.0
+        self.expiresAt = expiresAt
+
+class LiveLocationManager():
+    """ Keeps many live location messages up to date from a feed of positions, e.g. GPS trackers.
+
+    update only stores the latest position of a message, dropping the ones not sent yet, and a scheduler thread edits
+    every message at most once per interval with its newest position, one edit in flight per message. With a RateLimiter
+    on the bot the interval of a chat also grows with the number of its live messages, so their edits fit its flood limit.
+    Messages are stopped with stopMessageLiveLocation shortly before their live_period expires.
+    """
+
+    GONE_ERRORS = ('message to edit not found', "message can't be edited", 'expired') # Descriptions of a message that can no longer be edited
+    POSITION_FIELDS = ('latitude', 'longitude', 'heading') # Fields an edit is needed for
+
+    def __init__(self, bot, interval=5, workers=8, stop_margin=5):
+        """ Constructor of LiveLocationManager class
+
+        Args:
+            bot (TelegramBotApi): Bot sending and editing the live locations.
+            interval (float, optional): Minimum seconds between two edits of the same message. Defaults to 5.
+            workers (int, optional): Number of threads sending the edits, give the bot a pool_maxsize of at least workers. Defaults to 8.
+            stop_margin (float, optional): Seconds before the end of live_period the message is stopped, while Telegram still accepts it. Defaults to 5.
+        """
+
+        self.bot = bot
+        self.interval = interval
+        self.workers = workers
+        self.stopMargin = stop_margin
+
+        self.locations = {} # key -> _LiveLocation
+        self.chatCounts = {} # chat_id -> number of tracked messages
+        self.schedule = [] # Heap of (time, sequence, kind, key), stale entries are skipped when popped
+        self.sequence = itertools.count()
+        self.condition = threading.Condition()
+        self.counts = {'edits': 0, 'superseded': 0, 'stopped': 0, 'failed': 0}
+
+        self.executor = None
+        self.thread = None
+        self.running = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    def getKey(chat_id=None, message_id=None, inline_message_id=None):
+        """ Use this method to get the key a live location message is tracked under """
+
+        return ('', '', str(inline_message_id)) if inline_message_id is not None else (str(chat_id), str(message_id), '')
+
+    def send(self, chat_id: str, latitude: float, longitude: float, live_period=3600, **kwargs) -> Dict:
+        """ Use this method to send a live location and track it.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/LiveLocationManager
+
+        Args:
+            chat_id (str): Unique identifier for the target chat or username of the target channel.
+            latitude (float): Latitude of the location.
+            longitude (float): Longitude of the location.
+            live_period (int, optional): Period in seconds for which the location will be updated, between 60 and 86400. Defaults to 3600.
+            **kwargs: Other arguments of sendLocation, e.g. horizontal_accuracy or reply_markup.
+
+        Returns:
+            Dict: On success, the sent Message is returned.
+        """
+
+        message = self.bot.sendLocation(chat_id, latitude, longitude, live_period=live_period, **kwargs)
+
+        if isinstance(message, dict) and 'message_id' in message:
+            self.track(live_period, chat_id=chat_id, message_id=message['message_id'], latitude=latitude, longitude=longitude)
+
+        return message
+
+    def track(self, live_period: int, chat_id=None, message_id=None, inline_message_id=None, latitude=None, longitude=None, sent_at=None) -> bool:
+        """ Use this method to track a live location message sent elsewhere, e.g. an inline one.
+
+        Args:
+            live_period (int): live_period the message was sent with.
+            chat_id (str, optional): Required if inline_message_id is not specified. Unique identifier for the target chat. Defaults to None.
+            message_id (str, optional): Required if inline_message_id is not specified. Identifier of the message. Defaults to None.
+            inline_message_id (str, optional): Required if chat_id and message_id are not specified. Identifier of the inline message. Defaults to None.
+            latitude (float, optional): Latitude the message shows. Defaults to None.
+            longitude (float, optional): Longitude the message shows. Defaults to None.
+            sent_at (float, optional): Unix time the message was sent at. Defaults to now.
+
+        Returns:
+            bool: True if the message is tracked.
+        """
+
+        key = self.getKey(chat_id, message_id, inline_message_id)
+        target = {'inline_message_id': inline_message_id} if inline_message_id is not None else {'chat_id': chat_id, 'message_id': message_id}
+        expiresAt = time.monotonic() + live_period - (time.time() - sent_at if sent_at is not None else 0)
+
+        with self.condition:
+
+            if key in self.locations:
+                return False
+
+            chatId = key[0] or None
+            self.locations[key] = _LiveLocation(key, target, chatId, {'latitude': latitude, 'longitude': longitude}, expiresAt)
+
+            if chatId is not None:
+                self.chatCounts[chatId] = self.chatCounts.get(chatId, 0) + 1
+
+            self._push(expiresAt - self.stopMargin, 'stop', key)
+            return True
+
+    def update(self, latitude: float, longitude: float, chat_id=None, message_id=None, inline_message_id=None, horizontal_accuracy=None, heading=None, proximity_alert_radius=None) -> bool:
+        """ Use this method to give the new position of a live location message, it is sent with the next edit.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/LiveLocationManager
+
+        Args:
+            latitude (float): Latitude of new location.
+            longitude (float): Longitude of new location.
+            chat_id (str, optional): Required if inline_message_id is not specified. Unique identifier for the target chat. Defaults to None.
+            message_id (str, optional): Required if inline_message_id is not specified. Identifier of the message. Defaults to None.
+            inline_message_id (str, optional): Required if chat_id and message_id are not specified. Identifier of the inline message. Defaults to None.
+            horizontal_accuracy (str, optional): The radius of uncertainty for the location, measured in meters; 0-1500. Defaults to None.
+            heading (str, optional): Direction in which the user is moving, in degrees. Must be between 1 and 360 if specified. Defaults to None.
+            proximity_alert_radius (str, optional): Maximum distance for proximity alerts about approaching another chat member, in meters. Must be between 1 and 100000. Defaults to None.
+
+        Returns:
+            bool: True if the message is tracked.
+        """
+
+        position = {'latitude': latitude, 'longitude': longitude, 'horizontal_accuracy': horizontal_accuracy, 'heading': heading, 'proximity_alert_radius': proximity_alert_radius}
+
+        with self.condition:
+
+            location = self.locations.get(self.getKey(chat_id, message_id, inline_message_id))
+
+            if location is None:
+                return False
+
+            if location.dirty:
+                self.counts['superseded'] += 1
+            elif any(position.get(field) != location.sent.get(field) for field in self.POSITION_FIELDS):
+                location.dirty = True
+
+                if not location.inFlight:
+                    self._push(location.nextEdit, 'edit', location.key)
+
+            location.position = position
+            return True
+
+    def stopLocation(self, chat_id=None, message_id=None, inline_message_id=None) -> Dict:
+        """ Use this method to stop a live location message now and stop tracking it.
+
+        Args:
+            chat_id (str, optional): Required if inline_message_id is not specified. Unique identifier for the target chat. Defaults to None.
+            message_id (str, optional): Required if inline_message_id is not specified. Identifier of the message. Defaults to None.
+            inline_message_id (str, optional): Required if chat_id and message_id are not specified. Identifier of the inline message. Defaults to None.
+
+        Returns:
+            Dict: The result of stopMessageLiveLocation.
+        """
+
+        location = self._forget(self.getKey(chat_id, message_id, inline_message_id))
+
+        if location is None:
+            return self.bot.stopMessageLiveLocation(chat_id, message_id, inline_message_id)
+
+        return self._stop(location)
+
+    def getStats(self) -> Dict:
+        """ Use this method to get the number of tracked messages, edits sent, positions superseded before being sent, messages stopped and failed edits.
+
+        Returns:
+            Dict: tracked, edits, superseded, stopped and failed.
+        """
+
+        with self.condition:
+            return {'tracked': len(self.locations), **self.counts}
+
+    def start(self) -> bool:
+        """ Use this method to start sending the edits in background.
+
+        Returns:
+            bool: True if the manager has been started correctly.
+        """
+
+        if self.thread is not None:
+            return False
+
+        self.running = True
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.workers)
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return True
+
+    def close(self, stop_locations=False) -> bool:
+        """ Use this method to stop the scheduler.
+
+        Args:
+            stop_locations (bool, optional): If True every tracked message is stopped with stopMessageLiveLocation. Defaults to False.
+
+        Returns:
+            bool: True if the manager has been closed correctly.
+        """
+
+        try:
+
+            with self.condition:
+                self.running = False
+                self.condition.notify_all()
+
+            if self.thread is not None:
+                self.thread.join()
+                self.executor.shutdown(wait=True)
+                self.thread = None
+
+            if stop_locations:
+                for key in list(self.locations):
+
+                    location = self._forget(key)
+
+                    if location is not None: # Already forgotten by a concurrent stopLocation
+                        self._stop(location)
+
+            return True
+        except:
+            return False
+
+    def _intervalFor(self, chatId) -> float:
+        """ Seconds between two edits of a message, so the messages of its chat share the flood limit of the chat """
+
+        limiter = self.bot.getRateLimiter()
+
+        if chatId is None or limiter is None:
+            return self.interval
+
+        rate = (limiter.groupLimit if RateLimiter.isGroup(chatId) else limiter.privateLimit)[0]
+
+        return max(self.interval, self.chatCounts.get(chatId, 1) / rate)
+
+    def _push(self, when: float, kind: str, key):
+        """ Schedule an action, the lock must be held """
+
+        heapq.heappush(self.schedule, (when, next(self.sequence), kind, key))
+        self.condition.notify_all()
+
+    def _run(self):
+        """ Body of the scheduler thread: submit the edits and stops as they come due """
+
+        while True:
+
+            with self.condition:
+
+                while self.running and (not self.schedule or self.schedule[0][0] > time.monotonic()):
+                    self.condition.wait(self.schedule[0][0] - time.monotonic() if self.schedule else None)
+
+                if not self.running:
+                    return
+
+                when, _, kind, key = heapq.heappop(self.schedule)
+                location = self.locations.get(key)
+
+                if location is None: # Stopped meanwhile
+                    continue
+
+                if kind == 'stop':
+                    self._forget(key)
+                    self.executor.submit(self._stop, location)
+                    continue
+
+                if not location.dirty or location.inFlight or when < location.nextEdit: # Superseded schedule entry
+                    continue
+
+                position = location.position
+                location.dirty = False
+                location.inFlight = True
+
+            self.executor.submit(self._edit, location, position)
+
+    def _edit(self, location: _LiveLocation, position: Dict):
+        """ Send one edit, then schedule the next one if a newer position arrived meanwhile """
+
+        try:
+            result = self.bot.editMessageLiveLocation(position['latitude'], position['longitude'], horizontal_accuracy=position['horizontal_accuracy'], heading=position['heading'], proximity_alert_radius=position['proximity_alert_radius'], **location.target)
+        except NETWORK_ERRORS:
+            result = None
+        except Exception:
+            traceback.print_exc()
+            result = None
+
+        failed = not isinstance(result, (dict, bool)) or (isinstance(result, dict) and 'error' in result and 'not modified' not in result.get('description', ''))
+        description = result.get('description', '').lower() if isinstance(result, dict) else ''
+        errorCode = result.get('error_code') or 0 if isinstance(result, dict) else 0
+
+        gone = failed and any(error in description for error in self.GONE_ERRORS) # Deleted, or no longer live
+        transient = failed and not gone and (errorCode == 0 or errorCode == 429 or errorCode >= 500) # Network errors, flood waits, server errors
+
+        with self.condition:
+
+            location.inFlight = False
+            location.nextEdit = time.monotonic() + self._intervalFor(location.chatId)
+
+            if failed:
+                self.counts['failed'] += 1
+                location.dirty = location.dirty or transient # Retried with the next cadence, other refusals wait for a new position
+            else:
+                self.counts['edits'] += 1
+                location.sent = position
+
+            if gone:
+                self._forget(location.key)
+            elif location.dirty and location.key in self.locations:
+                self._push(location.nextEdit, 'edit', location.key)
+
+    def _forget(self, key):
+        """ Stop tracking a message, the lock may be held """
+
+        with self.condition:
+
+            location = self.locations.pop(key, None)
+
+            if location is not None and location.chatId is not None:
+
+                self.chatCounts[location.chatId] -= 1
+
+                if self.chatCounts[location.chatId] == 0:
+                    del self.chatCounts[location.chatId]
+
+            return location
+
+    def _stop(self, location: _LiveLocation):
+        """ Stop a live location message, with its last position if it was not sent yet """
+
+        if location.dirty and location.position.get('latitude') is not None:
+            self._edit(location, location.position)
+
+        try:
+            result = self.bot.stopMessageLiveLocation(**location.target)
+        except NETWORK_ERRORS:
+            return None
+
+        with self.condition:
+            self.counts['stopped'] += 1
+
+        return result
@@ -0,0 +1,228 @@
+"""
+
+This module contains the per-method instrumentation of the Bot API requests.
+
+Author: Eric Damian
+
+"""
+
+import bisect
+import threading
+import time
+import traceback
+from typing import Dict
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60) # Seconds, long polls land in the last ones
+
+class Metrics():
+    """ Collects latency histograms, byte counts, error counters and in-flight gauges for every Bot API method.
+
+    Every HTTP exchange is recorded, so a request retried after error 429 counts once per attempt.
+    Hooks receive each exchange as it completes and toPrometheus renders the counters in the Prometheus text format.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, prefix='telegram_bot_api'):
+        """ Constructor of Metrics class
+
+        Args:
+            buckets (tuple, optional): Upper bounds of the latency histogram buckets, in seconds. Defaults to DEFAULT_BUCKETS.
+            prefix (str, optional): Prefix of the exported metric names. Defaults to 'telegram_bot_api'.
+        """
+
+        self.buckets = tuple(sorted(buckets))
+        self.prefix = prefix
+        self.hooks = []
+        self.lock = threading.Lock()
+
+        self.methods = {} # method -> [bucket counts, latency sum, requests, request bytes, response bytes, in flight, 429s]
+        self.errors = {} # (method, error_code) -> count
+
+    def addHook(self, hook) -> bool:
+        """ Use this method to be called after every HTTP exchange.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/Metrics
+
+        Args:
+            hook (callable): Called with a Dict holding method, duration, ok, error_code, request_bytes and response_bytes.
+
+        Returns:
+            bool: True if the hook has been added correctly.
+        """
+
+        if not callable(hook):
+            return False
+
+        self.hooks.append(hook)
+        return True
+
+    def removeHook(self, hook) -> bool:
+        """ Use this method to stop calling a hook.
+
+        Args:
+            hook (callable): Hook added with addHook.
+
+        Returns:
+            bool: True if the hook has been removed correctly.
+        """
+
+        try:
+            self.hooks.remove(hook)
+            return True
+        except ValueError:
+            return False
+
+    def start(self, method: str) -> float:
+        """ Use this method when a request is sent, it returns the start time to give to observe """
+
+        with self.lock:
+            self._entry(method)[5] += 1
+
+        return time.monotonic()
+
+    def observe(self, method: str, started: float, response=None, request_bytes=0, response_bytes=0):
+        """ Use this method when a request completes.
+
+        Args:
+            method (str): Name of the Bot API method.
+            started (float): Value returned by start.
+            response (Dict, optional): Decoded response, None if the request raised. Defaults to None.
+            request_bytes (int, optional): Size of the request body. Defaults to 0.
+            response_bytes (int, optional): Size of the response body. Defaults to 0.
+        """
+
+        duration = time.monotonic() - started
+
+        if response is None:
+            ok, errorCode = False, 'exception'
+        else:
+            ok, errorCode = bool(response.get('ok')), response.get('error_code')
+
+        with self.lock:
+
+            entry = self._entry(method)
+            entry[0][bisect.bisect_left(self.buckets, duration)] += 1
+            entry[1] += duration
+            entry[2] += 1
+            entry[3] += request_bytes
+            entry[4] += response_bytes
+            entry[5] -= 1
+
+            if not ok:
+
+                key = (method, str(errorCode))
+                self.errors[key] = self.errors.get(key, 0) + 1
+
+                if errorCode == 429:
+                    entry[6] += 1
+
+        if self.hooks:
+
+            event = {'method': method, 'duration': duration, 'ok': ok, 'error_code': errorCode, 'request_bytes': request_bytes, 'response_bytes': response_bytes}
+
+            for hook in list(self.hooks):
+                try:
+                    hook(event)
+                except Exception:
+                    traceback.print_exc() # A broken hook must not break the request
+
+    def getSnapshot(self) -> Dict:
+        """ Use this method to get a copy of every counter.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/Metrics
+
+        Returns:
+            Dict: Method name mapped to its requests, latency_sum, buckets, request_bytes, response_bytes, in_flight, flood_waits and errors by error code.
+        """
+
+        with self.lock:
+
+            snapshot = {}
+
+            for method, (counts, latencySum, requests, requestBytes, responseBytes, inFlight, floodWaits) in self.methods.items():
+                snapshot[method] = {
+                    'requests': requests,
+                    'latency_sum': latencySum,
+                    'buckets': dict(zip(self.buckets + (float('inf'),), counts)),
+                    'request_bytes': requestBytes,
+                    'response_bytes': responseBytes,
+                    'in_flight': inFlight,
+                    'flood_waits': floodWaits,
+                    'errors': {},
+                }
+
+            for (method, errorCode), count in self.errors.items():
+                snapshot[method]['errors'][errorCode] = count
+
+            return snapshot
+
+    def reset(self):
+        """ Use this method to set every counter back to zero, requests in flight are kept """
+
+        with self.lock:
+            self.methods = {method: [[0] * (len(self.buckets) + 1), 0.0, 0, 0, 0, entry[5], 0] for method, entry in self.methods.items()}
+            self.errors = {}
+
+    def toPrometheus(self) -> str:
+        """ Use this method to get every counter in the Prometheus text exposition format.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/Metrics
+
+        Returns:
+            str: Text to serve on a /metrics endpoint.
+        """
+
+        snapshot = self.getSnapshot()
+        name = self.prefix
+        lines = []
+
+        lines.append(f'# HELP {name}_request_duration_seconds Latency of the Bot API requests.')
+        lines.append(f'# TYPE {name}_request_duration_seconds histogram')
+
+        for method, entry in snapshot.items():
+
+            cumulative = 0
+
+            for bound, count in entry['buckets'].items():
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(float(bound))
+                lines.append(f'{name}_request_duration_seconds_bucket{{method="{method}",le="{le}"}} {cumulative}')
+
+            lines.append(f'{name}_request_duration_seconds_sum{{method="{method}"}} {entry["latency_sum"]}')
+            lines.append(f'{name}_request_duration_seconds_count{{method="{method}"}} {entry["requests"]}')
+
+        counters = (
+            ('request_bytes_total', 'counter', 'Bytes sent in request bodies.', 'request_bytes'),
+            ('response_bytes_total', 'counter', 'Bytes received in response bodies.', 'response_bytes'),
+            ('flood_waits_total', 'counter', 'Requests refused with error 429.', 'flood_waits'),
+            ('requests_in_flight', 'gauge', 'Requests waiting for their response.', 'in_flight'),
+        )
+
+        for suffix, kind, description, key in counters:
+
+            lines.append(f'# HELP {name}_{suffix} {description}')
+            lines.append(f'# TYPE {name}_{suffix} {kind}')
+
+            for method, entry in snapshot.items():
+                lines.append(f'{name}_{suffix}{{method="{method}"}} {entry[key]}')
+
+        lines.append(f'# HELP {name}_errors_total Requests that failed, by error code.')
+        lines.append(f'# TYPE {name}_errors_total counter')
+
+        for method, entry in snapshot.items():
+            for errorCode, count in entry['errors'].items():
+                lines.append(f'{name}_errors_total{{method="{method}",code="{errorCode}"}} {count}')
+
+        return '\n'.join(lines) + '\n'
+
+    def _entry(self, method: str):
+        """ Return the counters of a method, creating them on first use, the lock must be held """
+
+        entry = self.methods.get(method)
+
+        if entry is None:
+            entry = self.methods[method] = [[0] * (len(self.buckets) + 1), 0.0, 0, 0, 0, 0, 0]
+
+        return entry
@@ -0,0 +1,217 @@
+"""
+
+This module contains the host running many bots in one process and one event loop.
+
+Author: Eric Damian
+
+"""
+
+import asyncio
+import traceback
+from typing import Dict
+
+from .async_telegram_bot_api import AsyncTelegramBotApi
+from .rate_limiter import RateLimiter
+from .transport import AiohttpTransport
+
+class MultiBotHost():
+    """ Runs many bots on one event loop, sharing one connection pool and one flood control scheduler.
+
+    Every bot is an AsyncTelegramBotApi keeping its own lastUpdateId, and the shared RateLimiter keeps separate buckets
+    for each token, since Telegram applies its limits to every bot on its own. The long polls of all the bots are
+    multiplexed as tasks over the shared keep-alive pool, each of them holding one connection while it waits.
+    """
+
+    def __init__(self, tokens=(), handler=None, transport=None, rate_limiter=None, metrics=None, retry_policy=None, api_url='https://api.telegram.org', offset_store=None, max_concurrency=100, limit=1000, keepalive_timeout=15, poll_timeout=30, poll_limit=100, allowed_updates=None, prefetch=False, retry_delay=1):
+        """ Constructor of MultiBotHost class
+
+        Args:
+            tokens (Iterable[str], optional): Tokens of the bots to host. Defaults to ().
+            handler (callable, optional): Called with the bot and every Update object it receives, it may be a coroutine function. None disables polling. Defaults to None.
+            transport (AsyncTransport, optional): Carrier of the requests of every bot. Defaults to an AiohttpTransport built from the connection arguments.
+            rate_limiter (RateLimiter, optional): Scheduler shared by every bot, None disables flood control. Defaults to a RateLimiter with the Telegram limits.
+            metrics (Metrics, optional): Collector shared by every bot. Defaults to None.
+            retry_policy (RetryPolicy, optional): Retries and hedging shared by every bot. Defaults to None.
+            api_url (str, optional): Base url of the Bot API server, e.g. a self-hosted one. Defaults to 'https://api.telegram.org'.
+            offset_store (OffsetStore, optional): Store keeping the lastUpdateId of every bot across restarts. Defaults to None.
+            max_concurrency (int, optional): Maximum number of requests of every bot in flight at the same time. Defaults to 100.
+            limit (int, optional): Maximum number of simultaneous connections of the shared pool, each polling bot holds one. Defaults to 1000.
+            keepalive_timeout (int, optional): Seconds an idle connection is kept alive in the pool. Defaults to 15.
+            poll_timeout (int, optional): Timeout in seconds for long polling. Defaults to 30.
+            poll_limit (int, optional): Limits the number of updates retrieved by each request. Defaults to 100.
+            allowed_updates (list, optional): List of the update types the bots receive. Defaults to None.
+            prefetch (bool, optional): If True every bot fetches its next batch while the current one is handled, holding a second connection. Defaults to False.
+            retry_delay (int, optional): Seconds to wait before polling again after a failed request. Defaults to 1.
+        """
+
+        self.handler = handler
+        self.transport = transport or AiohttpTransport(limit, 0, keepalive_timeout)
+        self.rateLimiter = rate_limiter if rate_limiter is not None else RateLimiter()
+        self.metrics = metrics
+        self.retryPolicy = retry_policy
+        self.apiUrl = api_url
+        self.offsetStore = offset_store
+        self.maxConcurrency = max_concurrency
+
+        self.pollTimeout = poll_timeout
+        self.pollLimit = poll_limit
+        self.allowedUpdates = allowed_updates
+        self.prefetch = prefetch
+        self.retryDelay = retry_delay
+
+        self.bots = {} # token -> AsyncTelegramBotApi
+        self.tasks = {} # token -> polling task, while running
+        self.stopped = None
+
+        for token in tokens:
+            self.addBot(token)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def addBot(self, token: str) -> AsyncTelegramBotApi:
+        """ Use this method to host a bot, it starts polling right away if the host is running.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/MultiBotHost
+
+            Do not close a hosted bot: it would close the transport shared by every other bot, close the host instead.
+
+        Args:
+            token (str): Bot token from BotFather.
+
+        Returns:
+            AsyncTelegramBotApi: The hosted bot, the existing one if the token is already hosted.
+        """
+
+        bot = self.bots.get(token)
+
+        if bot is None:
+
+            bot = self.bots[token] = AsyncTelegramBotApi(token, max_concurrency=self.maxConcurrency, rate_limiter=self.rateLimiter, metrics=self.metrics, api_url=self.apiUrl, transport=self.transport, retry_policy=self.retryPolicy, offset_store=self.offsetStore)
+
+            if self.stopped is not None and not self.stopped.is_set():
+                self._startPolling(token)
+
+        return bot
+
+    def removeBot(self, token: str) -> bool:
+        """ Use this method to stop hosting a bot, its long poll is cancelled.
+
+        Args:
+            token (str): Bot token from BotFather.
+
+        Returns:
+            bool: True if the bot was hosted.
+        """
+
+        task = self.tasks.pop(token, None)
+
+        if task is not None:
+            task.cancel()
+
+        return self.bots.pop(token, None) is not None
+
+    def getBot(self, token: str) -> AsyncTelegramBotApi:
+        """ Use this method to get a hosted bot, None if the token is not hosted """
+
+        return self.bots.get(token)
+
+    def getBots(self) -> Dict[str, AsyncTelegramBotApi]:
+        """ Use this method to get every hosted bot, keyed by token """
+
+        return dict(self.bots)
+
+    def setHandler(self, handler) -> bool:
+        """ Use this method to set the function called with the bot and every Update object it receives.
+
+        Args:
+            handler (callable): Function or coroutine function taking the bot and the Update object, it is used from the next run.
+
+        Returns:
+            bool: True if the handler has been set correctly.
+        """
+
+        if not callable(handler):
+            return False
+
+        self.handler = handler
+        return True
+
+    async def run(self):
+        """ Use this method to poll every hosted bot until stop is called.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/MultiBotHost
+
+            The updates of a bot are handled one at a time and in order, lastUpdateId advancing after each of them.
+            Start tasks from the handler to handle them concurrently.
+        """
+
+        self.stopped = asyncio.Event()
+
+        if self.handler is not None:
+            for token in self.bots:
+                self._startPolling(token)
+
+        try:
+            await self.stopped.wait()
+        finally:
+
+            self.stopped.set()
+
+            tasks = list(self.tasks.values())
+            self.tasks = {}
+
+            for task in tasks:
+                task.cancel()
+
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stop(self) -> bool:
+        """ Use this method to make run return, the long polls in progress are cancelled.
+
+        Returns:
+            bool: True if the host was running.
+        """
+
+        if self.stopped is None or self.stopped.is_set():
+            return False
+
+        self.stopped.set()
+        return True
+
+    async def close(self) -> bool:
+        """ Use this method to stop polling and close the shared connection pool.
+
+        Returns:
+            bool: True if the connection pool has been closed correctly.
+        """
+
+        self.stop()
+
+        if self.offsetStore is not None: # The commit fsyncs, keep it off the event loop
+            await asyncio.to_thread(self.offsetStore.flush)
+
+        return await self.transport.close()
+
+    def _startPolling(self, token: str):
+
+        if self.handler is not None and token not in self.tasks:
+            self.tasks[token] = asyncio.ensure_future(self._poll(self.bots[token]))
+
+    async def _poll(self, bot: AsyncTelegramBotApi):
+        """ Long poll one bot and hand its updates to the handler """
+
+        async for update in bot.pollUpdates(self.pollTimeout, self.pollLimit, self.allowedUpdates, self.prefetch, self.retryDelay):
+
+            try:
+                result = self.handler(bot, update)
+
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception:
+                traceback.print_exc() # A failing update must not stop the bot
@@ -0,0 +1,120 @@
+"""
+
+This module contains the streaming multipart/form-data encoder used by every upload.
+
+Author: Eric Damian
+
+"""
+
+import mmap
+import os
+import uuid
+from typing import Dict, Iterator
+
+class MultipartEncoder():
+    """ Streams a multipart/form-data body made of text fields and local files.
+
+    Files are read in fixed-size chunks (memory-mapped when large) while the body is sent, so an upload costs
+    the same memory whatever the size of its files. The total length is known in advance, so the request is
+    sent with a Content-Length header instead of chunked encoding. Every file handle is released once the body
+    has been sent or close is called.
+    """
+
+    def __init__(self, fields=(), files={}, chunk_size=64 * 1024, mmap_threshold=4 * 1024 * 1024):
+        """ Constructor of MultipartEncoder class
+
+        Args:
+            fields (tuple, optional): Text fields as (name, value) pairs. Defaults to ().
+            files (dict, optional): Field names mapped to the paths of local files. Defaults to {}.
+            chunk_size (int, optional): Bytes read from a file at a time. Defaults to 64 KB.
+            mmap_threshold (int, optional): Files at least this large are memory-mapped instead of read. Defaults to 4 MB.
+        """
+
+        self.boundary = uuid.uuid4().hex
+        self.contentType = f'multipart/form-data; boundary={self.boundary}'
+        self.chunkSize = chunk_size
+        self.mmapThreshold = mmap_threshold
+        self.handles = []
+
+        self.parts = [] # bytes, or (path, size) for the content of a file
+
+        for name, value in fields:
+            self.parts.append(self._header(name) + str(value).encode('utf-8') + b'\r\n')
+
+        for name, path in files.items():
+            self.parts.append(self._header(name, os.path.basename(path)))
+            self.parts.append((path, os.path.getsize(path)))
+            self.parts.append(b'\r\n')
+
+        self.parts.append(f'--{self.boundary}--\r\n'.encode('ascii'))
+
+        self.length = sum(part[1] if isinstance(part, tuple) else len(part) for part in self.parts)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __iter__(self) -> Iterator[bytes]:
+
+        try:
+
+            for part in self.parts:
+
+                if isinstance(part, tuple):
+                    yield from self._readFile(*part)
+                else:
+                    yield part
+
+        finally:
+            self.close()
+
+    def getHeaders(self) -> Dict:
+        """ Use this method to get the headers describing the body.
+
+        Returns:
+            Dict: Content-Type and Content-Length headers.
+        """
+
+        return {'Content-Type': self.contentType, 'Content-Length': str(self.length)}
+
+    def close(self):
+        """ Use this method to release every file handle still open """
+
+        while self.handles:
+            self.handles.pop().close()
+
+    def _header(self, name: str, filename=None) -> bytes:
+        """ Build the boundary and headers opening a part """
+
+        disposition = f'form-data; name="{self._quote(name)}"'
+
+        if filename is None:
+            return f'--{self.boundary}\r\nContent-Disposition: {disposition}\r\n\r\n'.encode('utf-8')
+
+        disposition += f'; filename="{self._quote(filename)}"'
+
+        return f'--{self.boundary}\r\nContent-Disposition: {disposition}\r\nContent-Type: application/octet-stream\r\n\r\n'.encode('utf-8')
+
+    @staticmethod
+    def _quote(value: str) -> str:
+        return value.replace('\\', '\\\\').replace('"', '%22').replace('\r', '%0D').replace('\n', '%0A')
+
+    def _readFile(self, path: str, size: int) -> Iterator[bytes]:
+        """ Yield the content of a file in chunks, closing it afterwards """
+
+        file = open(path, 'rb')
+        self.handles.append(file)
+
+        if size >= self.mmapThreshold: # Let the kernel page large files in instead of copying them through read calls
+
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.handles.append(mapped)
+
+            for offset in range(0, size, self.chunkSize):
+                yield mapped[offset:offset + self.chunkSize]
+
+        else:
+
+            for chunk in iter(lambda: file.read(self.chunkSize), b''):
+                yield chunk
+
+        self.close()
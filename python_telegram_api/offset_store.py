@@ -0,0 +1,254 @@
+"""
+
+This module contains the persistent stores of the update offset, so a restarted bot resumes where it stopped.
+
+Author: Eric Damian
+
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+class OffsetStore():
+    """ Base of the stores keeping the lastUpdateId of every bot across restarts.
+
+    Offsets are recorded in memory on every setLastUpdateId and committed together, once every commit_every updates
+    or by a background thread every commit_interval seconds, so a crash hands at most the last uncommitted batch to the bot again.
+    Bots are keyed by the id part of their token, so one store can serve many bots without holding their secrets.
+    """
+
+    def __init__(self, commit_every=100, commit_interval=1.0):
+        """ Constructor of OffsetStore class
+
+        Args:
+            commit_every (int, optional): Offsets recorded before they are committed. Defaults to 100.
+            commit_interval (float, optional): Seconds after which recorded offsets are committed in background, None disables it. Defaults to 1.0.
+        """
+
+        self.commitEvery = commit_every
+        self.commitInterval = commit_interval
+
+        self.offsets = {} # bot -> last recorded update_id
+        self.dirty = {} # bot -> update_id recorded and not committed yet
+        self.recorded = 0
+        self.lock = threading.Lock()
+        self.commitLock = threading.Lock() # Writers record while a commit is in progress
+
+        self.closed = threading.Event()
+        self.wake = threading.Event() # Set when a batch recorded with commit=False is due
+        self.timer = None # Started by the first record
+
+    @staticmethod
+    def getKey(token: str) -> str:
+        """ Use this method to get the key a bot is stored under: the bot id part of its token """
+
+        return token.split(':', 1)[0]
+
+    def load(self, token: str) -> int:
+        """ Use this method to get the last update_id handled by a bot.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/OffsetStore
+
+        Args:
+            token (str): Bot token from BotFather.
+
+        Returns:
+            int: The stored update_id, 0 if the bot has none.
+        """
+
+        key = self.getKey(token)
+
+        with self.lock:
+            if key in self.offsets:
+                return self.offsets[key]
+
+        stored = self._read(key)
+
+        with self.lock:
+            return self.offsets.setdefault(key, stored)
+
+    def save(self, token: str, update_id: int, commit=True) -> bool:
+        """ Use this method to record the last update_id handled by a bot, it is committed with the next batch.
+
+        Args:
+            token (str): Bot token from BotFather.
+            update_id (int): Last update_id handled.
+            commit (bool, optional): If False a due batch is committed by the background thread instead of the caller, e.g. an event loop. Defaults to True.
+
+        Returns:
+            bool: True if the update_id has been recorded correctly.
+        """
+
+        key = self.getKey(token)
+
+        with self.lock:
+
+            self.offsets[key] = self.dirty[key] = update_id
+            self.recorded += 1
+
+            if self.timer is None and (self.commitInterval or not commit) and not self.closed.is_set():
+                self.timer = threading.Thread(target=self._commitPeriodically, daemon=True)
+                self.timer.start()
+
+            due = self.recorded >= self.commitEvery
+
+        if due and not commit:
+            self.wake.set()
+            return True
+
+        return self.flush() if due else True
+
+    def flush(self) -> bool:
+        """ Use this method to commit every recorded update_id now.
+
+        Returns:
+            bool: True if the offsets have been committed correctly.
+        """
+
+        with self.commitLock:
+
+            with self.lock:
+                dirty, self.dirty = self.dirty, {}
+                self.recorded = 0
+
+            if not dirty:
+                return True
+
+            try:
+                self._write(dirty)
+                return True
+            except (OSError, sqlite3.Error):
+
+                with self.lock: # Kept for the next commit, newer offsets win
+                    self.dirty = {**dirty, **self.dirty}
+
+                return False
+
+    def close(self) -> bool:
+        """ Use this method to commit the recorded offsets and release the store.
+
+        Returns:
+            bool: True if the store has been closed correctly.
+        """
+
+        self._stopTimer()
+        return self.flush()
+
+    def _commitPeriodically(self):
+        """ Body of the timer thread: commit the recorded offsets every commitInterval seconds, or once a batch is due, until the store is closed """
+
+        while not self.closed.is_set():
+
+            self.wake.wait(self.commitInterval or None)
+            self.wake.clear()
+
+            if not self.closed.is_set(): # close commits the last batch itself
+                self.flush()
+
+    def _stopTimer(self):
+
+        self.closed.set()
+        self.wake.set()
+
+        with self.lock:
+            timer = self.timer
+
+        if timer is not None:
+            timer.join()
+
+    def _read(self, key: str) -> int:
+        raise NotImplementedError
+
+    def _write(self, offsets: dict):
+        raise NotImplementedError
+
+class FileOffsetStore(OffsetStore):
+    """ Offsets kept in a small JSON file, replaced atomically at every commit """
+
+    def __init__(self, path='offsets.json', commit_every=100, commit_interval=1.0):
+        """ Constructor of FileOffsetStore class
+
+        Args:
+            path (str, optional): Path of the JSON file. Defaults to 'offsets.json'.
+            commit_every (int, optional): Offsets recorded before they are committed. Defaults to 100.
+            commit_interval (float, optional): Seconds after which recorded offsets are committed in background, None disables it. Defaults to 1.0.
+        """
+
+        super().__init__(commit_every, commit_interval)
+
+        self.path = path
+        self.stored = {}
+
+        if os.path.isfile(path):
+            with open(path, encoding='utf-8') as file:
+                self.stored = json.load(file)
+
+    def _read(self, key: str) -> int:
+        return self.stored.get(key, 0)
+
+    def _write(self, offsets: dict):
+
+        self.stored.update(offsets)
+        temporary = f'{self.path}.tmp'
+
+        with open(temporary, 'w', encoding='utf-8') as file:
+            json.dump(self.stored, file)
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(temporary, self.path) # A crash leaves either the old or the new file, never half of one
+
+class SQLiteOffsetStore(OffsetStore):
+    """ Offsets kept in a SQLite database, one row per bot, e.g. next to a FileIdCache or an OutboundQueue """
+
+    def __init__(self, path='offsets.sqlite', commit_every=100, commit_interval=1.0):
+        """ Constructor of SQLiteOffsetStore class
+
+        Args:
+            path (str, optional): Path of the SQLite database. Defaults to 'offsets.sqlite'.
+            commit_every (int, optional): Offsets recorded before they are committed. Defaults to 100.
+            commit_interval (float, optional): Seconds after which recorded offsets are committed in background, None disables it. Defaults to 1.0.
+        """
+
+        super().__init__(commit_every, commit_interval)
+
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=FULL')
+        self.connection.execute('CREATE TABLE IF NOT EXISTS offsets (bot TEXT PRIMARY KEY, update_id INTEGER, updated REAL)')
+
+    def close(self) -> bool:
+
+        self._stopTimer()
+        flushed = self.flush()
+
+        try:
+            with self.commitLock:
+                self.connection.close()
+            return flushed
+        except:
+            return False
+
+    def _read(self, key: str) -> int:
+
+        with self.commitLock:
+            row = self.connection.execute('SELECT update_id FROM offsets WHERE bot = ?', (key,)).fetchone()
+
+        return row[0] if row is not None else 0
+
+    def _write(self, offsets: dict):
+
+        now = time.time()
+
+        self.connection.execute('BEGIN') # One transaction and one fsync for the whole batch
+
+        try:
+            self.connection.executemany('INSERT OR REPLACE INTO offsets VALUES (?, ?, ?)', [(key, updateId, now) for key, updateId in offsets.items()])
+            self.connection.execute('COMMIT')
+        except sqlite3.Error:
+            self.connection.execute('ROLLBACK')
+            raise
@@ -0,0 +1,358 @@
+"""
+
+This module contains the durable queue of outgoing requests, delivered in background and recovered after a crash.
+
+Author: Eric Damian
+
+"""
+
+import concurrent.futures
+import inspect
+import itertools
+import queue
+import sqlite3
+import threading
+import time
+import traceback
+import zlib
+
+from . import json_codec
+from .rate_limiter import RateLimiter
+from .transport import NETWORK_ERRORS
+
+class OutboundQueue():
+    """ SQLite-backed queue of bot calls, delivered by a pool of worker threads with at-least-once semantics.
+
+    Calls are written to the database in batches, one transaction and one fsync for every batch (group commit),
+    so enqueueing only costs the encoding of the arguments. A call is handed to the workers once it is on disk and
+    deleted once Telegram answered it, so calls still queued or in flight when the process dies are sent again by
+    the next start. The calls to a chat are delivered by the same worker, in the order they were enqueued.
+    """
+
+    def __init__(self, bot, path='outbound_queue.sqlite', workers=8, commit_interval=0.005, max_attempts=5, retry_delay=1):
+        """ Constructor of OutboundQueue class
+
+        Notes:
+            If the bot has no RateLimiter a default one is set on it.
+
+        Args:
+            bot (TelegramBotApi): Bot delivering the calls.
+            path (str, optional): Path of the SQLite database. Defaults to 'outbound_queue.sqlite'.
+            workers (int, optional): Number of threads delivering calls, give the bot a pool_maxsize of at least workers. Defaults to 8.
+            commit_interval (float, optional): Seconds the writer waits to gather a batch before every commit. Defaults to 0.005.
+            max_attempts (int, optional): Deliveries of a call failing because of the network or a 5xx response before it is left for the next start. Defaults to 5.
+            retry_delay (float, optional): Seconds before the first new attempt, doubled at every attempt. Defaults to 1.
+        """
+
+        self.bot = bot
+        self.workers = workers
+        self.commitInterval = commit_interval
+        self.maxAttempts = max_attempts
+        self.retryDelay = retry_delay
+
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=FULL') # Every commit is fsynced, commits are batched instead
+        self.connection.execute('CREATE TABLE IF NOT EXISTS outbound (id INTEGER PRIMARY KEY, method TEXT, args TEXT, kwargs TEXT, created REAL)')
+
+        lastId = self.connection.execute('SELECT MAX(id) FROM outbound').fetchone()[0] or 0
+        self.ids = itertools.count(lastId + 1)
+        self.lastId = lastId # Last id enqueued
+        self.durableId = lastId # Last id on disk
+
+        self.pending = [] # Calls enqueued and not yet on disk
+        self.delivered = [] # Ids answered by Telegram and not yet deleted
+        self.futures = {} # id -> Future, until the call is answered
+        self.chatIdPositions = {} # method -> position of its chat_id parameter, None if it has none
+        self.condition = threading.Condition()
+        self.dbLock = threading.Lock() # Commits do not hold the condition, so enqueue never waits for an fsync
+
+        self.lanes = []
+        self.threads = []
+        self.writer = None
+        self.running = False
+        self.stopped = False
+
+        if self.bot.getRateLimiter() is None:
+            self.bot.setRateLimiter(RateLimiter())
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def __getattr__(self, name: str):
+        """ Bot methods called on the queue are enqueued, e.g. queue.sendMessage(chat_id, 'Hello') """
+
+        if name.startswith('_') or not callable(getattr(self.bot, name, None)):
+            raise AttributeError(name)
+
+        def enqueue(*args, **kwargs) -> concurrent.futures.Future:
+            return self.enqueue(name, *args, **kwargs)
+
+        return enqueue
+
+    def enqueue(self, method: str, *args, **kwargs) -> concurrent.futures.Future:
+        """ Use this method to queue a call of a bot method.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/OutboundQueue
+
+            The arguments are stored as JSON, so they must be JSON serializable, e.g. paths instead of open files.
+
+        Args:
+            method (str): Name of the bot method, e.g. 'sendMessage'.
+            *args: Positional arguments of the method.
+            **kwargs: Keyword arguments of the method.
+
+        Returns:
+            concurrent.futures.Future: Resolved with the return value of the method once delivered.
+        """
+
+        chatId = self._chatIdOf(method, args, kwargs)
+        entry = [None, method, json_codec.dumps(args), json_codec.dumps(kwargs), time.time(), chatId]
+        future = concurrent.futures.Future()
+
+        with self.condition:
+
+            if self.stopped:
+                raise RuntimeError('cannot enqueue calls after stop')
+
+            entry[0] = self.lastId = next(self.ids)
+            self.futures[entry[0]] = future
+            self.pending.append(entry)
+            self.condition.notify_all()
+
+        return future
+
+    def flush(self, timeout=None) -> bool:
+        """ Use this method to wait until every call enqueued so far is on disk.
+
+        Args:
+            timeout (float, optional): Seconds to wait at most, None waits forever. Defaults to None.
+
+        Returns:
+            bool: True if every call is on disk.
+        """
+
+        with self.condition:
+
+            target = self.lastId
+            return self.condition.wait_for(lambda: self.durableId >= target, timeout)
+
+    def getPending(self) -> int:
+        """ Use this method to get the number of calls not delivered yet, including the ones left by a previous run """
+
+        with self.dbLock, self.condition:
+            stored = self.connection.execute('SELECT COUNT(*) FROM outbound').fetchone()[0]
+            return stored + len(self.pending) - len(self.delivered)
+
+    def start(self) -> bool:
+        """ Use this method to start delivering, calls left by a previous run are delivered first.
+
+        Returns:
+            bool: True if the queue has been started correctly.
+        """
+
+        if self.running:
+            return False
+
+        self.running = True
+        self.lanes = [queue.Queue() for _ in range(self.workers)]
+        self.threads = [threading.Thread(target=self._deliver, args=(lane,), daemon=True) for lane in self.lanes]
+
+        for row in self.connection.execute('SELECT id, method, args, kwargs, created FROM outbound ORDER BY id').fetchall():
+
+            args, kwargs = json_codec.loads(row[2]), json_codec.loads(row[3])
+            self._route(list(row[:2]) + [args, kwargs, row[4], self._chatIdOf(row[1], args, kwargs)]) # Nobody waits for their result
+
+        for thread in self.threads:
+            thread.start()
+
+        self.writer = threading.Thread(target=self._write, daemon=True)
+        self.writer.start()
+        return True
+
+    def stop(self, wait=True) -> bool:
+        """ Use this method to stop delivering and close the database.
+
+        Args:
+            wait (bool, optional): If True the calls already queued are delivered first, otherwise they are left for the next start. Defaults to True.
+
+        Returns:
+            bool: True if the queue has been stopped correctly.
+        """
+
+        try:
+
+            with self.condition:
+                self.running = False
+                self.stopped = True
+                self.condition.notify_all()
+
+            if self.writer is not None:
+                self.writer.join() # Writes the last batch before exiting
+
+            for lane in self.lanes:
+
+                if not wait:
+                    self._drain(lane)
+
+                lane.put(None)
+
+            for thread in self.threads:
+                thread.join()
+
+            self._commit() # Deletes the calls delivered while stopping
+
+            with self.dbLock:
+                self.connection.close()
+
+            return True
+        except:
+            return False
+
+    def _chatIdOf(self, method: str, args, kwargs):
+        """ Return the chat_id argument of a call, None if the method has none """
+
+        if method not in self.chatIdPositions:
+            names = list(inspect.signature(getattr(self.bot, method)).parameters)
+            self.chatIdPositions[method] = names.index('chat_id') if 'chat_id' in names else None
+
+        position = self.chatIdPositions[method]
+
+        if position is None:
+            return None
+
+        return kwargs['chat_id'] if 'chat_id' in kwargs else args[position] if position < len(args) else None
+
+    def _route(self, entry):
+        """ Hand a stored call to the worker of its chat """
+
+        key = entry[5] if entry[5] is not None else entry[0]
+
+        if not isinstance(key, int):
+            key = zlib.crc32(str(key).encode('utf-8'))
+
+        self.lanes[key % len(self.lanes)].put(entry)
+
+    def _write(self):
+        """ Body of the writer thread: commit the enqueued calls and delete the delivered ones, one transaction per batch """
+
+        while True:
+
+            with self.condition:
+
+                self.condition.wait_for(lambda: self.pending or self.delivered or not self.running)
+
+                if not self.running and not self.pending and not self.delivered:
+                    return
+
+            if self.commitInterval > 0 and self.running:
+                time.sleep(self.commitInterval) # Let the batch grow
+
+            try:
+                self._commit()
+            except sqlite3.Error:
+                traceback.print_exc()
+                time.sleep(self.retryDelay)
+
+    def _commit(self):
+        """ Write one batch in a single transaction, then hand the new calls to the workers """
+
+        with self.condition:
+            pending, self.pending = self.pending, []
+            delivered, self.delivered = self.delivered, []
+
+        if not pending and not delivered:
+            return
+
+        try:
+            with self.dbLock:
+                self.connection.execute('BEGIN')
+                self.connection.executemany('INSERT INTO outbound VALUES (?, ?, ?, ?, ?)', [entry[:5] for entry in pending])
+                self.connection.executemany('DELETE FROM outbound WHERE id = ?', [(id,) for id in delivered])
+                self.connection.execute('COMMIT')
+        except sqlite3.Error:
+
+            with self.condition: # Kept for the next commit
+                self.pending[:0] = pending
+                self.delivered[:0] = delivered
+
+            if self.connection.in_transaction:
+                self.connection.execute('ROLLBACK')
+
+            raise
+
+        if pending:
+
+            with self.condition:
+                self.durableId = pending[-1][0]
+                self.condition.notify_all()
+
+            for entry in pending:
+                entry[2], entry[3] = json_codec.loads(entry[2]), json_codec.loads(entry[3])
+                self._route(entry)
+
+    def _deliver(self, lane: queue.Queue):
+        """ Body of a worker thread: deliver the calls of its chats in order """
+
+        while True:
+
+            entry = lane.get()
+
+            if entry is None:
+                return
+
+            id, method, args, kwargs = entry[:4]
+
+            for attempt in range(self.maxAttempts):
+
+                try:
+                    result = getattr(self.bot, method)(*args, **kwargs)
+                except NETWORK_ERRORS as error:
+                    result = error
+                except Exception as error: # e.g. wrong arguments, sending it again would fail the same way
+                    result = error
+                    break
+
+                if not isinstance(result, Exception) and not (isinstance(result, dict) and (result.get('error_code') or 0) >= 500):
+                    break
+
+                if attempt + 1 < self.maxAttempts:
+                    time.sleep(self.retryDelay * 2 ** attempt)
+
+            else: # Left in the database for the next start
+                self._resolve(id, result)
+                continue
+
+            with self.condition:
+                self.delivered.append(id)
+                self.condition.notify_all()
+
+            self._resolve(id, result)
+
+    def _resolve(self, id: int, result):
+
+        with self.condition:
+            future = self.futures.pop(id, None)
+
+        if future is None:
+            return
+
+        if isinstance(result, Exception):
+            future.set_exception(result)
+        else:
+            future.set_result(result)
+
+    @staticmethod
+    def _drain(lane: queue.Queue):
+        """ Drop the calls queued on a lane, they stay in the database """
+
+        try:
+            while True:
+                lane.get_nowait()
+        except queue.Empty:
+            pass
@@ -0,0 +1,151 @@
+"""
+
+This module contains the token-bucket scheduler that paces outgoing messages within Telegram flood limits.
+
+Author: Eric Damian
+
+"""
+
+import threading
+import time
+
+class RateLimiter():
+    """ Token-bucket scheduler pacing outgoing messages globally and per chat.
+
+    The defaults follow the limits documented by Telegram: about 30 messages per second overall,
+    1 message per second in a private chat and 20 messages per minute in a group or channel.
+    Those limits apply to every bot on its own, so bots sharing a scheduler get their own buckets.
+    """
+
+    LIMITED_METHODS = frozenset((
+        'sendMessage', 'forwardMessage', 'forwardMessages', 'copyMessage', 'copyMessages', 'sendPhoto', 'sendAudio',
+        'sendDocument', 'sendVideo', 'sendAnimation', 'sendVoice', 'sendVideoNote', 'sendPaidMedia', 'sendMediaGroup',
+        'sendLocation', 'sendVenue', 'sendContact', 'sendPoll', 'sendDice', 'sendSticker', 'sendInvoice', 'sendGame',
+        'editMessageText', 'editMessageCaption', 'editMessageMedia', 'editMessageReplyMarkup', 'editMessageLiveLocation',
+        'stopMessageLiveLocation', 'stopPoll'
+    )) # Methods that send or edit a message, sendChatAction only shows a status and is left out
+
+    def __init__(self, global_rate=30, private_rate=1, group_rate=20 / 60, global_burst=30, private_burst=1, group_burst=1, max_retries=3):
+        """ Constructor of RateLimiter class
+
+        Args:
+            global_rate (float, optional): Messages per second across all chats. Defaults to 30.
+            private_rate (float, optional): Messages per second to the same private chat. Defaults to 1.
+            group_rate (float, optional): Messages per second to the same group or channel. Defaults to 20 / 60.
+            global_burst (int, optional): Messages that can be sent at once across all chats. Defaults to 30.
+            private_burst (int, optional): Messages that can be sent at once to the same private chat. Defaults to 1.
+            group_burst (int, optional): Messages that can be sent at once to the same group or channel. Defaults to 1.
+            max_retries (int, optional): How many times a request refused with error 429 is retried after its retry_after. Defaults to 3.
+        """
+
+        self.globalLimit = (global_rate, global_burst)
+        self.globalBuckets = {} # bot -> [rate, burst, tokens, last refill]
+        self.privateLimit = (private_rate, private_burst)
+        self.groupLimit = (group_rate, group_burst)
+        self.maxRetries = max_retries
+
+        self.chatBuckets = {} # (bot, chat_id) -> [rate, burst, tokens, last refill]
+        self.pruneAt = 10000 # Number of chat buckets that triggers the next cleanup
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def isLimited(method: str) -> bool:
+        """ Use this method to know if a Bot API method counts against the flood limits.
+
+        Args:
+            method (str): Name of the Bot API method.
+
+        Returns:
+            bool: True if the method sends or edits messages, sendChatAction and methods editing chats are not limited.
+        """
+
+        return method in RateLimiter.LIMITED_METHODS
+
+    @staticmethod
+    def isGroup(chat_id) -> bool:
+        """ Groups, supergroups and channels have negative ids, channels may also be addressed by @username """
+
+        chat_id = str(chat_id)
+        return chat_id.startswith(('-', '@'))
+
+    def reserve(self, chat_id, bot=None) -> float:
+        """ Use this method to book the next free slot for a message to a chat.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/RateLimiter
+
+        Args:
+            chat_id (str): Unique identifier for the target chat or username of the target channel.
+            bot (str, optional): Key of the sending bot, e.g. its token. Defaults to None.
+
+        Returns:
+            float: Seconds to wait before sending the message.
+        """
+
+        with self.lock:
+
+            now = time.monotonic()
+
+            globalBucket = self.globalBuckets.get(bot)
+
+            if globalBucket is None:
+                rate, burst = self.globalLimit
+                globalBucket = self.globalBuckets[bot] = [rate, burst, float(burst), now]
+
+            chatBucket = self.chatBuckets.get((bot, chat_id))
+
+            if chatBucket is None:
+                rate, burst = self.groupLimit if self.isGroup(chat_id) else self.privateLimit
+                chatBucket = self.chatBuckets[(bot, chat_id)] = [rate, burst, float(burst), now]
+
+            if len(self.chatBuckets) > self.pruneAt:
+                self._prune(now)
+
+            return max(self._take(globalBucket, now), self._take(chatBucket, now))
+
+    def penalize(self, chat_id, retry_after: float, bot=None) -> bool:
+        """ Use this method to hold back a chat after Telegram answered with error 429.
+
+        Args:
+            chat_id (str): Unique identifier for the target chat or username of the target channel.
+            retry_after (float): Seconds Telegram asked to wait.
+            bot (str, optional): Key of the sending bot, e.g. its token. Defaults to None.
+
+        Returns:
+            bool: True if the chat has been held back correctly.
+        """
+
+        with self.lock:
+
+            chatBucket = self.chatBuckets.get((bot, chat_id))
+
+            if chatBucket is None:
+                return False
+
+            now = time.monotonic()
+            rate, burst, tokens, last = chatBucket
+
+            chatBucket[2] = min(burst, tokens + (now - last) * rate, 1 - retry_after * rate) # The slot after retry_after is kept for the retried request
+            chatBucket[3] = now
+            return True
+
+    @staticmethod
+    def _take(bucket, now: float) -> float:
+        """ Take a token from a bucket, going into debt if needed, and return the wait for it """
+
+        rate, burst, tokens, last = bucket
+
+        tokens = min(burst, tokens + (now - last) * rate) - 1
+        bucket[2] = tokens
+        bucket[3] = now
+
+        return -tokens / rate if tokens < 0 else 0.0
+
+    def _prune(self, now: float):
+        """ Forget the buckets of chats that have been idle long enough to be full again """
+
+        for key, (rate, burst, tokens, last) in list(self.chatBuckets.items()):
+            if tokens + (now - last) * rate >= burst:
+                del self.chatBuckets[key]
+
+        self.pruneAt = max(10000, 2 * len(self.chatBuckets))
@@ -0,0 +1,180 @@
+"""
+
+This module contains the retry policy: jittered backoff on network and server errors, and hedging of read-only requests.
+
+Author: Eric Damian
+
+"""
+
+import asyncio
+import concurrent.futures
+import random
+import threading
+
+READ_ONLY_METHODS = frozenset(( # Safe to send twice, getUpdates is left out because two concurrent polls conflict
+    'getMe',
+    'getChat',
+    'getChatAdministrators',
+    'getChatMember',
+    'getChatMemberCount',
+    'getChatMembersCount',
+    'getFile',
+    'getMyCommands',
+    'getStickerSet',
+    'getUserProfilePhotos',
+    'getWebhookInfo',
+))
+
+class RetryPolicy():
+    """ Retries requests that failed because of the network or a 5xx response, waiting a jittered exponential backoff.
+
+    Only read-only methods are retried by default, because a message request that reached Telegram before the
+    connection broke would otherwise be sent twice. Read-only methods can also be hedged: if the first attempt
+    takes longer than hedge_after, an identical request is fired and whichever answers first is used.
+    """
+
+    def __init__(self, max_retries=3, backoff=0.5, max_backoff=30, hedge_after=None, methods=READ_ONLY_METHODS, hedge_workers=8):
+        """ Constructor of RetryPolicy class
+
+        Args:
+            max_retries (int, optional): How many times a failed request is retried. Defaults to 3.
+            backoff (float, optional): Seconds of the first backoff, doubled at every retry. Defaults to 0.5.
+            max_backoff (float, optional): Upper bound of the backoff in seconds. Defaults to 30.
+            hedge_after (float, optional): Seconds after which a slow read-only request is hedged, None disables hedging. Defaults to None.
+            methods (Iterable, optional): Methods retried and hedged, None retries every method, hedging stays limited to READ_ONLY_METHODS. Defaults to READ_ONLY_METHODS.
+            hedge_workers (int, optional): Threads running the hedged requests of the blocking client. Defaults to 8.
+        """
+
+        self.maxRetries = max_retries
+        self.backoff = backoff
+        self.maxBackoff = max_backoff
+        self.hedgeAfter = hedge_after
+        self.methods = frozenset(methods) if methods is not None else None
+        self.hedgeWorkers = hedge_workers
+
+        self.random = random.Random()
+        self.executor = None
+        self.lock = threading.Lock()
+
+    def isRetryable(self, method: str) -> bool:
+        """ Use this method to know if a failed request of a method can be sent again """
+
+        return self.methods is None or method in self.methods
+
+    def canHedge(self, method: str) -> bool:
+        """ Use this method to know if a request of a method is hedged """
+
+        return self.hedgeAfter is not None and method in READ_ONLY_METHODS and self.isRetryable(method)
+
+    def getDelay(self, method: str, attempt: int, response=None):
+        """ Use this method to get the seconds to wait before retrying a request.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/RetryPolicy
+
+        Args:
+            method (str): Name of the Bot API method.
+            attempt (int): Number of attempts already failed, minus one.
+            response (Dict, optional): Decoded response, None if the request raised a network error. Defaults to None.
+
+        Returns:
+            float: The backoff, None if the request must not be retried.
+        """
+
+        if attempt >= self.maxRetries or not self.isRetryable(method):
+            return None
+
+        if response is not None and (response.get('ok') or (response.get('error_code') or 0) < 500):
+            return None
+
+        return self.random.uniform(0, min(self.maxBackoff, self.backoff * 2 ** attempt)) # Full jitter spreads the retries of many clients
+
+    def hedge(self, call):
+        """ Use this method to run a blocking call, and a second one if the first is slower than hedge_after.
+
+        Args:
+            call (callable): Performs the request, it may run twice at the same time.
+
+        Returns:
+            The result of the first call to succeed, the error of the last one if both fail.
+        """
+
+        executor = self._getExecutor()
+        first = executor.submit(call)
+
+        done, pending = concurrent.futures.wait([first], timeout=self.hedgeAfter)
+
+        if done:
+            return first.result()
+
+        pending = {first, executor.submit(call)}
+        error = None
+
+        while pending:
+
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+
+            for future in done:
+
+                if future.exception() is None:
+                    return future.result() # The slower request completes in background and is ignored
+
+                error = future.exception()
+
+        raise error
+
+    async def hedgeAsync(self, factory):
+        """ Use this method to await a request, and a second one if the first is slower than hedge_after.
+
+        Args:
+            factory (callable): Returns a new coroutine performing the request.
+
+        Returns:
+            The result of the first request to succeed, the error of the last one if both fail.
+        """
+
+        pending = {asyncio.ensure_future(factory())}
+
+        try:
+
+            done, pending = await asyncio.wait(pending, timeout=self.hedgeAfter)
+
+            if done:
+                return done.pop().result()
+
+            pending.add(asyncio.ensure_future(factory()))
+            error = None
+
+            while pending:
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+
+                    if task.exception() is None:
+                        return task.result()
+
+                    error = task.exception()
+
+            raise error
+
+        finally:
+            for task in pending: # The slower request is cancelled
+                task.cancel()
+
+    def close(self):
+        """ Use this method to stop the threads running hedged requests """
+
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown(wait=False)
+                self.executor = None
+
+    def _getExecutor(self) -> concurrent.futures.ThreadPoolExecutor:
+
+        with self.lock:
+
+            if self.executor is None:
+                self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.hedgeWorkers, thread_name_prefix='hedge')
+
+            return self.executor
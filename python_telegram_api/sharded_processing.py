@@ -0,0 +1,307 @@
+"""
+
+This module contains the multi-process handling of updates, sharded by chat so the updates of every chat stay in order.
+
+Author: Eric Damian
+
+"""
+
+import collections
+import multiprocessing
+import os
+import threading
+import time
+import traceback
+import zlib
+from typing import Dict
+
+from .dispatcher import Dispatcher
+from .transport import NETWORK_ERRORS
+
+def getShardKey(update: Dict):
+    """ Use this method to get the key an Update object is sharded by: its chat id, the user id for updates without chat, 0 otherwise """
+
+    body = update.get(Dispatcher.getUpdateType(update))
+
+    if not isinstance(body, dict):
+        return 0
+
+    chat = body.get('chat') or (body.get('message') or {}).get('chat')
+
+    if chat is not None:
+        return chat.get('id', 0)
+
+    user = body.get('from') or body.get('user') # Inline queries, poll answers, ...
+
+    return user.get('id', 0) if user is not None else 0
+
+def _work(handler, inbox, acks, initializer, initargs):
+    """ Body of a worker process: handle the updates of its shard in order and acknowledge each of them """
+
+    if initializer is not None:
+        initializer(*initargs)
+
+    while True:
+
+        update = inbox.get()
+
+        if update is None:
+            return
+
+        try:
+            handler(update)
+        except Exception:
+            traceback.print_exc() # A failing update must not hold back the offset of every other chat
+
+        acks.put(update['update_id'])
+
+class ShardedProcessor():
+    """ Polls getUpdates in the calling process and hands every update to a pool of worker processes.
+
+    Updates are routed by chat id, so all the updates of a chat go to the same worker and are handled in order,
+    while different chats are handled in parallel on every core. Polling runs ahead of the workers, up to max_pending
+    updates, so a slow chat never holds back the others. lastUpdateId, and the offset store with it, only advances to
+    the last update of the contiguous run acknowledged by the workers.
+    If a worker dies, it is started again and its unacknowledged updates are handed to it again. If the whole process
+    dies, the next run resumes after the stored frontier, but Telegram already forgot the updates fetched ahead of it,
+    so at most max_pending updates are lost.
+    """
+
+    def __init__(self, bot, handler, processes=None, timeout=30, limit=100, allowed_updates=None, max_pending=1000, retry_delay=1, initializer=None, initargs=(), start_method=None):
+        """ Constructor of ShardedProcessor class
+
+        Args:
+            bot (TelegramBotApi): Bot polling the updates and owning lastUpdateId.
+            handler (callable): Function taking the Update object as only argument, it runs in the workers so it must be picklable, e.g. a module level function.
+            processes (int, optional): Number of worker processes. Defaults to the number of CPUs.
+            timeout (int, optional): Timeout in seconds for long polling. Defaults to 30.
+            limit (int, optional): Limits the number of updates retrieved by each request. Defaults to 100.
+            allowed_updates (list, optional): List of the update types you want your bot to receive. Defaults to None.
+            max_pending (int, optional): Updates handed to the workers and not acknowledged yet after which polling pauses. Defaults to 1000.
+            retry_delay (int, optional): Seconds to wait before polling again after a failed request. Defaults to 1.
+            initializer (callable, optional): Called in every worker process before its first update, e.g. to build its own bot. Defaults to None.
+            initargs (tuple, optional): Arguments of initializer. Defaults to ().
+            start_method (str, optional): multiprocessing start method, e.g. 'spawn'. Defaults to the platform default.
+        """
+
+        self.bot = bot
+        self.handler = handler
+        self.processes = processes or os.cpu_count() or 1
+        self.timeout = timeout
+        self.limit = limit
+        self.allowedUpdates = allowed_updates
+        self.maxPending = max_pending
+        self.retryDelay = retry_delay
+        self.initializer = initializer
+        self.initargs = initargs
+
+        self.context = multiprocessing.get_context(start_method)
+        self.acks = None
+        self.workers = []
+        self.inboxes = []
+
+        self.inFlight = {} # update_id -> (shard, Update object), in arrival order, until acknowledged
+        self.order = collections.deque() # update_ids not yet behind the acknowledged frontier
+        self.done = set() # Acknowledged update_ids still waiting for an older one
+        self.condition = threading.Condition()
+
+        self.running = False
+        self.drain = True
+        self.thread = None
+        self.ackThread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def getShard(self, update: Dict) -> int:
+        """ Use this method to get the worker an Update object is handed to """
+
+        key = getShardKey(update)
+
+        if not isinstance(key, int):
+            key = zlib.crc32(str(key).encode('utf-8')) # Stable across runs, unlike hash
+
+        return key % self.processes
+
+    def getPending(self) -> int:
+        """ Use this method to get the number of updates handed to the workers and not yet behind the acknowledged frontier """
+
+        with self.condition:
+            return len(self.order)
+
+    def start(self) -> bool:
+        """ Use this method to poll and handle updates in the background.
+
+        Returns:
+            bool: True if the processor has been started correctly.
+        """
+
+        if self.thread is not None:
+            return False
+
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+        return True
+
+    def run(self):
+        """ Use this method to poll and handle updates in the calling thread until stop is called from another thread.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/ShardedProcessor
+        """
+
+        self.running = True
+        self.acks = self.context.Queue()
+        self.ackThread = threading.Thread(target=self._collectAcks, daemon=True)
+        self.ackThread.start()
+
+        for shard in range(self.processes):
+            self.inboxes.append(None)
+            self.workers.append(None)
+            self._spawn(shard)
+
+        offset = self.bot.getLastUpdateId() + 1 # Runs ahead of the acknowledged frontier
+
+        try:
+
+            while self.running:
+
+                with self.condition:
+                    while self.running and len(self.order) >= self.maxPending:
+                        self.condition.wait(1)
+                        self._revive()
+
+                self._revive()
+
+                if not self.running:
+                    break
+
+                with self.condition: # Never hand out more than max_pending updates
+                    limit = max(1, min(self.limit, self.maxPending - len(self.order)))
+
+                try:
+                    updates = self.bot._pollBatch(offset, limit, self.timeout, self.allowedUpdates)
+                except NETWORK_ERRORS:
+                    updates = None
+
+                if not isinstance(updates, list): # If the request failed
+                    time.sleep(self.retryDelay)
+                    continue
+
+                if len(updates) == 0:
+                    continue
+
+                offset = updates[-1]['update_id'] + 1
+
+                with self.condition:
+                    for update in updates:
+                        shard = self.getShard(update)
+                        self.inFlight[update['update_id']] = (shard, update)
+                        self.order.append(update['update_id'])
+
+                for update in updates:
+                    self.inboxes[self.inFlight[update['update_id']][0]].put(update)
+
+        finally:
+            self._shutdown()
+
+    def stop(self, wait=True) -> bool:
+        """ Use this method to stop polling, a long poll in progress is completed first.
+
+        Args:
+            wait (bool, optional): If True waits for the workers to handle the updates already handed to them, otherwise they are terminated. Defaults to True.
+
+        Returns:
+            bool: True if the processor has been stopped correctly.
+        """
+
+        try:
+            self.drain = wait
+
+            with self.condition:
+                self.running = False
+                self.condition.notify_all()
+
+            if wait and self.thread is not None:
+                self.thread.join()
+
+            self.thread = None
+            return True
+        except:
+            return False
+
+    def _spawn(self, shard: int):
+        """ Start the worker of a shard with a new inbox """
+
+        self.inboxes[shard] = self.context.Queue()
+        self.workers[shard] = self.context.Process(target=_work, args=(self.handler, self.inboxes[shard], self.acks, self.initializer, self.initargs), daemon=True)
+        self.workers[shard].start()
+
+    def _revive(self):
+        """ Start again the workers that died and hand them their unacknowledged updates """
+
+        for shard, worker in enumerate(self.workers):
+
+            if worker.is_alive():
+                continue
+
+            self._spawn(shard)
+
+            with self.condition:
+                updates = [update for owner, update in self.inFlight.values() if owner == shard]
+
+            for update in updates:
+                self.inboxes[shard].put(update)
+
+    def _collectAcks(self):
+        """ Advance lastUpdateId as the workers acknowledge updates """
+
+        while True:
+
+            updateId = self.acks.get()
+
+            if updateId is None:
+                return
+
+            with self.condition:
+
+                if self.inFlight.pop(updateId, None) is None: # Acknowledged twice by a revived worker
+                    continue
+
+                self.done.add(updateId)
+                frontier = None
+
+                while len(self.order) > 0 and self.order[0] in self.done:
+                    frontier = self.order.popleft()
+                    self.done.discard(frontier)
+
+                if frontier is not None:
+                    self.bot.setLastUpdateId(frontier)
+                    self.condition.notify_all()
+
+    def _shutdown(self):
+        """ Stop the workers, then the collector of their acknowledgements """
+
+        for shard, worker in enumerate(self.workers):
+
+            if self.drain:
+                self.inboxes[shard].put(None)
+            else:
+                worker.terminate()
+
+        for worker in self.workers:
+            worker.join()
+
+        self.acks.put(None)
+        self.ackThread.join()
+
+        if self.bot.getOffsetStore() is not None: # Commit the frontier reached while draining
+            self.bot.getOffsetStore().flush()
+
+        self.workers = []
+        self.inboxes = []
+        self.running = False
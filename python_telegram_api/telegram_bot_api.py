@@ -6,25 +6,536 @@ Author: Eric Damian
 
 """
 
-import requests
-from typing import List, Dict
-import json
+from typing import List, Dict, Iterator
+import concurrent.futures
+import itertools
+import os
+import time
+
+from . import json_codec
+from .batch import Batch
+from .chat_member_cache import ChatMemberCache
+from .file_cache import FileIdCache
+from .metrics import Metrics
+from .offset_store import OffsetStore
+from .rate_limiter import RateLimiter
+from .retry import RetryPolicy
+from .transport import NETWORK_ERRORS, RequestsTransport, Transport
 
 class TelegramBotApi():
     """ The implementation of the Python Telegram APIs Bot """
-    
-    def __init__(self, token: str):
+
+
+    def __init__(self, token: str, pool_connections=10, pool_maxsize=10, pool_block=False, rate_limiter=None, file_cache=None, fetch_me=False, me_ttl=3600, metrics=None, api_url='https://api.telegram.org', transport=None, retry_policy=None, timeout=60, chat_member_cache=None, offset_store=None):
         """ Constructor of TelegramBotApi class
 
+        Notes:
+            All methods share one transport, by default a keep-alive HTTP session, so the TCP and TLS handshakes are paid only when a pooled connection is opened.
+
         Args:
             token (str): Bot token from BotFather.
+            pool_connections (int, optional): Number of per-host connection pools to cache. Defaults to 10.
+            pool_maxsize (int, optional): Maximum number of connections kept alive for each host. Defaults to 10.
+            pool_block (bool, optional): If True, callers wait for a free connection instead of opening extra ones once pool_maxsize is reached. Defaults to False.
+            rate_limiter (RateLimiter, optional): Scheduler pacing every method that sends or edits messages and retrying on error 429. Defaults to None.
+            file_cache (FileIdCache, optional): Cache reusing the file_id of local files already uploaded. Defaults to None.
+            fetch_me (bool, optional): If True the User object of the bot is fetched and cached right away. Defaults to False.
+            me_ttl (int, optional): Seconds the cached User object of the bot is trusted, None keeps it until refreshed. Defaults to 3600.
+            metrics (Metrics, optional): Collector of per-method latency, bytes and errors. Defaults to None.
+            api_url (str, optional): Base url of the Bot API server, e.g. a self-hosted one. Defaults to 'https://api.telegram.org'.
+            transport (Transport, optional): Carrier of the requests, e.g. Urllib3Transport or InMemoryTransport. Defaults to a RequestsTransport built from the pool arguments.
+            retry_policy (RetryPolicy, optional): Retries and hedging of requests failing because of the network or the server. Defaults to None.
+            timeout (float, optional): Seconds to wait for the connection and for every read, long polls wait their timeout on top of it. None waits forever. Defaults to 60.
+            chat_member_cache (ChatMemberCache, optional): Cache answering getChatMember, kept in sync with the received updates. Defaults to None.
+            offset_store (OffsetStore, optional): Persistent store lastUpdateId is loaded from and saved to, so restarts resume where they stopped. Defaults to None.
         """
 
         self.botToken = token # Bot token
+        self.apiUrl = api_url.rstrip('/')
         self.lastUpdateId = 0
 
         self.debug = False # Use this variable to enable or disable debugging mode
 
+        self.rateLimiter = rate_limiter # Flood control is disabled when None
+        self.fileCache = file_cache # Every upload sends the bytes when None
+        self.metrics = metrics # Requests are not instrumented when None
+        self.retryPolicy = retry_policy # Failed requests are not retried when None
+        self.timeout = timeout
+        self.chatMemberCache = chat_member_cache # getChatMember always calls Telegram when None
+        self.offsetStore = offset_store # lastUpdateId only lives in memory when None
+
+        if offset_store is not None:
+            self.lastUpdateId = offset_store.load(token)
+
+        self.botUser = None # Cached User object of the bot, see getBotUser
+        self.botUserFetchedAt = 0
+        self.botUserTtl = me_ttl
+
+        self.poolMaxsize = pool_maxsize
+        self.transport = transport or RequestsTransport(pool_connections, pool_maxsize, pool_block) # Shared by every method
+
+        if fetch_me:
+            self.getMe()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> bool:
+        """ Use this method to close every pooled connection of the bot.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/close
+
+        Returns:
+            bool: True if the connection pool has been closed correctly.
+        """
+
+        if self.offsetStore is not None:
+            self.offsetStore.flush()
+
+        return self.transport.close()
+
+    def getSession(self):
+        """ Use this method to get the HTTP session shared by all methods.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/getSession
+
+        Returns:
+            requests.Session: The pooled keep-alive session, or the client of another transport, None for InMemoryTransport.
+        """
+
+        return self.transport.getSession()
+
+    def getTransport(self) -> Transport:
+        """ Use this method to get the transport carrying the requests.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/getTransport
+
+        Returns:
+            Transport: The transport shared by all methods.
+        """
+
+        return self.transport
+
+    def setTransport(self, transport: Transport) -> bool:
+        """ Use this method to carry the requests with another transport, the previous one is not closed.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/setTransport
+
+        Args:
+            transport (Transport): e.g. RequestsTransport, Urllib3Transport, HttpxTransport or InMemoryTransport.
+
+        Returns:
+            bool: True if the transport has been set correctly.
+        """
+
+        try:
+            self.transport = transport
+            return True
+        except:
+            return False
+
+    def batch(self, workers=None) -> Batch:
+        """ Use this method to run many independent calls concurrently.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/batch
+
+        Args:
+            workers (int, optional): Number of calls running at the same time. Defaults to pool_maxsize.
+
+        Returns:
+            Batch: Context whose method calls return futures and run together when it exits or is flushed.
+        """
+
+        return Batch(self, workers)
+
+    def _request(self, method: str, params=(), files=None, callback=None):
+        """ Call a Bot API method through the shared session and unwrap its response.
+
+        Args:
+            method (str): Name of the Bot API method.
+            params (tuple, optional): Parameters of the request. Defaults to ().
+            files (dict, optional): Field names mapped to the paths of local files to upload. Defaults to None.
+            callback (callable, optional): Called with the result of a successful response, its return value is returned instead. Defaults to None.
+
+        Returns:
+            The result of the method on success, otherwise an error Dict.
+        """
+
+        url = f"{self.apiUrl}/bot{self.botToken}/{method}"
+
+        if files and not all(os.path.isfile(path) for path in files.values()):
+            return self._error(method, 'Bad file path')
+
+        params = self._buildParams(params)
+
+        cachedParams, cachedFiles, uploads, reused = self._useCachedFiles(method, params, files)
+
+        chatId = self._pacedChatId(method, params)
+
+        for attempt in itertools.count():
+
+            if chatId is not None: # Wait for a free slot within the flood limits
+                time.sleep(self.rateLimiter.reserve(chatId, self.botToken))
+
+            try:
+                response = self._attempt(method, url, cachedParams, cachedFiles)
+            except NETWORK_ERRORS:
+                backoff = self.retryPolicy.getDelay(method, attempt) if self.retryPolicy is not None else None
+                if backoff is None:
+                    raise
+                time.sleep(backoff)
+                continue
+
+            retryAfter = self._retryAfter(response, chatId, attempt)
+
+            if retryAfter is None and self.retryPolicy is not None: # A 5xx response
+                retryAfter = self.retryPolicy.getDelay(method, attempt, response)
+
+            if retryAfter is None:
+                break
+
+            time.sleep(retryAfter)
+
+        if reused and self._forgetFileIds(reused, response): # A cached file_id was refused, upload the files again
+            return self._request(method, params, files, callback)
+
+        self._rememberFileIds(method, uploads, response)
+
+        return self._handleResponse(method, response, callback)
+
+    def _attempt(self, method: str, url: str, params=(), files=None) -> Dict:
+        """ Send a request once, or twice in parallel if it is hedged """
+
+        if self.retryPolicy is not None and not files and self.retryPolicy.canHedge(method):
+            return self.retryPolicy.hedge(lambda: self._send(method, url, params, files))
+
+        return self._send(method, url, params, files)
+
+    def _send(self, method: str, url: str, params=(), files=None) -> Dict:
+        """ Perform one request through the transport and decode its JSON response """
+
+        metrics = self.metrics
+        started = metrics.start(method) if metrics is not None else 0
+        response, sent, content = None, 0, b''
+
+        try:
+
+            content, sent = self.transport.send(url, params, files, self._timeoutFor(method, params))
+            response = self._decode(content)
+            return response
+
+        finally:
+            if metrics is not None:
+                metrics.observe(method, started, response, sent, len(content))
+
+    def _timeoutFor(self, method: str, params=()):
+        """ Return the timeout of a request, long polls are given their own timeout on top """
+
+        if self.timeout is None:
+            return None
+
+        return self.timeout + (dict(params).get('timeout') or 0 if method == 'getUpdates' else 0)
+
+    @staticmethod
+    def _decode(content: bytes) -> Dict:
+        """ Decode a response body, a body that is not JSON (e.g. the error page of a proxy) becomes a 502 error """
+
+        try:
+            return json_codec.loads(content)
+        except ValueError:
+            return {'ok': False, 'error_code': 502, 'description': 'Bad Gateway: the response is not JSON'}
+
+    @staticmethod
+    def _buildParams(params=()) -> tuple:
+        """ Drop the parameters left unset (None), anything set explicitly is sent, e.g. an empty url or caption """
+
+        return tuple((key, value) for key, value in params if value is not None)
+
+    def _useCachedFiles(self, method: str, params=(), files=None):
+        """ Replace the local files already uploaded once by their file_id.
+
+        Returns:
+            tuple: The params and files to send, the files to remember once uploaded and the cached entries used, both as field -> (digest, kind, size).
+        """
+
+        if not files or self.fileCache is None:
+            return params, files, {}, {}
+
+        params = list(params)
+        files = dict(files)
+        uploads = {}
+        reused = {}
+
+        mediaIndex = next((index for index, (key, value) in enumerate(params) if key == 'media'), None) if method == 'sendMediaGroup' else None
+        media = [dict(item) for item in params[mediaIndex][1]] if mediaIndex is not None else None
+
+        for field, path in list(files.items()):
+
+            if field == 'thumb':
+                continue
+
+            kind = media[int(field)]['type'] if media is not None else field
+            entry = (self.fileCache.hashFile(path), kind, os.path.getsize(path))
+            fileId = self.fileCache.get(entry[0], kind)
+
+            if fileId is None:
+                uploads[field] = entry
+                continue
+
+            reused[field] = entry
+            del files[field]
+
+            if media is not None:
+                media[int(field)]['media'] = fileId
+            else:
+                params = [(key, value) for key, value in params if key != field] + [(field, fileId)]
+
+        if media is not None:
+            params[mediaIndex] = ('media', media)
+
+        if not any(field != 'thumb' for field in files): # Only a thumbnail left, it is useless without its file
+            files = {}
+
+        return tuple(params), files, uploads, reused
+
+    def _rememberFileIds(self, method: str, uploads: Dict, response: Dict):
+        """ Store the file_id Telegram gave to every file uploaded by a successful request """
+
+        if not uploads or not response.get('ok'):
+            return
+
+        for field, (digest, kind, size) in uploads.items():
+
+            try:
+                message = response['result'][int(field)] if method == 'sendMediaGroup' else response['result']
+                sent = message[kind]
+                fileId = (sent[-1] if isinstance(sent, list) else sent)['file_id'] # Photos come in several sizes, the last is the original
+            except (KeyError, IndexError, TypeError):
+                continue
+
+            self.fileCache.set(digest, kind, fileId, size)
+
+    def _forgetFileIds(self, reused: Dict, response: Dict) -> bool:
+        """ Drop the cached file_ids used by a request Telegram refused because of its files, True if any was dropped """
+
+        if response.get('ok') or 'file' not in response.get('description', '').lower():
+            return False
+
+        for field, (digest, kind, size) in reused.items():
+            self.fileCache.delete(digest, kind)
+
+        return True
+
+    def getFileCache(self) -> FileIdCache:
+        """ Use this method to get the cache of the file_ids of uploaded local files.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/getFileCache
+
+        Returns:
+            FileIdCache: The cache, None if uploads are not cached.
+        """
+
+        return self.fileCache
+
+    def setFileCache(self, file_cache: FileIdCache) -> bool:
+        """ Use this method to upload every local file only once and reuse its file_id afterwards.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/setFileCache
+
+        Args:
+            file_cache (FileIdCache): Cache used by every method uploading local files, None disables the cache.
+
+        Returns:
+            bool: True if the cache has been set correctly.
+        """
+
+        try:
+            self.fileCache = file_cache
+            return True
+        except:
+            return False
+
+    def getChatMemberCache(self) -> ChatMemberCache:
+        """ Use this method to get the cache of the ChatMember objects.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/getChatMemberCache
+
+        Returns:
+            ChatMemberCache: The cache, None if getChatMember is not cached.
+        """
+
+        return self.chatMemberCache
+
+    def setChatMemberCache(self, chat_member_cache: ChatMemberCache) -> bool:
+        """ Use this method to answer getChatMember from a cache kept in sync with the received updates.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/setChatMemberCache
+
+        Args:
+            chat_member_cache (ChatMemberCache): Cache used by getChatMember and getChatMembers, None disables the cache.
+
+        Returns:
+            bool: True if the cache has been set correctly.
+        """
+
+        try:
+            self.chatMemberCache = chat_member_cache
+            return True
+        except:
+            return False
+
+    def _pacedChatId(self, method: str, params=()):
+        """ Return the chat a request has to be paced for, None if it is not rate limited """
+
+        if self.rateLimiter is None or not self.rateLimiter.isLimited(method):
+            return None
+
+        chatId = dict(params).get('chat_id')
+
+        return chatId if chatId not in (None, "") else None
+
+    def _retryAfter(self, response: Dict, chatId, attempt: int):
+        """ Return the seconds to wait before retrying a request refused with error 429, None if it must not be retried """
+
+        if self.rateLimiter is None or response.get('ok') or response.get('error_code') != 429 or attempt >= self.rateLimiter.maxRetries:
+            return None
+
+        retryAfter = response.get('parameters', {}).get('retry_after', 1)
+
+        if chatId is not None:
+            self.rateLimiter.penalize(chatId, retryAfter, self.botToken)
+
+        return retryAfter
+
+    def _handleResponse(self, method: str, response: Dict, callback=None):
+        """ Turn a decoded Bot API response into the method result or an error Dict """
+
+        if self.debug:
+            print(response)
+
+        if response['ok']:
+            return callback(response['result']) if callback else response['result']
+        else:
+            return self._error(method, response['description'], response.get('error_code'), response.get('parameters'))
+
+    def _error(self, method: str, description: str, error_code=None, parameters=None) -> Dict:
+        """ Build the error Dict returned by every method on failure """
+
+        error = {'error': f'Error with {method} method. Enable debug mode for more info', 'description': description}
+
+        if error_code is not None:
+            error['error_code'] = error_code
+
+        if parameters is not None:
+            error['parameters'] = parameters # e.g. retry_after or migrate_to_chat_id
+
+        return error
+
+    def getRateLimiter(self) -> RateLimiter:
+        """ Use this method to get the scheduler pacing outgoing messages.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/getRateLimiter
+
+        Returns:
+            RateLimiter: The scheduler, None if flood control is disabled.
+        """
+
+        return self.rateLimiter
+
+    def setRateLimiter(self, rate_limiter: RateLimiter) -> bool:
+        """ Use this method to pace outgoing messages within Telegram flood limits.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/setRateLimiter
+
+        Args:
+            rate_limiter (RateLimiter): Scheduler used by every method sending or editing messages, None disables flood control. It can be shared by several bots.
+
+        Returns:
+            bool: True if the scheduler has been set correctly.
+        """
+
+        try:
+            self.rateLimiter = rate_limiter
+            return True
+        except:
+            return False
+
+    def getMetrics(self) -> Metrics:
+        """ Use this method to get the collector of the request metrics.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/getMetrics
+
+        Returns:
+            Metrics: The collector, None if requests are not instrumented.
+        """
+
+        return self.metrics
+
+    def setMetrics(self, metrics: Metrics) -> bool:
+        """ Use this method to record latency, bytes and errors of every method.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/setMetrics
+
+        Args:
+            metrics (Metrics): Collector of the request metrics, None disables instrumentation. It can be shared by several bots.
+
+        Returns:
+            bool: True if the collector has been set correctly.
+        """
+
+        try:
+            self.metrics = metrics
+            return True
+        except:
+            return False
+
+    def getRetryPolicy(self) -> RetryPolicy:
+        """ Use this method to get the retry policy of the requests.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/getRetryPolicy
+
+        Returns:
+            RetryPolicy: The policy, None if failed requests are not retried.
+        """
+
+        return self.retryPolicy
+
+    def setRetryPolicy(self, retry_policy: RetryPolicy) -> bool:
+        """ Use this method to retry requests failing because of the network or the server, and to hedge slow reads.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/setRetryPolicy
+
+        Args:
+            retry_policy (RetryPolicy): Policy used by every method, None disables retries. It can be shared by several bots.
+
+        Returns:
+            bool: True if the policy has been set correctly.
+        """
+
+        try:
+            self.retryPolicy = retry_policy
+            return True
+        except:
+            return False
+
     def getDebugMode(self) -> bool:
         """ Use this method to get your actual debug mode.
         
@@ -83,28 +594,30 @@ class TelegramBotApi():
 
         try:
             self.botToken = token
+            self.botUser = None # The cached identity belongs to the previous bot
             return True
         except:
             return False
 
-    def getUpdates(self, offset=0, limit=100, timeout=0, allowed_updates=[]) -> List:
+    def getUpdates(self, offset=0, limit=100, timeout=0, allowed_updates=None) -> List:
         """ Use this method to receive incoming updates using long polling. 
 
         Notes:
             For more info -> https://github.com/xSklero/python-telegram-api/wiki/getUpdates
 
+            lastUpdateId follows the last received update but is not saved to the offset store, since the updates are not handled yet.
+            Call setLastUpdateId once they are, or use pollUpdates, to resume from the last handled update after a restart.
+
         Args:
             offset (int, optional): Identifier of the first update to be returned. Defaults to 0.
             limit (int, optional): Limits the number of updates to be retrieved. Defaults to 100.
             timeout (int, optional): Timeout in seconds for long polling. Defaults to 0.
-            allowed_updates (list, optional): List of the update types you want your bot to receive. Defaults to [].
+            allowed_updates (list, optional): List of the update types you want your bot to receive. Defaults to None.
 
         Returns:
             List: An Array of Update objects is returned.
         """
 
-        token = self.botToken
-
         params = (
             ('offset', offset),
             ('limit', limit),
@@ -112,20 +625,93 @@ class TelegramBotApi():
             ('allowed_updates', allowed_updates)
         )
 
-        response = requests.get(f"https://api.telegram.org/bot{token}/getUpdates", params=params).json()
-        
-        if self.debug:
-            print(response)
+        return self._request('getUpdates', params, callback=self._storeLastUpdateId)
+
+    def _storeLastUpdateId(self, updates: List) -> List:
+        """ Keep lastUpdateId in sync with the last received update, the offset store only records handled ones """
 
-        if len(response["result"]) >= 1:
+        if len(updates) >= 1:
             # If there are updates available
 
-            self.setLastUpdateId(response["result"][-1]["update_id"]) # Set lastUpdateId
+            self.lastUpdateId = updates[-1]["update_id"] # Set lastUpdateId
 
-        if response['ok']:
-            return response['result']
-        else:
-            return {'error': 'Error with getUpdates method. Enable debug mode for more info', 'description': response['description']}
+        return self._observeUpdates(updates)
+
+    def _observeUpdates(self, updates: List) -> List:
+        """ Refresh the ChatMember cache from membership changes in the received updates """
+
+        if self.chatMemberCache is not None:
+            self.chatMemberCache.observeUpdates(updates)
+
+        return updates
+
+    def pollUpdates(self, timeout=30, limit=100, allowed_updates=None, prefetch=False, retry_delay=1) -> Iterator[Dict]:
+        """ Use this method to iterate over incoming updates using long polling.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/pollUpdates
+
+            The offset advances by itself: lastUpdateId is set once the loop body is done with an update, so without prefetch an update is delivered again if the loop stops while handling it.
+            With prefetch the next batch is requested while the current one is handled. That request confirms the whole current batch to Telegram, so if the loop stops mid-batch the rest of the batch is lost (at-most-once).
+
+        Args:
+            timeout (int, optional): Timeout in seconds for long polling. Defaults to 30.
+            limit (int, optional): Limits the number of updates retrieved by each request. Defaults to 100.
+            allowed_updates (list, optional): List of the update types you want your bot to receive. Defaults to None.
+            prefetch (bool, optional): If True the next batch is fetched in background while the current one is handled, trading redelivery after a crash for lower latency. Defaults to False.
+            retry_delay (int, optional): Seconds to wait before polling again after a failed request. Defaults to 1.
+
+        Yields:
+            Dict: Every Update object, in order.
+        """
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=1) if prefetch else None
+        nextBatch = None
+        offset = self.lastUpdateId + 1
+
+        try:
+
+            while True:
+
+                try:
+                    updates = nextBatch.result() if nextBatch else self._pollBatch(offset, limit, timeout, allowed_updates)
+                except NETWORK_ERRORS:
+                    updates = None
+
+                nextBatch = None
+
+                if not isinstance(updates, list): # If the request failed
+                    time.sleep(retry_delay)
+                    continue
+
+                if len(updates) == 0:
+                    continue
+
+                offset = updates[-1]['update_id'] + 1
+
+                if executor:
+                    nextBatch = executor.submit(self._pollBatch, offset, limit, timeout, allowed_updates)
+
+                for update in updates:
+                    yield update
+                    self.setLastUpdateId(update['update_id'])
+
+        finally:
+
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def _pollBatch(self, offset: int, limit: int, timeout: int, allowed_updates: List):
+        """ Fetch one batch of updates for pollUpdates without touching lastUpdateId """
+
+        params = (
+            ('offset', offset),
+            ('limit', limit),
+            ('timeout', timeout),
+            ('allowed_updates', allowed_updates)
+        )
+
+        return self._request('getUpdates', params, callback=self._observeUpdates)
 
     def getLastUpdateId(self) -> int:
         """ Use this method to get lastUpdateId attribute.
@@ -154,11 +740,50 @@ class TelegramBotApi():
 
         try:
             self.lastUpdateId = lastUpdateId
+
+            if self.offsetStore is not None:
+                self.offsetStore.save(self.botToken, lastUpdateId)
+
             return True
         except:
             return False
 
-    def setWebhook(self, url: str, ip_address='', max_connections=40, allowed_updates=[]) -> bool:
+    def getOffsetStore(self) -> OffsetStore:
+        """ Use this method to get the persistent store of lastUpdateId.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/getOffsetStore
+
+        Returns:
+            OffsetStore: The store, None if lastUpdateId only lives in memory.
+        """
+
+        return self.offsetStore
+
+    def setOffsetStore(self, offset_store: OffsetStore) -> bool:
+        """ Use this method to keep lastUpdateId across restarts, the offset stored for the bot is loaded right away.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/setOffsetStore
+
+        Args:
+            offset_store (OffsetStore): Store saving every lastUpdateId, None keeps it only in memory.
+
+        Returns:
+            bool: True if the store has been set correctly.
+        """
+
+        try:
+            self.offsetStore = offset_store
+
+            if offset_store is not None:
+                self.lastUpdateId = max(self.lastUpdateId, offset_store.load(self.botToken))
+
+            return True
+        except:
+            return False
+
+    def setWebhook(self, url: str, ip_address=None, max_connections=40, allowed_updates=None, secret_token=None) -> bool:
         """ Use this method to specify a url and receive incoming updates via an outgoing webhook.
 
         Note:
@@ -166,32 +791,24 @@ class TelegramBotApi():
 
         Args:
             url (str): HTTPS url to send updates to.
-            ip_address (str, optional): The fixed IP address which will be used to send webhook requests instead of the IP address resolved through DNS. Defaults to ''.
+            ip_address (str, optional): The fixed IP address which will be used to send webhook requests instead of the IP address resolved through DNS. Defaults to None.
             max_connections (int, optional): Maximum allowed number of simultaneous HTTPS connections to the webhook for update delivery, 1-100. Defaults to 40.
-            allowed_updates (list, optional): List of the update types you want your bot to receive. Defaults to [].
+            allowed_updates (list, optional): List of the update types you want your bot to receive. Defaults to None.
+            secret_token (str, optional): Token sent in the X-Telegram-Bot-Api-Secret-Token header of every webhook request, use the same one for WebhookServer. Defaults to None.
 
         Returns:
             bool: Returns True on success
         """
         
-        token = self.botToken
-
         params = (
             ('url', url),
             ('ip_address', ip_address),
             ('max_connections', max_connections),
-            ('allowed_updates', allowed_updates)
+            ('allowed_updates', allowed_updates),
+            ('secret_token', secret_token)
         )
 
-        response = requests.get(f"https://api.telegram.org/bot{token}/setWebhook", params=params).json()
-
-        if self.debug:
-            print(response)
-
-        if response['ok']:
-            return response['result']
-        else:
-            return {'error': 'Error with setWebhook method. Enable debug mode for more info', 'description': response['description']}
+        return self._request('setWebhook', params)
 
     def deleteWebhook(self, drop_pending_updates=True) -> bool:
         """ Use this method to remove webhook integration.
@@ -206,21 +823,11 @@ class TelegramBotApi():
             bool: Returns True on success.
         """
 
-        token = self.botToken
-
         params = (
             ('drop_pending_updates', drop_pending_updates),
         )
 
-        response = requests.get(f"https://api.telegram.org/bot{token}/deleteWebhook", params=params).json()
-
-        if self.debug:
-            print(response)
-
-        if response['ok']:
-            return response['result']
-        else:
-            return {'error': 'Error with deleteWebhook method. Enable debug mode for more info', 'description': response['description']}
+        return self._request('deleteWebhook', params)
 
     def getWebhookInfo(self) -> Dict:
         """ Use this method to get current webhook status.
@@ -232,17 +839,7 @@ class TelegramBotApi():
             Dict: Returns a WebhookInfo object.
         """
 
-        token = self.botToken
-
-        response = requests.get(f"https://api.telegram.org/bot{token}/getWebhookInfo").json()
-
-        if self.debug:
-            print(response)
-
-        if response['ok']:
-            return response['result']
-        else:
-            return {'error': 'Error with getWebhookInfo method. Enable debug mode for more info', 'description': response['description']}
+        return self._request('getWebhookInfo')
 
     def getMe(self) -> Dict:
         """ Use this method to get basic bot informations.
@@ -250,21 +847,46 @@ class TelegramBotApi():
         Notes:
             For more info -> https://github.com/xSklero/python-telegram-api/wiki/getMe
 
+            This method always calls Telegram and refreshes the cached bot identity, use getBotUser to read the cache.
+
         Returns:
             Dict: Returns basic information about the bot in form of a User object.
         """
 
-        token = self.botToken
+        return self._request('getMe', callback=self._storeBotUser)
 
-        response = requests.get(f"https://api.telegram.org/bot{token}/getMe").json()
+    def _storeBotUser(self, user: Dict) -> Dict:
+        """ Cache the User object of the bot """
 
-        if self.debug:
-            print(response)
+        self.botUser = user
+        self.botUserFetchedAt = time.monotonic()
 
-        if response['ok']:
-            return response['result']
-        else:
-            return {'error': 'Error with getMe method. Enable debug mode for more info', 'description': response['description']}
+        return user
+
+    def _cachedBotUser(self):
+        """ Return the cached User object of the bot, None if missing or older than the TTL """
+
+        if self.botUser is None or (self.botUserTtl is not None and time.monotonic() - self.botUserFetchedAt > self.botUserTtl):
+            return None
+
+        return self.botUser
+
+    def getBotUser(self, refresh=False) -> Dict:
+        """ Use this method to get the User object of the bot, fetched with getMe only when the cached one is missing or expired.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/getBotUser
+
+        Args:
+            refresh (bool, optional): If True the cached User object is fetched again. Defaults to False.
+
+        Returns:
+            Dict: The User object of the bot.
+        """
+
+        user = None if refresh else self._cachedBotUser()
+
+        return user if user is not None else self.getMe()
 
     def getBotUsername(self) -> str:
         """ Use this method to get your actual bot username. 
@@ -277,7 +899,7 @@ class TelegramBotApi():
         """
 
         try:
-            return self.getMe()['username']
+            return self.getBotUser()['username']
         except:
             return ''
     
@@ -292,11 +914,11 @@ class TelegramBotApi():
         """
 
         try:
-            return self.getMe()['first_name']
+            return self.getBotUser()['first_name']
         except:
             return ''
 
-    def sendMessage(self, chat_id: str, text: str, parse_mode='MarkdownV2', disable_web_page_preview=False, disable_notification=False, reply_to_message_id=None, allow_sending_without_reply=True, reply_markup={}) -> Dict:
+    def sendMessage(self, chat_id: str, text: str, parse_mode='MarkdownV2', disable_web_page_preview=False, disable_notification=False, reply_to_message_id=None, allow_sending_without_reply=True, reply_markup=None) -> Dict:
         """ Use this method to send text messages. 
 
         Notes:
@@ -310,15 +932,13 @@ class TelegramBotApi():
             disable_notification (bool, optional): If True sends the message silently (Users will receive a notification with no sound). Defaults to False.
             reply_to_message_id (int, optional): ID of the original message to reply to. Defaults to None.
             allow_sending_without_reply (bool, optional): If True the message will be sent even if the specified replied-to message is not found. Defaults to True.
-            reply_markup (dict, optional): Additional interface options (A JSON-serialized object). Defaults to {}.
+            reply_markup (dict, optional): Additional interface options (A JSON-serialized object). Defaults to None.
 
         Returns:
             Dict: On success, the sent Message is returned
 
         """
 
-        token = self.botToken
-
         params = (
             ('chat_id', chat_id),
             ('text', text),
@@ -327,18 +947,10 @@ class TelegramBotApi():
             ('disable_notification', disable_notification),
             ('reply_to_message_id', reply_to_message_id),
             ('allow_sending_without_reply', allow_sending_without_reply),
-            ('reply_markup', json.dumps(reply_markup)),
+            ('reply_markup', reply_markup),
         )
 
-        response = requests.get(f"https://api.telegram.org/bot{token}/sendMessage", params=params).json()
-        
-        if self.debug:
-            print(response)
-
-        if response['ok']:
-            return response['result']
-        else:
-            return {'error': 'Error with sendMessage method. Enable debug mode for more info', 'description': response['description']}
+        return self._request('sendMessage', params)
 
 
     def forwardMessage(self, chat_id: str, from_chat_id: str, message_id: int, disable_notification=False) -> Dict:
@@ -357,8 +969,6 @@ class TelegramBotApi():
             Dict: The sent Message is returned on success.
         """
 
-        token = self.botToken
-
         params = (
             ('chat_id', chat_id),
             ('from_chat_id', from_chat_id),
@@ -366,17 +976,9 @@ class TelegramBotApi():
             ('disable_notification', disable_notification),
         )
 
-        response = requests.get(f"https://api.telegram.org/bot{token}/forwardMessage", params=params).json()
-
-        if self.debug:
-            print(response)
-
-        if response['ok']:
-            return response['result']
-        else:
-            return {'error': 'Error with forwardMessage method. Enable debug mode for more info', 'description': response['description']}
+        return self._request('forwardMessage', params)
 
-    def copyMessage(self, chat_id: str, from_chat_id: str, message_id: int, caption="", disable_notification=False, reply_to_message_id=None, allow_sending_without_reply=True, reply_markup={}) -> Dict:
+    def copyMessage(self, chat_id: str, from_chat_id: str, message_id: int, caption=None, disable_notification=False, reply_to_message_id=None, allow_sending_without_reply=True, reply_markup=None) -> Dict:
         """ Use this method to copy messages of any kind. The method is analogous to the method forwardMessage, but the copied message doesn't have a link to the original message.
 
         Notes:
@@ -386,18 +988,16 @@ class TelegramBotApi():
             chat_id (str): Unique identifier for the target chat or username of the target channel.
             from_chat_id (str): Unique identifier for the chat where the original message was sent.
             message_id (int): Message identifier in the chat specified in from_chat_id.
-            caption (str): New caption for media. Defaults to "".
+            caption (str): New caption for media. Defaults to None.
             disable_notification (bool, optional): If True sends the message silently (Users will receive a notification with no sound). Defaults to False.
             reply_to_message_id (int, optional): ID of the original message to reply to. Defaults to None.
             allow_sending_without_reply (bool, optional): If True the message will be sent even if the specified replied-to message is not found. Defaults to True.
-            reply_markup (dict, optional): Additional interface options (A JSON-serialized object). Defaults to {}.
+            reply_markup (dict, optional): Additional interface options (A JSON-serialized object). Defaults to None.
 
         Returns:
             Dict: The MessageId of the sent message on success.
         """
 
-        token = self.botToken
-
         params = (
             ('chat_id', chat_id),
             ('from_chat_id', from_chat_id),
@@ -406,20 +1006,12 @@ class TelegramBotApi():
             ('disable_notification', disable_notification),
             ('reply_to_message_id', reply_to_message_id),
             ('allow_sending_without_reply', allow_sending_without_reply),
-            ('reply_markup', json.dumps(reply_markup)),
+            ('reply_markup', reply_markup),
         )
 
-        response = requests.get(f"https://api.telegram.org/bot{token}/copyMessage", params=params).json()
-
-        if self.debug:
-            print(response)
-
-        if response['ok']:
-            return response['result']
-        else:
-            return {'error': 'Error with copyMessage method. Enable debug mode for more info', 'description': response['description']}
+        return self._request('copyMessage', params)
 
-    def sendPhoto(self, chat_id: str, photo_url="", local_photo="", caption="", parse_mode='MarkdownV2', disable_notification=False, reply_to_message_id=None, allow_sending_without_reply=True, reply_markup={}) -> Dict:
+    def sendPhoto(self, chat_id: str, photo_url=None, local_photo=None, caption=None, parse_mode='MarkdownV2', disable_notification=False, reply_to_message_id=None, allow_sending_without_reply=True, reply_markup=None) -> Dict:
         """ Use this method to send photos
 
         Notes:
@@ -427,21 +1019,19 @@ class TelegramBotApi():
 
         Args:
             chat_id (str): Unique identifier for the target chat or username of the target channel.
-            photo_url (str, optional): Pass an HTTP URL as a String for Telegram to get a photo from the Internet. Defaults to "".
-            local_photo (str, optional): Your image path. The photo must be at most 10 MB in size. The photo's width and height must not exceed 10000 in total. Width and height ratio must be at most 20. Defaults to "".
-            caption (str, optional): Photo caption. Defaults to "".
+            photo_url (str, optional): Pass an HTTP URL as a String for Telegram to get a photo from the Internet. Defaults to None.
+            local_photo (str, optional): Your image path. The photo must be at most 10 MB in size. The photo's width and height must not exceed 10000 in total. Width and height ratio must be at most 20. Defaults to None.
+            caption (str, optional): Photo caption. Defaults to None.
             parse_mode (str, optional): Mode for parsing entities in the message text. Defaults to 'MarkdownV2'.
             disable_notification (bool, optional): If True sends the message silently (Users will receive a notification with no sound). Defaults to False.
             reply_to_message_id (int, optional): ID of the original message to reply to. Defaults to None.
             allow_sending_without_reply (bool, optional): If True the message will be sent even if the specified replied-to message is not found. Defaults to True.
-            reply_markup (dict, optional): Additional interface options (A JSON-serialized object). Defaults to {}.
+            reply_markup (dict, optional): Additional interface options (A JSON-serialized object). Defaults to None.
 
         Returns:
             Dict: On success, the sent Message is returned.
         """
 
-        token = self.botToken
-
         params = (
             ('chat_id', chat_id),
             ('photo', photo_url),
@@ -450,29 +1040,18 @@ class TelegramBotApi():
             ('disable_notification', disable_notification),
             ('reply_to_message_id', reply_to_message_id),
             ('allow_sending_without_reply', allow_sending_without_reply),
-            ('reply_markup', json.dumps(reply_markup)),
+            ('reply_markup', reply_markup),
         )
 
-        if local_photo != "": # If using a local file
+        files = {}
 
-            try:
-                response = requests.post(f"https://api.telegram.org/bot{token}/sendPhoto", params=params, files={'photo': (open(local_photo, 'rb'))}).json()
-            except:
-                return {'error': 'Error with sendPhoto method. Enable debug mode for more info', 'description': 'Bad file path'}
-            
-        else:
-
-            response = requests.get(f"https://api.telegram.org/bot{token}/sendPhoto", params=params).json()
+        if local_photo: # If using a local file
 
-        if self.debug:
-            print(response)
+            files['photo'] = local_photo
 
-        if response['ok']:
-            return response['result']
-        else:
-            return {'error': 'Error with sendPhoto method. Enable debug mode for more info', 'description': response['description']}
+        return self._request('sendPhoto', params, files)
 
-    def sendAudio(self, chat_id: str, audio_url="", local_audio="", caption="", performer="", title="", duration="", thumb="", parse_mode='MarkdownV2', disable_notification=False, reply_to_message_id=None, allow_sending_without_reply=True, reply_markup={}) -> Dict:
+    def sendAudio(self, chat_id: str, audio_url=None, local_audio=None, caption=None, performer=None, title=None, duration=None, thumb=None, parse_mode='MarkdownV2', disable_notification=False, reply_to_message_id=None, allow_sending_without_reply=True, reply_markup=None) -> Dict:
         """ Use this method to send audios
 
         Notes:
@@ -480,9 +1059,9 @@ class TelegramBotApi():
 
         Args:
             chat_id (str): Unique identifier for the target chat or username of the target channel.
-            audio_url (str, optional): Pass an HTTP URL as a String for Telegram to get a audio from the Internet. Your audio must be in the .MP3 or .M4A format. Defaults to "".
+            audio_url (str, optional): Pass an HTTP URL as a String for Telegram to get a audio from the Internet. Your audio must be in the .MP3 or .M4A format. Defaults to None.
             local_audio (str, optional): Your audio path. Your audio must be in the .MP3 or .M4A format. Bots can currently send audio files of up to 50 MB in size, this limit may be changed in the future.
-            caption (str, optional): Audio caption. Defaults to "".
+            caption (str, optional): Audio caption. Defaults to None.
             performer (str, optional): Performer.
             title (str, optional): Track name.
             duration (str, optional): Duration of the audio in seconds.
@@ -491,14 +1070,12 @@ class TelegramBotApi():
             disable_notification (bool, optional): If True sends the message silently (Users will receive a notification with no sound). Defaults to False.
             reply_to_message_id (int, optional): ID of the original message to reply to. Defaults to None.
             allow_sending_without_reply (bool, optional): If True the message will be sent even if the specified replied-to message is not found. Defaults to True.
-            reply_markup (dict, optional): Additional interface options (A JSON-serialized object). Defaults to {}.
+            reply_markup (dict, optional): Additional interface options (A JSON-serialized object). Defaults to None.
 
         Returns:
             Dict: On success, the sent Message is returned.
         """
 
-        token = self.botToken
-
         params = (
             ('chat_id', chat_id),
             ('audio', audio_url),
@@ -510,43 +1087,21 @@ class TelegramBotApi():
             ('disable_notification', disable_notification),
             ('reply_to_message_id', reply_to_message_id),
             ('allow_sending_without_reply', allow_sending_without_reply),
-            ('reply_markup', json.dumps(reply_markup)),
+            ('reply_markup', reply_markup),
         )
 
-        if local_audio != "": # If using a local audio file
-
-            try:
-
-                if thumb != "": # If using a thumb
+        files = {}
 
-                    try:
-                        response = requests.post(f"https://api.telegram.org/bot{token}/sendAudio", params=params, files={'audio': (open(local_audio, 'rb')), 'thumb': (open(thumb, 'rb'))}).json()
-                    except:
-                        return {'error': 'Error with sendAudio method. Enable debug mode for more info', 'description': 'Bad file path'}
-                
-                else:
-
-                    try:
-                        response = requests.post(f"https://api.telegram.org/bot{token}/sendAudio", params=params, files={'audio': (open(local_audio, 'rb'))}).json()
-                    except:
-                        return {'error': 'Error with sendAudio method. Enable debug mode for more info', 'description': 'Bad file path'}
-
-            except:
-                return {'error': 'Error with sendPhoto method. Enable debug mode for more info', 'description': 'Bad file path'}
-
-        else:
+        if local_audio: # If using a local audio file
 
-            response = requests.get(f"https://api.telegram.org/bot{token}/sendAudio", params=params).json()
+            files['audio'] = local_audio
 
-        if self.debug:
-            print(response)
+            if thumb: # If using a thumb
+                files['thumb'] = thumb
 
-        if response['ok']:
-            return response['result']
-        else:
-            return {'error': 'Error with sendPhoto method. Enable debug mode for more info', 'description': response['description']}
+        return self._request('sendAudio', params, files)
 
-    def sendDocument(self, chat_id: str, document_url="", local_document="", caption="", disable_content_type_detection=False, thumb="", parse_mode='MarkdownV2', disable_notification=False, reply_to_message_id=None, allow_sending_without_reply=True, reply_markup={}) -> Dict:
+    def sendDocument(self, chat_id: str, document_url=None, local_document=None, caption=None, disable_content_type_detection=False, thumb=None, parse_mode='MarkdownV2', disable_notification=False, reply_to_message_id=None, allow_sending_without_reply=True, reply_markup=None) -> Dict:
         """ Use this method to send general files
 
         Notes:
@@ -554,23 +1109,21 @@ class TelegramBotApi():
 
         Args:
             chat_id (str): Unique identifier for the target chat or username of the target channel.
-            document_url (str, optional): Pass an HTTP URL as a String for Telegram to get a document from the Internet. Your document must be in any format. Defaults to "".
+            document_url (str, optional): Pass an HTTP URL as a String for Telegram to get a document from the Internet. Your document must be in any format. Defaults to None.
             local_document (str, optional): Your document path. Your document must be in any format. Bots can currently send document files of up to 50 MB in size, this limit may be changed in the future.
-            caption (str, optional): document caption. Defaults to "".
+            caption (str, optional): document caption. Defaults to None.
             disable_content_type_detection (bool, optional): Disables automatic server-side content type detection for files uploaded. Defaults to False.
             thumb (str, optional): Thumbnail of the file sent. The thumbnail should be in JPEG format and less than 200 kB in size. A thumbnail's width and height should not exceed 320.
             parse_mode (str, optional): Mode for parsing entities in the message text. Defaults to 'MarkdownV2'.
             disable_notification (bool, optional): If True sends the message silently (Users will receive a notification with no sound). Defaults to False.
             reply_to_message_id (int, optional): ID of the original message to reply to. Defaults to None.
             allow_sending_without_reply (bool, optional): If True the message will be sent even if the specified replied-to message is not found. Defaults to True.
-            reply_markup (dict, optional): Additional interface options (A JSON-serialized object). Defaults to {}.
+            reply_markup (dict, optional): Additional interface options (A JSON-serialized object). Defaults to None.
 
         Returns:
             Dict: On success, the sent Message is returned.
         """
 
-        token = self.botToken
-
         params = (
             ('chat_id', chat_id),
             ('document', document_url),
@@ -580,46 +1133,21 @@ class TelegramBotApi():
             ('disable_notification', disable_notification),
             ('reply_to_message_id', reply_to_message_id),
             ('allow_sending_without_reply', allow_sending_without_reply),
-            ('reply_markup', json.dumps(reply_markup)),
+            ('reply_markup', reply_markup),
         )
 
-        if local_document != "":  # If using a local document file
-
-            try:
-
-                if thumb != "":  # If using a thumb
+        files = {}
 
-                    try:
-                        response = requests.post(f"https://api.telegram.org/bot{token}/sendDocument", params=params, files={
-                                                 'document': (open(local_document, 'rb')), 'thumb': (open(thumb, 'rb'))}).json()
-                    except:
-                        return {'error': 'Error with sendDocument method. Enable debug mode for more info', 'description': 'Bad file path'}
+        if local_document: # If using a local document file
 
-                else:
+            files['document'] = local_document
 
-                    try:
-                        response = requests.post(f"https://api.telegram.org/bot{token}/sendDocument", params=params, files={
-                                                 'document': (open(local_document, 'rb'))}).json()
-                    except:
-                        return {'error': 'Error with sendDocument method. Enable debug mode for more info', 'description': 'Bad file path'}
+            if thumb: # If using a thumb
+                files['thumb'] = thumb
 
-            except:
-                return {'error': 'Error with sendDocument method. Enable debug mode for more info', 'description': 'Bad file path'}
+        return self._request('sendDocument', params, files)
 
-        else:
-
-            response = requests.get(
-                f"https://api.telegram.org/bot{token}/sendDocument", params=params).json()
-
-        if self.debug:
-            print(response)
-
-        if response['ok']:
-            return response['result']
-        else:
-            return {'error': 'Error with sendDocument method. Enable debug mode for more info', 'description': response['description']}
-
-    def sendVideo(self, chat_id: str, video_url="", local_video="", caption="", width="", height="", duration="", supports_streaming=False, thumb="", parse_mode='MarkdownV2', disable_notification=False, reply_to_message_id=None, allow_sending_without_reply=True, reply_markup={}) -> Dict:
+    def sendVideo(self, chat_id: str, video_url=None, local_video=None, caption=None, width=None, height=None, duration=None, supports_streaming=False, thumb=None, parse_mode='MarkdownV2', disable_notification=False, reply_to_message_id=None, allow_sending_without_reply=True, reply_markup=None) -> Dict:
         """ Use this method to send video files
 
         Notes:
@@ -627,26 +1155,24 @@ class TelegramBotApi():
 
         Args:
             chat_id (str): Unique identifier for the target chat or username of the target channel.
-            video_url (str, optional): Pass an HTTP URL as a String for Telegram to get a video from the Internet. Your video must be in the .MP3 or .M4A format. Defaults to "".
+            video_url (str, optional): Pass an HTTP URL as a String for Telegram to get a video from the Internet. Your video must be in the .MP3 or .M4A format. Defaults to None.
             local_video (str, optional): Your video path. Your video must be in the .MP3 or .M4A format. Bots can currently send video files of up to 50 MB in size, this limit may be changed in the future.
-            caption (str, optional): Video caption. Defaults to "".
-            width (str, optional): Video width. Defaults to "".
-            height (str, optional): Video height. Defaults to "".
-            duration (str, optional): Duration of the video in seconds. Defaults to "".
+            caption (str, optional): Video caption. Defaults to None.
+            width (str, optional): Video width. Defaults to None.
+            height (str, optional): Video height. Defaults to None.
+            duration (str, optional): Duration of the video in seconds. Defaults to None.
             supports_streaming (bool, optional): Pass True, if the uploaded video is suitable for streaming. Defaults to False.
             thumb (str, optional): Thumbnail of the file sent. The thumbnail should be in JPEG format and less than 200 kB in size. A thumbnail's width and height should not exceed 320.
             parse_mode (str, optional): Mode for parsing entities in the message text. Defaults to 'MarkdownV2'.
             disable_notification (bool, optional): If True sends the message silently (Users will receive a notification with no sound). Defaults to False.
             reply_to_message_id (int, optional): ID of the original message to reply to. Defaults to None.
             allow_sending_without_reply (bool, optional): If True the message will be sent even if the specified replied-to message is not found. Defaults to True.
-            reply_markup (dict, optional): Additional interface options (A JSON-serialized object). Defaults to {}.
+            reply_markup (dict, optional): Additional interface options (A JSON-serialized object). Defaults to None.
 
         Returns:
             Dict: On success, the sent Message is returned.
         """
 
-        token = self.botToken
-
         params = (
             ('chat_id', chat_id),
             ('video', video_url),
@@ -659,46 +1185,21 @@ class TelegramBotApi():
             ('disable_notification', disable_notification),
             ('reply_to_message_id', reply_to_message_id),
             ('allow_sending_without_reply', allow_sending_without_reply),
-            ('reply_markup', json.dumps(reply_markup)),
+            ('reply_markup', reply_markup),
         )
 
-        if local_video != "":  # If using a local video file
-
-            try:
-
-                if thumb != "":  # If using a thumb
-
-                    try:
-                        response = requests.post(f"https://api.telegram.org/bot{token}/sendVideo", params=params, files={
-                                                 'video': (open(local_video, 'rb')), 'thumb': (open(thumb, 'rb'))}).json()
-                    except:
-                        return {'error': 'Error with sendVideo method. Enable debug mode for more info', 'description': 'Bad file path'}
-
-                else:
-
-                    try:
-                        response = requests.post(f"https://api.telegram.org/bot{token}/sendVideo", params=params, files={
-                                                 'video': (open(local_video, 'rb'))}).json()
-                    except:
-                        return {'error': 'Error with sendVideo method. Enable debug mode for more info', 'description': 'Bad file path'}
+        files = {}
 
-            except:
-                return {'error': 'Error with sendVideo method. Enable debug mode for more info', 'description': 'Bad file path'}
+        if local_video: # If using a local video file
 
-        else:
-
-            response = requests.get(
-                f"https://api.telegram.org/bot{token}/sendVideo", params=params).json()
+            files['video'] = local_video
 
-        if self.debug:
-            print(response)
+            if thumb: # If using a thumb
+                files['thumb'] = thumb
 
-        if response['ok']:
-            return response['result']
-        else:
-            return {'error': 'Error with sendVideo method. Enable debug mode for more info', 'description': response['description']}
+        return self._request('sendVideo', params, files)
 
-    def sendAnimation(self, chat_id: str, animation_url="", local_animation="", caption="", width="", height="", duration="", thumb="", parse_mode='MarkdownV2', disable_notification=False, reply_to_message_id=None, allow_sending_without_reply=True, reply_markup={}) -> Dict:
+    def sendAnimation(self, chat_id: str, animation_url=None, local_animation=None, caption=None, width=None, height=None, duration=None, thumb=None, parse_mode='MarkdownV2', disable_notification=False, reply_to_message_id=None, allow_sending_without_reply=True, reply_markup=None) -> Dict:
         """ Use this method to send animation files (GIF or H.264/MPEG-4 AVC video without sound)
 
         Notes:
@@ -706,25 +1207,23 @@ class TelegramBotApi():
 
         Args:
             chat_id (str): Unique identifier for the target chat or username of the target channel.
-            animation_url (str, optional): Pass an HTTP URL as a String for Telegram to get a animation from the Internet. Your animation must be in the .MP3 or .M4A format. Defaults to "".
+            animation_url (str, optional): Pass an HTTP URL as a String for Telegram to get a animation from the Internet. Your animation must be in the .MP3 or .M4A format. Defaults to None.
             local_animation (str, optional): Your animation path. Your animation must be GIF or H.264/MPEG-4 AVC video without sound. Bots can currently send animation files of up to 50 MB in size, this limit may be changed in the future.
-            caption (str, optional): Video caption. Defaults to "".
-            width (str, optional): Video width. Defaults to "".
-            height (str, optional): Video height. Defaults to "".
-            duration (str, optional): Duration of the video in seconds. Defaults to "".
+            caption (str, optional): Video caption. Defaults to None.
+            width (str, optional): Video width. Defaults to None.
+            height (str, optional): Video height. Defaults to None.
+            duration (str, optional): Duration of the video in seconds. Defaults to None.
             thumb (str, optional): Thumbnail of the file sent. The thumbnail should be in JPEG format and less than 200 kB in size. A thumbnail's width and height should not exceed 320.
             parse_mode (str, optional): Mode for parsing entities in the message text. Defaults to 'MarkdownV2'.
             disable_notification (bool, optional): If True sends the message silently (Users will receive a notification with no sound). Defaults to False.
             reply_to_message_id (int, optional): ID of the original message to reply to. Defaults to None.
             allow_sending_without_reply (bool, optional): If True the message will be sent even if the specified replied-to message is not found. Defaults to True.
-            reply_markup (dict, optional): Additional interface options (A JSON-serialized object). Defaults to {}.
+            reply_markup (dict, optional): Additional interface options (A JSON-serialized object). Defaults to None.
 
         Returns:
             Dict: On success, the sent Message is returned.
         """
 
-        token = self.botToken
-
         params = (
             ('chat_id', chat_id),
             ('animation', animation_url),
@@ -736,46 +1235,21 @@ class TelegramBotApi():
             ('disable_notification', disable_notification),
             ('reply_to_message_id', reply_to_message_id),
             ('allow_sending_without_reply', allow_sending_without_reply),
-            ('reply_markup', json.dumps(reply_markup)),
+            ('reply_markup', reply_markup),
         )
 
-        if local_animation != "":  # If using a local animation file
-
-            try:
-
-                if thumb != "":  # If using a thumb
-
-                    try:
-                        response = requests.post(f"https://api.telegram.org/bot{token}/sendAnimation", params=params, files={
-                                                 'animation': (open(local_animation, 'rb')), 'thumb': (open(thumb, 'rb'))}).json()
-                    except:
-                        return {'error': 'Error with sendAnimation method. Enable debug mode for more info', 'description': 'Bad file path'}
-
-                else:
+        files = {}
 
-                    try:
-                        response = requests.post(f"https://api.telegram.org/bot{token}/sendAnimation", params=params, files={
-                                                 'animation': (open(local_animation, 'rb'))}).json()
-                    except:
-                        return {'error': 'Error with sendAnimation method. Enable debug mode for more info', 'description': 'Bad file path'}
+        if local_animation: # If using a local animation file
 
-            except:
-                return {'error': 'Error with sendAnimation method. Enable debug mode for more info', 'description': 'Bad file path'}
+            files['animation'] = local_animation
 
-        else:
-
-            response = requests.get(
-                f"https://api.telegram.org/bot{token}/sendAnimation", params=params).json()
-
-        if self.debug:
-            print(response)
+            if thumb: # If using a thumb
+                files['thumb'] = thumb
 
-        if response['ok']:
-            return response['result']
-        else:
-            return {'error': 'Error with sendAnimation method. Enable debug mode for more info', 'description': response['description']}
+        return self._request('sendAnimation', params, files)
 
-    def sendVoice(self, chat_id: str, voice_url="", local_voice="", caption="", duration="", parse_mode='MarkdownV2', disable_notification=False, reply_to_message_id=None, allow_sending_without_reply=True, reply_markup={}) -> Dict:
+    def sendVoice(self, chat_id: str, voice_url=None, local_voice=None, caption=None, duration=None, parse_mode='MarkdownV2', disable_notification=False, reply_to_message_id=None, allow_sending_without_reply=True, reply_markup=None) -> Dict:
         """ Use this method to send audio files
 
         Notes:
@@ -783,22 +1257,20 @@ class TelegramBotApi():
 
         Args:
             chat_id (str): Unique identifier for the target chat or username of the target channel.
-            voice_url (str, optional): Pass an HTTP URL as a String for Telegram to get a voice from the Internet. Defaults to "".
-            local_voice (str, optional): Your audio path. Bots can currently send voice messages of up to 50 MB. Your audio must be in an .OGG file encoded. Defaults to "".
-            caption (str, optional): Voice caption. Defaults to "".
-            duration (str, optional): Duration of the video in seconds. Defaults to "".
+            voice_url (str, optional): Pass an HTTP URL as a String for Telegram to get a voice from the Internet. Defaults to None.
+            local_voice (str, optional): Your audio path. Bots can currently send voice messages of up to 50 MB. Your audio must be in an .OGG file encoded. Defaults to None.
+            caption (str, optional): Voice caption. Defaults to None.
+            duration (str, optional): Duration of the video in seconds. Defaults to None.
             parse_mode (str, optional): Mode for parsing entities in the message text. Defaults to 'MarkdownV2'.
             disable_notification (bool, optional): If True sends the message silently (Users will receive a notification with no sound). Defaults to False.
             reply_to_message_id (int, optional): ID of the original message to reply to. Defaults to None.
             allow_sending_without_reply (bool, optional): If True the message will be sent even if the specified replied-to message is not found. Defaults to True.
-            reply_markup (dict, optional): Additional interface options (A JSON-serialized object). Defaults to {}.
+            reply_markup (dict, optional): Additional interface options (A JSON-serialized object). Defaults to None.
 
         Returns:
             Dict: On success, the sent Message is returned.
         """
 
-        token = self.botToken
-
         params = (
             ('chat_id', chat_id),
             ('voice', voice_url),
@@ -808,29 +1280,18 @@ class TelegramBotApi():
             ('disable_notification', disable_notification),
             ('reply_to_message_id', reply_to_message_id),
             ('allow_sending_without_reply', allow_sending_without_reply),
-            ('reply_markup', json.dumps(reply_markup)),
+            ('reply_markup', reply_markup),
         )
 
-        if local_voice != "": # If using a local file
-
-            try:
-                response = requests.post(f"https://api.telegram.org/bot{token}/sendVoice", params=params, files={'voice': (open(local_voice, 'rb'))}).json()
-            except:
-                return {'error': 'Error with sendVoice method. Enable debug mode for more info', 'description': 'Bad file path'}
-            
-        else:
+        files = {}
 
-            response = requests.get(f"https://api.telegram.org/bot{token}/sendVoice", params=params).json()
+        if local_voice: # If using a local file
 
-        if self.debug:
-            print(response)
+            files['voice'] = local_voice
 
-        if response['ok']:
-            return response['result']
-        else:
-            return {'error': 'Error with sendVoice method. Enable debug mode for more info', 'description': response['description']}
+        return self._request('sendVoice', params, files)
 
-    def sendVideoNote(self, chat_id: str, local_video="", length="30", duration="", thumb="", parse_mode='MarkdownV2', disable_notification=False, reply_to_message_id=None, allow_sending_without_reply=True, reply_markup={}) -> Dict:
+    def sendVideoNote(self, chat_id: str, local_video=None, length="30", duration=None, thumb=None, parse_mode='MarkdownV2', disable_notification=False, reply_to_message_id=None, allow_sending_without_reply=True, reply_markup=None) -> Dict:
         """ Use this method to send rounded square mp4 videos of up to 1 minute long. Sending video notes by a URL is currently unsupported. 
 
         Notes:
@@ -840,20 +1301,18 @@ class TelegramBotApi():
             chat_id (str): Unique identifier for the target chat or username of the target channel.
             local_video (str, optional): Your video path. Your video must be in the .MP3 or .M4A format. Bots can currently send video files of up to 50 MB in size, this limit may be changed in the future.
             length (str, optional): Video width and height, i.e. diameter of the video message. Defaults to "".
-            duration (str, optional): Duration of the video in seconds. Defaults to "".
+            duration (str, optional): Duration of the video in seconds. Defaults to None.
             thumb (str, optional): Thumbnail of the file sent. The thumbnail should be in JPEG format and less than 200 kB in size. A thumbnail's width and height should not exceed 320.
             parse_mode (str, optional): Mode for parsing entities in the message text. Defaults to 'MarkdownV2'.
             disable_notification (bool, optional): If True sends the message silently (Users will receive a notification with no sound). Defaults to False.
             reply_to_message_id (int, optional): ID of the original message to reply to. Defaults to None.
             allow_sending_without_reply (bool, optional): If True the message will be sent even if the specified replied-to message is not found. Defaults to True.
-            reply_markup (dict, optional): Additional interface options (A JSON-serialized object). Defaults to {}.
+            reply_markup (dict, optional): Additional interface options (A JSON-serialized object). Defaults to None.
 
         Returns:
             Dict: On success, the sent Message is returned.
         """
 
-        token = self.botToken
-
         params = (
             ('chat_id', chat_id),
             ('parse_mode', parse_mode),
@@ -862,127 +1321,68 @@ class TelegramBotApi():
             ('disable_notification', disable_notification),
             ('reply_to_message_id', reply_to_message_id),
             ('allow_sending_without_reply', allow_sending_without_reply),
-            ('reply_markup', json.dumps(reply_markup)),
+            ('reply_markup', reply_markup),
         )
 
-        if local_video != "":  # If using a local video file
-
-            try:
-
-                if thumb != "":  # If using a thumb
+        files = {}
 
-                    try:
-                        response = requests.post(f"https://api.telegram.org/bot{token}/sendVideoNote", params=params, files={
-                                                 'video_note': (open(local_video, 'rb')), 'thumb': (open(thumb, 'rb'))}).json()
-                    except:
-                        return {'error': 'Error with sendVideoNote method. Enable debug mode for more info', 'description': 'Bad file path'}
+        if local_video: # If using a local video file
 
-                else:
+            files['video_note'] = local_video
 
-                    try:
-                        response = requests.post(f"https://api.telegram.org/bot{token}/sendVideoNote", params=params, files={
-                                                 'video_note': (open(local_video, 'rb'))}).json()
-                    except:
-                        return {'error': 'Error with sendVideoNote method. Enable debug mode for more info', 'description': 'Bad file path'}
+            if thumb: # If using a thumb
+                files['thumb'] = thumb
 
-            except:
-                return {'error': 'Error with sendVideoNote method. Enable debug mode for more info', 'description': 'Bad file path'}
-
-        else:
-
-            response = requests.get(
-                f"https://api.telegram.org/bot{token}/sendVideoNote", params=params).json()
-
-        if self.debug:
-            print(response)
-
-        if response['ok']:
-            return response['result']
-        else:
-            return {'error': 'Error with sendVideoNote method. Enable debug mode for more info', 'description': response['description']}
+        return self._request('sendVideoNote', params, files)
 
 
     def sendMediaGroup(self, chat_id: str, media_url=[], local_media=[], disable_notification=False, reply_to_message_id=None, allow_sending_without_reply=True) -> Dict:
-            """ Use this method to send photos
-
-            Notes:
-                    For more info -> https://github.com/xSklero/python-telegram-api/wiki/sendMediaGroup
-
-            Args:
-                chat_id (str): Unique identifier for the target chat or username of the target channel.
-                media_url (list, optional): Pass an array of HTTP URL as a String for Telegram to get a photo from the Internet. Defaults to "".
-                local_media (list, optional): An array of image paths. The photos must be at most 10 MB in size. The photos' width and height must not exceed 10000 in total. Width and height ratio must be at most 20. Defaults to "".
-                disable_notification (bool, optional): If True sends the message silently (Users will receive a notification with no sound). Defaults to False.
-                reply_to_message_id (int, optional): ID of the original message to reply to. Defaults to None.
-                allow_sending_without_reply (bool, optional): If True the message will be sent even if the specified replied-to message is not found. Defaults to True.
-
-            Returns:
-                Dict: On success, an array of sent Messages is returned.
-            """
-
-            token = self.botToken
-
-            if len(local_media) != 0:  # If using a local file array
-
-                files = {}
-                
-                inputMediaMediaArray = []
-
-                for images_ref in range(len(local_media)): # each media
-
-                    files[str(images_ref)] = (open(local_media[images_ref]['media'], 'rb'))
-
-                    local_media[images_ref]['media'] = 'attach://' + str(images_ref)
+        """ Use this method to send photos
 
-                    inputMediaMediaArray.append(local_media[images_ref])
+        Notes:
+                For more info -> https://github.com/xSklero/python-telegram-api/wiki/sendMediaGroup
 
-                try:
+        Args:
+            chat_id (str): Unique identifier for the target chat or username of the target channel.
+            media_url (list, optional): Pass an array of HTTP URL as a String for Telegram to get a photo from the Internet. Defaults to "".
+            local_media (list, optional): An array of image paths. The photos must be at most 10 MB in size. The photos' width and height must not exceed 10000 in total. Width and height ratio must be at most 20. Defaults to "".
+            disable_notification (bool, optional): If True sends the message silently (Users will receive a notification with no sound). Defaults to False.
+            reply_to_message_id (int, optional): ID of the original message to reply to. Defaults to None.
+            allow_sending_without_reply (bool, optional): If True the message will be sent even if the specified replied-to message is not found. Defaults to True.
 
-                    params = (
-                        ('chat_id', chat_id),
-                        ('media', json.dumps(inputMediaMediaArray)),
-                        ('disable_notification', disable_notification),
-                        ('reply_to_message_id', reply_to_message_id),
-                        ('allow_sending_without_reply', allow_sending_without_reply),
-                    )
+        Returns:
+            Dict: On success, an array of sent Messages is returned.
+        """
 
-                    response = requests.post(f"https://api.telegram.org/bot{token}/sendMediaGroup", params=params, files=files).json()
+        files = {}
 
-                except:
-                    return {'error': 'Error with sendMediaGroup method. Enable debug mode for more info', 'description': 'Bad file path'}
+        inputMediaMediaArray = []
 
-            else: # If using urls file array
+        if len(local_media) != 0:  # If using a local file array
 
-                inputMediaMediaArray = []
+            for images_ref in range(len(local_media)): # each media
 
-                for media in media_url:  # each media
+                files[str(images_ref)] = local_media[images_ref]['media']
 
-                    inputMediaMediaArray.append(media)
+                inputMediaMediaArray.append(dict(local_media[images_ref], media='attach://' + str(images_ref)))
 
-                try:
+        else: # If using urls file array
 
-                    params = (
-                        ('chat_id', chat_id),
-                        ('media', json.dumps(inputMediaMediaArray)),
-                        ('disable_notification', disable_notification),
-                        ('reply_to_message_id', reply_to_message_id),
-                        ('allow_sending_without_reply', allow_sending_without_reply),
-                    )
+            for media in media_url:  # each media
 
-                    response = requests.post(f"https://api.telegram.org/bot{token}/sendMediaGroup", params=params).json()
-                
-                except:
-                    return {'error': 'Error with sendMediaGroup method. Enable debug mode for more info', 'description': 'Bad file path'}
+                inputMediaMediaArray.append(media)
 
-            if self.debug:
-                print(response)
+        params = (
+            ('chat_id', chat_id),
+            ('media', inputMediaMediaArray),
+            ('disable_notification', disable_notification),
+            ('reply_to_message_id', reply_to_message_id),
+            ('allow_sending_without_reply', allow_sending_without_reply),
+        )
 
-            if response['ok']:
-                return response['result']
-            else:
-                return {'error': 'Error with sendMediaGroup method. Enable debug mode for more info', 'description': response['description']}
+        return self._request('sendMediaGroup', params, files)
 
-    def sendLocation(self, chat_id: str, latitude: float, longitude: float, horizontal_accuracy="", live_period="", heading="", proximity_alert_radius="", disable_notification=False, reply_to_message_id=None, allow_sending_without_reply=True, reply_markup={}) -> Dict:
+    def sendLocation(self, chat_id: str, latitude: float, longitude: float, horizontal_accuracy=None, live_period=None, heading=None, proximity_alert_radius=None, disable_notification=False, reply_to_message_id=None, allow_sending_without_reply=True, reply_markup=None) -> Dict:
         """ Use this method to send point on the map.
 
         Notes:
@@ -992,21 +1392,19 @@ class TelegramBotApi():
             chat_id (str): Unique identifier for the target chat or username of the target channel.
             latitude (float): Latitude of the location.
             longitude (float): Longitude of the location.
-            horizontal_accuracy (str, optional): The radius of uncertainty for the location, measured in meters; 0-1500. Defaults to "".
-            live_period (str, optional): Period in seconds for which the location will be updated, should be between 60 and 86400. Defaults to "".
-            heading (str, optional): For live locations, a direction in which the user is moving, in degrees. Must be between 1 and 360 if specified. Defaults to "".
-            proximity_alert_radius (str, optional): For live locations, a maximum distance for proximity alerts about approaching another chat member, in meters. Must be between 1 and 100000 if specified.. Defaults to "".
+            horizontal_accuracy (str, optional): The radius of uncertainty for the location, measured in meters; 0-1500. Defaults to None.
+            live_period (str, optional): Period in seconds for which the location will be updated, should be between 60 and 86400. Defaults to None.
+            heading (str, optional): For live locations, a direction in which the user is moving, in degrees. Must be between 1 and 360 if specified. Defaults to None.
+            proximity_alert_radius (str, optional): For live locations, a maximum distance for proximity alerts about approaching another chat member, in meters. Must be between 1 and 100000 if specified.. Defaults to None.
             disable_notification (bool, optional): If True sends the message silently (Users will receive a notification with no sound). Defaults to False.
             reply_to_message_id (int, optional): ID of the original message to reply to. Defaults to None.
             allow_sending_without_reply (bool, optional): If True the message will be sent even if the specified replied-to message is not found. Defaults to True.
-            reply_markup (dict, optional): Additional interface options (A JSON-serialized object). Defaults to {}.
+            reply_markup (dict, optional): Additional interface options (A JSON-serialized object). Defaults to None.
 
         Returns:
             Dict: On success, the sent Message is returned.
         """
 
-        token = self.botToken
-
         params = (
             ('chat_id', chat_id),
             ('latitude', latitude),
@@ -1019,20 +1417,12 @@ class TelegramBotApi():
             ('disable_notification', disable_notification),
             ('reply_to_message_id', reply_to_message_id),
             ('allow_sending_without_reply', allow_sending_without_reply),
-            ('reply_markup', json.dumps(reply_markup)),
+            ('reply_markup', reply_markup),
         )
 
-        response = requests.get(f"https://api.telegram.org/bot{token}/sendLocation", params=params).json()
-
-        if self.debug:
-            print(response)
-
-        if response['ok']:
-            return response['result']
-        else:
-            return {'error': 'Error with sendLocation method. Enable debug mode for more info', 'description': response['description']}
+        return self._request('sendLocation', params)
 
-    def editMessageLiveLocation(self, latitude: float, longitude: float, chat_id="", message_id="", inline_message_id="", horizontal_accuracy="", heading="", proximity_alert_radius="", reply_markup={}) -> Dict:
+    def editMessageLiveLocation(self, latitude: float, longitude: float, chat_id=None, message_id=None, inline_message_id=None, horizontal_accuracy=None, heading=None, proximity_alert_radius=None, reply_markup=None) -> Dict:
         """ Use this method to edit live location messages. A location can be edited until its live_period expires or editing is explicitly disabled by a call to stopMessageLiveLocation.
 
         Notes:
@@ -1041,20 +1431,18 @@ class TelegramBotApi():
         Args:
             latitude (float): Latitude of new location.
             longitude (float): Longitude of new location.
-            chat_id (str, optional): Required if inline_message_id is not specified. Unique identifier for the target chat or username of the target channel. Defaults to "".
-            message_id (str, optional): Required if inline_message_id is not specified. Identifier of the message to edit. Defaults to "".
-            inline_message_id (str, optional): Required if chat_id and message_id are not specified. Identifier of the inline message. Defaults to "".
-            horizontal_accuracy (str, optional): The radius of uncertainty for the location, measured in meters; 0-1500. Defaults to "".
-            heading (str, optional): Direction in which the user is moving, in degrees. Must be between 1 and 360 if specified. Defaults to "".
-            proximity_alert_radius (str, optional): Maximum distance for proximity alerts about approaching another chat member, in meters. Must be between 1 and 100000. Defaults to "".
-            reply_markup (dict, optional): Additional interface options (A JSON-serialized object). Defaults to {}.
+            chat_id (str, optional): Required if inline_message_id is not specified. Unique identifier for the target chat or username of the target channel. Defaults to None.
+            message_id (str, optional): Required if inline_message_id is not specified. Identifier of the message to edit. Defaults to None.
+            inline_message_id (str, optional): Required if chat_id and message_id are not specified. Identifier of the inline message. Defaults to None.
+            horizontal_accuracy (str, optional): The radius of uncertainty for the location, measured in meters; 0-1500. Defaults to None.
+            heading (str, optional): Direction in which the user is moving, in degrees. Must be between 1 and 360 if specified. Defaults to None.
+            proximity_alert_radius (str, optional): Maximum distance for proximity alerts about approaching another chat member, in meters. Must be between 1 and 100000. Defaults to None.
+            reply_markup (dict, optional): Additional interface options (A JSON-serialized object). Defaults to None.
 
         Returns:
             Dict: On success, if the edited message is not an inline message, the edited Message is returned, otherwise True is returned.
         """
 
-        token = self.botToken
-
         params = (
             ('chat_id', chat_id),
             ('latitude', latitude),
@@ -1064,57 +1452,38 @@ class TelegramBotApi():
             ('proximity_alert_radius', proximity_alert_radius),
             ('horizontal_accuracy', horizontal_accuracy),
             ('inline_message_id', inline_message_id),
-            ('reply_markup', json.dumps(reply_markup)),
+            ('reply_markup', reply_markup),
         )
 
-        response = requests.get(f"https://api.telegram.org/bot{token}/editMessageLiveLocation", params=params).json()
-
-        if self.debug:
-            print(response)
-
-        if response['ok']:
-            return response['result']
-        else:
-            return {'error': 'Error with editMessageLiveLocation method. Enable debug mode for more info', 'description': response['description']}
+        return self._request('editMessageLiveLocation', params)
 
 
-    def stopMessageLiveLocation(self, chat_id="", message_id="", inline_message_id="", reply_markup={}) -> Dict:
+    def stopMessageLiveLocation(self, chat_id=None, message_id=None, inline_message_id=None, reply_markup=None) -> Dict:
         """ Use this method to stop updating a live location message before live_period expires.
 
             Notes:
                     For more info -> https://github.com/xSklero/python-telegram-api/wiki/stopMessageLiveLocation
 
             Args:
-                chat_id (str, optional): Required if inline_message_id is not specified. Unique identifier for the target chat or username of the target channel. Defaults to "".
-                message_id (str, optional): Required if inline_message_id is not specified. Identifier of the message to edit. Defaults to "".
-                inline_message_id (str, optional): Required if chat_id and message_id are not specified. Identifier of the inline message. Defaults to "".
-                reply_markup (dict, optional): Additional interface options (A JSON-serialized object). Defaults to {}.
+                chat_id (str, optional): Required if inline_message_id is not specified. Unique identifier for the target chat or username of the target channel. Defaults to None.
+                message_id (str, optional): Required if inline_message_id is not specified. Identifier of the message to edit. Defaults to None.
+                inline_message_id (str, optional): Required if chat_id and message_id are not specified. Identifier of the inline message. Defaults to None.
+                reply_markup (dict, optional): Additional interface options (A JSON-serialized object). Defaults to None.
 
             Returns:
                 Dict: On success, if the message was sent by the bot, the sent Message is returned, otherwise True is returned.
             """
 
-        token = self.botToken
-
         params = (
             ('chat_id', chat_id),
             ('message_id', message_id),
             ('inline_message_id', inline_message_id),
-            ('reply_markup', json.dumps(reply_markup)),
+            ('reply_markup', reply_markup),
         )
 
-        response = requests.get(
-            f"https://api.telegram.org/bot{token}/stopMessageLiveLocation", params=params).json()
-
-        if self.debug:
-                print(response)
-
-        if response['ok']:
-            return response['result']
-        else:
-            return {'error': 'Error with stopMessageLiveLocation method. Enable debug mode for more info', 'description': response['description']}
+        return self._request('stopMessageLiveLocation', params)
 
-    def sendVenue(self, chat_id: str, latitude: float, longitude: float, title: str, address: str, foursquare_id="", foursquare_type="", google_place_id="", google_place_type="", disable_notification=False, reply_to_message_id=None, allow_sending_without_reply=True, reply_markup={}) -> Dict:
+    def sendVenue(self, chat_id: str, latitude: float, longitude: float, title: str, address: str, foursquare_id=None, foursquare_type=None, google_place_id=None, google_place_type=None, disable_notification=False, reply_to_message_id=None, allow_sending_without_reply=True, reply_markup=None) -> Dict:
         """ Use this method to send information about a venue.
 
         Notes:
@@ -1126,21 +1495,19 @@ class TelegramBotApi():
             longitude (float): Longitude of the location.
             title (str): Name of the venue.
             address (str): Address of the venue.
-            foursquare_id (str, optional): Foursquare identifier of the venue. Defaults to "".
-            foursquare_type (str, optional): Foursquare type of the venue. Defaults to "".
-            google_place_id (str, optional): Google Places identifier of the venue. Defaults to "".
-            google_place_type (str, optional): Google Places type of the venue. Defaults to "".
+            foursquare_id (str, optional): Foursquare identifier of the venue. Defaults to None.
+            foursquare_type (str, optional): Foursquare type of the venue. Defaults to None.
+            google_place_id (str, optional): Google Places identifier of the venue. Defaults to None.
+            google_place_type (str, optional): Google Places type of the venue. Defaults to None.
             disable_notification (bool, optional): If True sends the message silently (Users will receive a notification with no sound). Defaults to False.
             reply_to_message_id (int, optional): ID of the original message to reply to. Defaults to None.
             allow_sending_without_reply (bool, optional): If True the message will be sent even if the specified replied-to message is not found. Defaults to True.
-            reply_markup (dict, optional): Additional interface options (A JSON-serialized object). Defaults to {}.
+            reply_markup (dict, optional): Additional interface options (A JSON-serialized object). Defaults to None.
 
         Returns:
             Dict: [description]
         """
 
-        token = self.botToken
-
         params = (
             ('chat_id', chat_id),
             ('latitude', latitude),
@@ -1154,21 +1521,12 @@ class TelegramBotApi():
             ('disable_notification', disable_notification),
             ('reply_to_message_id', reply_to_message_id),
             ('allow_sending_without_reply', allow_sending_without_reply),
-            ('reply_markup', json.dumps(reply_markup)),
+            ('reply_markup', reply_markup),
         )
 
-        response = requests.get(
-            f"https://api.telegram.org/bot{token}/sendVenue", params=params).json()
-
-        if self.debug:
-            print(response)
-
-        if response['ok']:
-            return response['result']
-        else:
-            return {'error': 'Error with sendVenue method. Enable debug mode for more info', 'description': response['description']}
+        return self._request('sendVenue', params)
 
-    def sendContact(self, chat_id: str, phone_number: str, first_name: str, last_name="", disable_notification=False, reply_to_message_id=None, allow_sending_without_reply=True, reply_markup={}) -> Dict:
+    def sendContact(self, chat_id: str, phone_number: str, first_name: str, last_name=None, disable_notification=False, reply_to_message_id=None, allow_sending_without_reply=True, reply_markup=None) -> Dict:
         """ Use this method to send phone contacts.
 
         Notes:
@@ -1178,18 +1536,16 @@ class TelegramBotApi():
             chat_id (str): Unique identifier for the target chat or username of the target channel.
             phone_number (str): Contact's phone number.
             first_name (str): Contact's first name.
-            last_name (str, optional): Contact's last name. Defaults to "".
+            last_name (str, optional): Contact's last name. Defaults to None.
             disable_notification (bool, optional): If True sends the message silently (Users will receive a notification with no sound). Defaults to False.
             reply_to_message_id (int, optional): ID of the original message to reply to. Defaults to None.
             allow_sending_without_reply (bool, optional): If True the message will be sent even if the specified replied-to message is not found. Defaults to True.
-            reply_markup (dict, optional): Additional interface options (A JSON-serialized object). Defaults to {}.
+            reply_markup (dict, optional): Additional interface options (A JSON-serialized object). Defaults to None.
 
         Returns:
             Dict:  On success, the sent Message is returned.
         """
 
-        token = self.botToken
-
         params = (
             ('chat_id', chat_id),
             ('phone_number', phone_number),
@@ -1198,21 +1554,12 @@ class TelegramBotApi():
             ('disable_notification', disable_notification),
             ('reply_to_message_id', reply_to_message_id),
             ('allow_sending_without_reply', allow_sending_without_reply),
-            ('reply_markup', json.dumps(reply_markup)),
+            ('reply_markup', reply_markup),
         )
 
-        response = requests.get(
-            f"https://api.telegram.org/bot{token}/sendContact", params=params).json()
-
-        if self.debug:
-            print(response)
-
-        if response['ok']:
-            return response['result']
-        else:
-            return {'error': 'Error with sendContact method. Enable debug mode for more info', 'description': response['description']}
+        return self._request('sendContact', params)
 
-    def sendPoll(self, chat_id: str, question: str, options: list, is_anonymous=True, type="regular", allows_multiple_answers=False, correct_option_id="", explanation="", explanation_parse_mode="MarkdownV2", open_period="", close_date="", is_closed=False, disable_notification=False, reply_to_message_id=None, allow_sending_without_reply=True, reply_markup={}) -> Dict:
+    def sendPoll(self, chat_id: str, question: str, options: list, is_anonymous=True, type="regular", allows_multiple_answers=False, correct_option_id=None, explanation=None, explanation_parse_mode="MarkdownV2", open_period=None, close_date=None, is_closed=False, disable_notification=False, reply_to_message_id=None, allow_sending_without_reply=True, reply_markup=None) -> Dict:
         """ Use this method to send a native poll.
 
         Notes:
@@ -1225,27 +1572,25 @@ class TelegramBotApi():
             is_anonymous (bool, optional): True, if the poll needs to be anonymous. Defaults to True.
             type (str, optional): Poll type, “quiz” or “regular”. Defaults to "regular".
             allows_multiple_answers (bool, optional): True, if the poll allows multiple answers, ignored for polls in quiz mode. Defaults to False.
-            correct_option_id (str, optional): identifier of the correct answer option, required for polls in quiz mode. Defaults to "".
-            explanation (str, optional): Text that is shown when a user chooses an incorrect answer or taps on the lamp icon in a quiz-style poll, 0-200 characters. Defaults to "".
+            correct_option_id (str, optional): identifier of the correct answer option, required for polls in quiz mode. Defaults to None.
+            explanation (str, optional): Text that is shown when a user chooses an incorrect answer or taps on the lamp icon in a quiz-style poll, 0-200 characters. Defaults to None.
             explanation_parse_mode (str, optional): Mode for parsing entities in the explanation. Defaults to "MarkdownV2".
-            open_period (str, optional): Amount of time in seconds the poll will be active after creation, 5-600. Can't be used together with close_date. Defaults to "".
-            close_date (str, optional): Point in time (Unix timestamp) when the poll will be automatically closed. Must be at least 5 and no more than 600 seconds in the future. Can't be used together with open_period. Defaults to "".
+            open_period (str, optional): Amount of time in seconds the poll will be active after creation, 5-600. Can't be used together with close_date. Defaults to None.
+            close_date (str, optional): Point in time (Unix timestamp) when the poll will be automatically closed. Must be at least 5 and no more than 600 seconds in the future. Can't be used together with open_period. Defaults to None.
             is_closed (bool, optional): Pass True, if the poll needs to be immediately closed. This can be useful for poll preview. Defaults to False.
             disable_notification (bool, optional): If True sends the message silently (Users will receive a notification with no sound). Defaults to False.
             reply_to_message_id (int, optional): ID of the original message to reply to. Defaults to None.
             allow_sending_without_reply (bool, optional): If True the message will be sent even if the specified replied-to message is not found. Defaults to True.
-            reply_markup (dict, optional): Additional interface options (A JSON-serialized object). Defaults to {}.
+            reply_markup (dict, optional): Additional interface options (A JSON-serialized object). Defaults to None.
 
         Returns:
             Dict: On success, the sent Message is returned.
         """
 
-        token = self.botToken
-
         params = (
             ('chat_id', chat_id),
             ('question', question),
-            ('options', json.dumps(options)),
+            ('options', options),
             ('is_anonymous', is_anonymous),
             ('type', type),
             ('allows_multiple_answers', allows_multiple_answers),
@@ -1258,21 +1603,12 @@ class TelegramBotApi():
             ('disable_notification', disable_notification),
             ('reply_to_message_id', reply_to_message_id),
             ('allow_sending_without_reply', allow_sending_without_reply),
-            ('reply_markup', json.dumps(reply_markup)),
+            ('reply_markup', reply_markup),
         )
 
-        response = requests.get(
-            f"https://api.telegram.org/bot{token}/sendPoll", params=params).json()
-
-        if self.debug:
-            print(response)
-
-        if response['ok']:
-            return response['result']
-        else:
-            return {'error': 'Error with sendPoll method. Enable debug mode for more info', 'description': response['description']}
+        return self._request('sendPoll', params)
 
-    def sendDice(self, chat_id: str, emoji="🎲", disable_notification=False, reply_to_message_id=None, allow_sending_without_reply=True, reply_markup={}) -> Dict:
+    def sendDice(self, chat_id: str, emoji="🎲", disable_notification=False, reply_to_message_id=None, allow_sending_without_reply=True, reply_markup=None) -> Dict:
         """ Use this method to send an animated emoji that will display a random value.
 
         Notes:
@@ -1284,33 +1620,22 @@ class TelegramBotApi():
             disable_notification (bool, optional): If True sends the message silently (Users will receive a notification with no sound). Defaults to False.
             reply_to_message_id (int, optional): ID of the original message to reply to. Defaults to None.
             allow_sending_without_reply (bool, optional): If True the message will be sent even if the specified replied-to message is not found. Defaults to True.
-            reply_markup (dict, optional): Additional interface options (A JSON-serialized object). Defaults to {}.
+            reply_markup (dict, optional): Additional interface options (A JSON-serialized object). Defaults to None.
 
         Returns:
             Dict:  On success, the sent Message is returned.
         """
 
-        token = self.botToken
-
         params = (
             ('chat_id', chat_id),
             ('emoji', emoji),
             ('disable_notification', disable_notification),
             ('reply_to_message_id', reply_to_message_id),
             ('allow_sending_without_reply', allow_sending_without_reply),
-            ('reply_markup', json.dumps(reply_markup)),
+            ('reply_markup', reply_markup),
         )
 
-        response = requests.get(
-            f"https://api.telegram.org/bot{token}/sendDice", params=params).json()
-
-        if self.debug:
-            print(response)
-
-        if response['ok']:
-            return response['result']
-        else:
-            return {'error': 'Error with sendDice method. Enable debug mode for more info', 'description': response['description']}
+        return self._request('sendDice', params)
 
     def sendChatAction(self, chat_id: str, action: str) -> bool:
         """ Use this method when you need to tell the user that something is happening on the bot's side.
@@ -1326,23 +1651,12 @@ class TelegramBotApi():
             bool: Returns True on success.
         """
 
-        token = self.botToken
-
         params = (
             ('chat_id', chat_id),
             ('action', action),
         )
 
-        response = requests.get(
-            f"https://api.telegram.org/bot{token}/sendChatAction", params=params).json()
-
-        if self.debug:
-            print(response)
-
-        if response['ok']:
-            return response['result']
-        else:
-            return {'error': 'Error with sendChatAction method. Enable debug mode for more info', 'description': response['description']}
+        return self._request('sendChatAction', params)
 
     def getUserProfilePhotos(self, user_id: str, offset=-1, limit=100) -> Dict:
         """ Use this method to get a list of profile pictures for a user.
@@ -1359,24 +1673,13 @@ class TelegramBotApi():
             Dict: Returns a UserProfilePhotos object.
         """
 
-        token = self.botToken
-
         params = (
             ('user_id', user_id),
             ('offset', offset),
             ('limit', limit),
         )
 
-        response = requests.get(
-            f"https://api.telegram.org/bot{token}/getUserProfilePhotos", params=params).json()
-
-        if self.debug:
-            print(response)
-
-        if response['ok']:
-            return response['result']
-        else:
-            return {'error': 'Error with getUserProfilePhotos method. Enable debug mode for more info', 'description': response['description']}
+        return self._request('getUserProfilePhotos', params)
     
     def getChatMember(self, chat_id:str, user_id: str) -> Dict:
         """ Use this method to get information about a member of a chat.
@@ -1389,20 +1692,67 @@ class TelegramBotApi():
             Dict: Returns a ChatMember object on success.
         """
 
-        token = self.botToken
+        member = self.chatMemberCache.get(chat_id, user_id) if self.chatMemberCache is not None else None
+
+        if member is not None:
+            return member
 
         params = (
             ('user_id', user_id),
             ('chat_id', chat_id)
         )
 
-        response = requests.get(
-            f"https://api.telegram.org/bot{token}/getChatMember", params=params).json()
+        return self._request('getChatMember', params, callback=self._storeChatMember(chat_id, user_id))
 
-        if self.debug:
-            print(response)
+    def _storeChatMember(self, chat_id: str, user_id: str):
+        """ Build the callback caching the ChatMember object returned for a user, None without a cache """
 
-        if response['ok']:
-            return response['result']
-        else:
-            return {'error': 'Error with getChatMember method. Enable debug mode for more info', 'description': response['description']}
+        cache = self.chatMemberCache
+
+        if cache is None:
+            return None
+
+        def store(member: Dict) -> Dict:
+            cache.set(chat_id, user_id, member)
+            return member
+
+        return store
+
+    def getChatMembers(self, chat_id: str, user_ids: List[str]) -> Dict:
+        """ Use this method to get information about many members of a chat at once.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/getChatMembers
+
+            Cached members are answered right away, the others are requested concurrently over the connection pool.
+
+        Args:
+            chat_id (str): Unique identifier for the target chat or username of the target supergroup.
+            user_ids (List[str]): Unique identifiers of the target users.
+
+        Returns:
+            Dict: Every user_id mapped to its ChatMember object, or to an error Dict if its request failed.
+        """
+
+        members = {}
+        missing = []
+
+        for userId in dict.fromkeys(user_ids):
+
+            member = self.chatMemberCache.get(chat_id, userId) if self.chatMemberCache is not None else None
+
+            if member is None:
+                missing.append(userId)
+            else:
+                members[userId] = member
+
+        if len(missing) == 1:
+            members[missing[0]] = self.getChatMember(chat_id, missing[0])
+        elif missing:
+            with self.batch() as batch:
+                futures = [(userId, batch.getChatMember(chat_id, userId)) for userId in missing]
+
+            for userId, future in futures:
+                members[userId] = future.result()
+
+        return members
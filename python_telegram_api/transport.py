@@ -0,0 +1,459 @@
+"""
+
+This module contains the transports carrying the Bot API requests: HTTP clients and an in-memory fake.
+
+Author: Eric Damian
+
+"""
+
+import inspect
+import threading
+from typing import Dict, List
+
+import requests
+
+from . import json_codec
+from .multipart import MultipartEncoder
+
+try:
+    import urllib3
+except ImportError: # Optional, only needed by Urllib3Transport
+    urllib3 = None
+
+try:
+    import httpx
+except ImportError: # Optional, only needed by HttpxTransport and AsyncHttpxTransport
+    httpx = None
+
+try:
+    import aiohttp
+except ImportError: # Optional, only needed by AiohttpTransport
+    aiohttp = None
+
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
+NETWORK_ERRORS = tuple(error for error in ( # Raised by the transports when the server cannot be reached
+    requests.RequestException,
+    urllib3.exceptions.HTTPError if urllib3 is not None else None,
+    httpx.TransportError if httpx is not None else None,
+    aiohttp.ClientError if aiohttp is not None else None,
+    TimeoutError,
+    ConnectionError,
+) if error is not None)
+
+def encodeJson(params=()) -> bytes:
+    """ Use this function to encode request parameters as a JSON object.
+
+    The body is built as bytes: the cached JSON of frozen markups is spliced in as is instead of being encoded again.
+
+    Args:
+        params (tuple, optional): Parameters as (name, value) pairs. Defaults to ().
+
+    Returns:
+        bytes: The JSON body.
+    """
+
+    plain = {}
+    frozen = []
+
+    for key, value in params:
+        if isinstance(value, json_codec.Preserialized):
+            frozen.append(b'"' + key.encode('utf-8') + b'":' + value.toJsonBytes())
+        else:
+            plain[key] = value
+
+    body = json_codec.dumpsBytes(plain)
+
+    if frozen:
+        body = body[:-1] + (b',' if plain else b'') + b','.join(frozen) + b'}'
+
+    return body
+
+def encodeForm(params=()) -> List:
+    """ Use this function to encode request parameters as multipart form fields, anything but a string is sent as JSON """
+
+    return [(key, value if isinstance(value, str) else json_codec.dumps(value)) for key, value in params]
+
+def methodOf(url: str) -> str:
+    """ Use this function to get the Bot API method name of a request url """
+
+    return url.rsplit('/', 1)[-1]
+
+class Transport():
+    """ Carries one Bot API request and returns the raw response body.
+
+    Subclasses of HttpTransport only implement post, InMemoryTransport answers without encoding anything.
+    """
+
+    def send(self, url: str, params=(), files=None, timeout=None):
+        """ Use this method to perform a request.
+
+        Args:
+            url (str): Url of the Bot API method.
+            params (tuple, optional): Parameters as (name, value) pairs. Defaults to ().
+            files (dict, optional): Field names mapped to the paths of local files to upload. Defaults to None.
+            timeout (float, optional): Seconds to wait for the connection and for every read, None uses the timeout of the transport. Defaults to None.
+
+        Returns:
+            tuple: The response body as bytes and the size of the request body.
+        """
+
+        raise NotImplementedError
+
+    def getSession(self):
+        """ Use this method to get the underlying HTTP client, None if there is none """
+
+        return None
+
+    def close(self) -> bool:
+        """ Use this method to release every pooled connection """
+
+        return True
+
+class HttpTransport(Transport):
+    """ Base of the HTTP transports: parameters go in a JSON body, or in multipart form fields next to uploaded files """
+
+    def send(self, url: str, params=(), files=None, timeout=None):
+
+        timeout = self.timeout if timeout is None else timeout
+
+        if files: # Streamed in chunks, its file handles are closed once sent
+
+            body = MultipartEncoder(fields=encodeForm(params), files=files)
+
+            try:
+                return self.post(url, body, body.getHeaders(), timeout), len(body)
+            finally:
+                body.close()
+
+        body = encodeJson(params)
+
+        return self.post(url, body, JSON_HEADERS, timeout), len(body)
+
+    def post(self, url: str, body, headers: Dict, timeout=None) -> bytes:
+        """ Use this method to POST a body, bytes or an iterable of bytes chunks, and return the response body """
+
+        raise NotImplementedError
+
+class RequestsTransport(HttpTransport):
+    """ Transport using a pooled keep-alive requests.Session """
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, pool_block=False, timeout=None):
+        """ Constructor of RequestsTransport class
+
+        Args:
+            pool_connections (int, optional): Number of per-host connection pools to cache. Defaults to 10.
+            pool_maxsize (int, optional): Maximum number of connections kept alive for each host. Defaults to 10.
+            pool_block (bool, optional): If True, callers wait for a free connection instead of opening extra ones once pool_maxsize is reached. Defaults to False.
+            timeout (float, optional): Seconds to wait for the connection and for every read, None waits forever. Defaults to None.
+        """
+
+        self.timeout = timeout
+        self.session = requests.Session()
+
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def post(self, url: str, body, headers: Dict, timeout=None) -> bytes:
+        return self.session.post(url, data=body, headers=headers, timeout=timeout).content
+
+    def getSession(self) -> requests.Session:
+        return self.session
+
+    def close(self) -> bool:
+
+        try:
+            self.session.close()
+            return True
+        except:
+            return False
+
+class Urllib3Transport(HttpTransport):
+    """ Transport using a urllib3.PoolManager directly, without the overhead of requests """
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, pool_block=False, timeout=None):
+        """ Constructor of Urllib3Transport class
+
+        Args:
+            pool_connections (int, optional): Number of per-host connection pools to cache. Defaults to 10.
+            pool_maxsize (int, optional): Maximum number of connections kept alive for each host. Defaults to 10.
+            pool_block (bool, optional): If True, callers wait for a free connection once pool_maxsize is reached. Defaults to False.
+            timeout (float, optional): Seconds to wait for the connection and for every read, None waits forever. Defaults to None.
+        """
+
+        if urllib3 is None:
+            raise ImportError('Urllib3Transport needs urllib3: pip install urllib3')
+
+        self.timeout = timeout
+        self.pool = urllib3.PoolManager(num_pools=pool_connections, maxsize=pool_maxsize, block=pool_block)
+
+    def post(self, url: str, body, headers: Dict, timeout=None) -> bytes:
+        return self.pool.request('POST', url, body=body, headers=headers, timeout=timeout, retries=False).data
+
+    def getSession(self):
+        return self.pool
+
+    def close(self) -> bool:
+
+        try:
+            self.pool.clear()
+            return True
+        except:
+            return False
+
+class HttpxTransport(HttpTransport):
+    """ Transport using an httpx.Client, it can speak HTTP/2 """
+
+    def __init__(self, max_connections=10, max_keepalive_connections=10, http2=False, timeout=None):
+        """ Constructor of HttpxTransport class
+
+        Args:
+            max_connections (int, optional): Maximum number of simultaneous connections. Defaults to 10.
+            max_keepalive_connections (int, optional): Maximum number of idle connections kept alive. Defaults to 10.
+            http2 (bool, optional): If True HTTP/2 is used, it needs the h2 package. Defaults to False.
+            timeout (float, optional): Seconds to wait for the connection and for every read, None waits forever. Defaults to None.
+        """
+
+        if httpx is None:
+            raise ImportError('HttpxTransport needs httpx: pip install httpx')
+
+        limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections)
+        self.timeout = timeout
+        self.client = httpx.Client(limits=limits, http2=http2, timeout=timeout)
+
+    def post(self, url: str, body, headers: Dict, timeout=None) -> bytes:
+        return self.client.post(url, content=body, headers=headers, timeout=timeout).content
+
+    def getSession(self):
+        return self.client
+
+    def close(self) -> bool:
+
+        try:
+            self.client.close()
+            return True
+        except:
+            return False
+
+class InMemoryTransport(Transport):
+    """ Transport answering from registered Python callables, with no socket and no encoding of the request.
+
+    A handler is called with the parameters as a Dict and the files to upload as a Dict. What it returns is the
+    result of the method, unless it is a Dict with an 'ok' key, which is used as the whole response.
+    Methods without a handler answer 404 like Telegram does.
+    """
+
+    def __init__(self, handlers={}, record=False):
+        """ Constructor of InMemoryTransport class
+
+        Args:
+            handlers (dict, optional): Bot API method names mapped to their handlers. Defaults to {}.
+            record (bool, optional): If True every call is kept, see getCalls. Defaults to False.
+        """
+
+        self.handlers = dict(handlers)
+        self.record = record
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def addHandler(self, method: str, handler) -> bool:
+        """ Use this method to answer a Bot API method.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/InMemoryTransport
+
+        Args:
+            method (str): Name of the Bot API method, e.g. 'sendMessage'.
+            handler (callable): Called with the parameters and files of every request.
+
+        Returns:
+            bool: True if the handler has been added correctly.
+        """
+
+        if not callable(handler):
+            return False
+
+        self.handlers[method] = handler
+        return True
+
+    def getCalls(self) -> List:
+        """ Use this method to get the calls recorded so far, as (method, params, files) tuples """
+
+        with self.lock:
+            return list(self.calls)
+
+    def send(self, url: str, params=(), files=None, timeout=None):
+        return self._encode(self._call(methodOf(url), params, files)), 0
+
+    def _call(self, method: str, params=(), files=None):
+        """ Run the handler of a method, returns its raw outcome or the 404 response """
+
+        params, files = dict(params), dict(files or {})
+
+        if self.record:
+            with self.lock:
+                self.calls.append((method, params, files))
+
+        handler = self.handlers.get(method)
+
+        if handler is None:
+            return {'ok': False, 'error_code': 404, 'description': 'Not Found'}
+
+        return handler(params, files)
+
+    @staticmethod
+    def _encode(result) -> bytes:
+
+        response = result if isinstance(result, dict) and 'ok' in result else {'ok': True, 'result': result}
+        return json_codec.dumpsBytes(response)
+
+class AsyncTransport():
+    """ Carries one Bot API request of the asyncio client and returns the raw response body """
+
+    async def send(self, url: str, params=(), files=None, timeout=None):
+        """ Use this method to perform a request, see Transport.send """
+
+        raise NotImplementedError
+
+    def getSession(self):
+        """ Use this method to get the underlying HTTP client, None if there is none """
+
+        return None
+
+    async def close(self) -> bool:
+        """ Use this method to release every pooled connection """
+
+        return True
+
+class AiohttpTransport(AsyncTransport):
+    """ Transport using a pooled aiohttp.ClientSession, created on first use inside the running event loop """
+
+    def __init__(self, limit=100, limit_per_host=0, keepalive_timeout=15, timeout=None):
+        """ Constructor of AiohttpTransport class
+
+        Args:
+            limit (int, optional): Maximum number of simultaneous connections. Defaults to 100.
+            limit_per_host (int, optional): Maximum number of simultaneous connections to the same host, 0 means no limit. Defaults to 0.
+            keepalive_timeout (int, optional): Seconds an idle connection is kept alive in the pool. Defaults to 15.
+            timeout (float, optional): Seconds to wait for the connection and for every read, None waits forever. Defaults to None.
+        """
+
+        if aiohttp is None:
+            raise ImportError('AiohttpTransport needs aiohttp: pip install aiohttp')
+
+        self.connectorOptions = {'limit': limit, 'limit_per_host': limit_per_host, 'keepalive_timeout': keepalive_timeout}
+        self.timeout = timeout
+        self.session = None
+
+    def getSession(self):
+
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(**self.connectorOptions))
+
+        return self.session
+
+    async def send(self, url: str, params=(), files=None, timeout=None):
+
+        session = self.getSession()
+        timeout = self.timeout if timeout is None else timeout
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=timeout, sock_read=timeout)
+
+        if files: # Streamed in chunks, its file handles are closed once sent
+
+            body = MultipartEncoder(fields=encodeForm(params), files=files)
+
+            async def chunks():
+                for chunk in body:
+                    yield chunk
+
+            try:
+                async with session.post(url, data=chunks(), headers=body.getHeaders(), timeout=timeout) as reply:
+                    return await reply.read(), len(body)
+            finally:
+                body.close()
+
+        body = encodeJson(params)
+
+        async with session.post(url, data=body, headers=JSON_HEADERS, timeout=timeout) as reply:
+            return await reply.read(), len(body)
+
+    async def close(self) -> bool:
+
+        try:
+            if self.session is not None:
+                await self.session.close()
+                self.session = None
+            return True
+        except:
+            return False
+
+class AsyncHttpxTransport(AsyncTransport):
+    """ Transport using an httpx.AsyncClient, it can speak HTTP/2 """
+
+    def __init__(self, max_connections=100, max_keepalive_connections=20, http2=False, timeout=None):
+        """ Constructor of AsyncHttpxTransport class
+
+        Args:
+            max_connections (int, optional): Maximum number of simultaneous connections. Defaults to 100.
+            max_keepalive_connections (int, optional): Maximum number of idle connections kept alive. Defaults to 20.
+            http2 (bool, optional): If True HTTP/2 is used, it needs the h2 package. Defaults to False.
+            timeout (float, optional): Seconds to wait for the connection and for every read, None waits forever. Defaults to None.
+        """
+
+        if httpx is None:
+            raise ImportError('AsyncHttpxTransport needs httpx: pip install httpx')
+
+        limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections)
+        self.timeout = timeout
+        self.client = httpx.AsyncClient(limits=limits, http2=http2, timeout=timeout)
+
+    def getSession(self):
+        return self.client
+
+    async def send(self, url: str, params=(), files=None, timeout=None):
+
+        timeout = self.timeout if timeout is None else timeout
+
+        if files:
+
+            body = MultipartEncoder(fields=encodeForm(params), files=files)
+
+            async def chunks():
+                for chunk in body:
+                    yield chunk
+
+            try:
+                return (await self.client.post(url, content=chunks(), headers=body.getHeaders(), timeout=timeout)).content, len(body)
+            finally:
+                body.close()
+
+        body = encodeJson(params)
+
+        return (await self.client.post(url, content=body, headers=JSON_HEADERS, timeout=timeout)).content, len(body)
+
+    async def close(self) -> bool:
+
+        try:
+            await self.client.aclose()
+            return True
+        except:
+            return False
+
+class AsyncInMemoryTransport(AsyncTransport, InMemoryTransport):
+    """ InMemoryTransport for the asyncio client, handlers can be plain functions or coroutine functions """
+
+    def __init__(self, handlers={}, record=False):
+        InMemoryTransport.__init__(self, handlers, record)
+
+    async def send(self, url: str, params=(), files=None, timeout=None):
+
+        result = self._call(methodOf(url), params, files)
+
+        if inspect.isawaitable(result):
+            result = await result
+
+        return self._encode(result), 0
+
+    async def close(self) -> bool:
+        return True
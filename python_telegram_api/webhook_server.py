@@ -0,0 +1,184 @@
+"""
+
+This module contains a webhook receiver for the updates pushed by Telegram.
+
+Author: Eric Damian
+
+"""
+
+import concurrent.futures
+import http.server
+import ssl
+import threading
+import traceback
+from typing import Dict
+
+from . import json_codec
+
+class _WebhookHttpServer(http.server.ThreadingHTTPServer):
+
+    daemon_threads = True
+    request_queue_size = 1024 # Telegram opens up to max_connections at once, the default backlog of 5 makes them wait for SYN retransmits
+
+class WebhookServer():
+    """ HTTP server receiving the Update objects pushed to the url set with setWebhook.
+
+    Every update is acknowledged as soon as it is parsed and then handed to the handlers on a worker pool,
+    so slow handlers never hold Telegram delivery connections open.
+    """
+
+    def __init__(self, host='0.0.0.0', port=8443, path='/', secret_token='', workers=8, certfile='', keyfile=''):
+        """ Constructor of WebhookServer class
+
+        Args:
+            host (str, optional): Address to listen on. Defaults to '0.0.0.0'.
+            port (int, optional): Port to listen on, 0 picks a free port. Defaults to 8443.
+            path (str, optional): Url path updates are posted to. Defaults to '/'.
+            secret_token (str, optional): If set, requests without the same X-Telegram-Bot-Api-Secret-Token header are rejected. Defaults to ''.
+            workers (int, optional): Number of threads running the handlers. Defaults to 8.
+            certfile (str, optional): Path of the certificate, if set the server speaks HTTPS. Defaults to ''.
+            keyfile (str, optional): Path of the private key of the certificate. Defaults to ''.
+        """
+
+        self.path = path
+        self.secretToken = secret_token
+        self.handlers = []
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        self.thread = None
+        self.serving = False
+
+        self.server = _WebhookHttpServer((host, port), self._makeRequestHandler())
+
+        if certfile != "": # If serving HTTPS directly
+
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(certfile, keyfile or None)
+            self.server.socket = context.wrap_socket(self.server.socket, server_side=True)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def addHandler(self, handler) -> bool:
+        """ Use this method to register a function called with every received Update object.
+
+        Notes:
+            For more info -> https://github.com/xSklero/python-telegram-api/wiki/WebhookServer
+
+        Args:
+            handler (callable): Function taking the Update object as only argument.
+
+        Returns:
+            bool: True if the handler has been registered correctly.
+        """
+
+        if not callable(handler):
+            return False
+
+        self.handlers.append(handler)
+        return True
+
+    def getPort(self) -> int:
+        """ Use this method to get the port the server is listening on.
+
+        Returns:
+            int: Listening port.
+        """
+
+        return self.server.server_address[1]
+
+    def start(self) -> bool:
+        """ Use this method to start serving in a background thread.
+
+        Returns:
+            bool: True if the server has been started correctly.
+        """
+
+        if self.thread is not None:
+            return False
+
+        self.serving = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return True
+
+    def serveForever(self):
+        """ Use this method to serve in the calling thread until stop is called from another thread """
+
+        self.serving = True
+        self.server.serve_forever()
+
+    def stop(self, wait=True) -> bool:
+        """ Use this method to stop the server and its worker pool.
+
+        Args:
+            wait (bool, optional): If True waits for the handlers already queued to finish. Defaults to True.
+
+        Returns:
+            bool: True if the server has been stopped correctly.
+        """
+
+        try:
+            if self.serving: # shutdown waits forever for a server that never started
+                self.server.shutdown()
+                self.serving = False
+
+            self.server.server_close()
+            self.executor.shutdown(wait=wait)
+            self.thread = None
+            return True
+        except:
+            return False
+
+    def dispatch(self, update: Dict):
+        """ Hand an Update object to every handler on the worker pool """
+
+        for handler in self.handlers:
+            self.executor.submit(self._runHandler, handler, update)
+
+    @staticmethod
+    def _runHandler(handler, update: Dict):
+        try:
+            handler(update)
+        except Exception:
+            traceback.print_exc()
+
+    def _makeRequestHandler(self):
+        """ Build the request handler class bound to this server """
+
+        webhook = self
+
+        class _WebhookRequestHandler(http.server.BaseHTTPRequestHandler):
+
+            protocol_version = 'HTTP/1.1' # Keep Telegram delivery connections alive
+
+            def log_message(self, format, *args):
+                pass
+
+            def _reply(self, code: int):
+                self.send_response(code)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def do_POST(self):
+
+                body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+
+                if self.path.split('?', 1)[0] != webhook.path:
+                    return self._reply(404)
+
+                if webhook.secretToken != "" and self.headers.get('X-Telegram-Bot-Api-Secret-Token') != webhook.secretToken:
+                    return self._reply(403)
+
+                try:
+                    update = json_codec.loads(body)
+                except ValueError:
+                    return self._reply(400)
+
+                self._reply(200) # Acknowledge before running any handler
+                webhook.dispatch(update)
+
+        return _WebhookRequestHandler